@@ -0,0 +1,124 @@
+"""Startup benchmark of preprocessy.
+
+Runs ``python -X importtime -c "<statement>"`` in a fresh interpreter for every
+statement, several times, and records the median cumulative import time of the
+statement and of its slowest modules.
+
+Usage::
+
+    python benchmarks/importtime.py --repeat 5 --output importtime.json
+
+``--budget`` fails with exit code 1 if the median time of a statement exceeds the
+budget in milliseconds, so that the benchmark can guard the cold start of short
+lived workers.
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+
+STATEMENTS = [
+    "import preprocessy",
+    "from preprocessy.input import Reader",
+    "from preprocessy.scaling import Scaler",
+    "from preprocessy.pipelines import BasePipeline",
+    "from preprocessy.pipelines import StandardPipeline",
+    "from preprocessy.feature_selection import SelectKBest",
+]
+
+# modules that must not be loaded by importing preprocessy
+DEFERRED = [
+    "sklearn",
+    "alive_progress",
+    "colorama",
+    "prettytable",
+    "stringcase",
+]
+
+
+def parse_importtime(stderr):
+    """Returns ``{module: (self_us, cumulative_us)}`` from the output of
+    ``-X importtime``."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        modules[name[1:].rstrip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+def measure(statement):
+    check = (
+        f"{statement}\nimport sys\n"
+        f"print(','.join(m for m in {DEFERRED!r} if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", check],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = parse_importtime(result.stderr)
+    # top level modules are not indented, their cumulative times add up
+    total = sum(
+        cumulative
+        for name, (_, cumulative) in modules.items()
+        if not name.startswith(" ")
+    )
+    loaded = [m for m in result.stdout.strip().split(",") if m]
+    return total, modules, loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--output", help="Path of the JSON report")
+    parser.add_argument("--budget", type=float, help="Budget in milliseconds")
+    args = parser.parse_args()
+
+    report = {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "statements": [],
+    }
+    failed = False
+    for statement in STATEMENTS:
+        totals = []
+        for _ in range(args.repeat):
+            total, modules, loaded = measure(statement)
+            totals.append(total)
+        slowest = sorted(
+            modules.items(), key=lambda item: item[1][0], reverse=True
+        )[: args.top]
+        median_ms = statistics.median(totals) / 1000
+        report["statements"].append(
+            {
+                "statement": statement,
+                "median_ms": median_ms,
+                "min_ms": min(totals) / 1000,
+                "deferred_loaded": loaded,
+                "slowest_modules": [
+                    {"module": name.strip(), "self_ms": s / 1000}
+                    for name, (s, _) in slowest
+                ],
+            }
+        )
+        print(f"{median_ms:9.1f} ms  {statement}")
+        if loaded:
+            print(f"             loaded {', '.join(loaded)}")
+        if args.budget is not None and median_ms > args.budget:
+            failed = True
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Imputation benchmark of NullValuesHandler.
+
+Repeats the rows of ``melb_data.csv`` until the train dataframe has ``--rows`` rows,
+then times ``NullValuesHandler.execute``, which learns all the fill statistics in one
+reduction and fills every column with one ``fillna``, against a reference that
+computes and fills the statistics one column at a time. ``NullValuesHandler`` is
+timed alone and after the column statistics were computed by ``Parser``, as in a
+pipeline. All of them must return the same dataframe.
+
+Usage::
+
+    python benchmarks/imputation.py --rows 10000000 --repeat 3 --output imputation.json
+"""
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from preprocessy.missing_data import NullValuesHandler
+from preprocessy.utils import ColumnStatistics
+
+DATASET = "datasets/handling_null_values/melb_data.csv"
+PARAMS = {
+    "cat_cols": ["CouncilArea"],
+    "replace_cat_nulls": "Unknown",
+    "fill_missing": {"median": ["Car", "BuildingArea"], "mean": ["YearBuilt"]},
+}
+
+
+def scale(df, rows):
+    """Returns the rows of ``df`` repeated until the dataframe has ``rows`` rows."""
+    positions = np.resize(np.arange(df.shape[0]), rows)
+    return df.take(positions).reset_index(drop=True)
+
+
+def per_column(df, params):
+    """Reference imputation that reads and fills the columns one at a time."""
+    df = df.copy()
+    for col in params["cat_cols"]:
+        df[col] = df[col].fillna(params["replace_cat_nulls"])
+    for method, cols in params["fill_missing"].items():
+        for col in cols:
+            df[col] = df[col].fillna(getattr(df[col], method)())
+    return df.dropna()
+
+
+def measure(func, repeat, setup=lambda: None):
+    times = []
+    for _ in range(repeat):
+        args = setup()
+        start = time.perf_counter()
+        result = func(args)
+        times.append(time.perf_counter() - start)
+    return times, result
+
+
+def catalog(df):
+    """Returns the column statistics of all the columns of ``df``, as computed by
+    ``Parser`` in a pipeline."""
+    return ColumnStatistics().add(df)
+
+
+def vectorized(df, statistics):
+    params = dict(PARAMS, train_df=df, column_statistics=statistics)
+    NullValuesHandler().execute(params)
+    return params["train_df"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="Path of the JSON report")
+    args = parser.parse_args()
+
+    df = scale(pd.read_csv(DATASET), args.rows)
+    warnings.simplefilter("ignore")
+    timings = {}
+    timings["per_column_s"], reference = measure(
+        lambda _: per_column(df, PARAMS), args.repeat
+    )
+    timings["vectorized_s"], result = measure(
+        lambda _: vectorized(df, None), args.repeat
+    )
+    pd.testing.assert_frame_equal(result, reference)
+    timings["vectorized_with_statistics_s"], result = measure(
+        lambda statistics: vectorized(df, statistics),
+        args.repeat,
+        lambda: catalog(df),
+    )
+    pd.testing.assert_frame_equal(result, reference)
+
+    report = {
+        "python": sys.version.split()[0],
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "rows": args.rows,
+        "repeat": args.repeat,
+    }
+    for name, times in timings.items():
+        report[name] = statistics.median(times)
+    for name, label in [
+        ("per_column_s", "per column"),
+        ("vectorized_s", "NullValuesHandler"),
+        ("vectorized_with_statistics_s", "NullValuesHandler after Parser"),
+    ]:
+        speedup = report["per_column_s"] / report[name]
+        print(f"{report[name]:9.2f} s  {speedup:5.2f} x  {label}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,24 @@
 import pandas as pd
 
+from ._lazy import attach
+
 pd.options.mode.chained_assignment = None
+
+# subpackages are imported when they are first accessed
+__getattr__, __dir__, __all__ = attach(
+    __name__,
+    submodules=[
+        "data_splitting",
+        "encoding",
+        "exceptions",
+        "feature_selection",
+        "input",
+        "missing_data",
+        "output",
+        "outliers",
+        "parse",
+        "pipelines",
+        "scaling",
+        "utils",
+    ],
+)
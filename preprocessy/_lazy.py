@@ -0,0 +1,44 @@
+import importlib
+
+
+def attach(package, submodules=(), attributes=None):
+    """Returns the ``__getattr__`` and ``__dir__`` functions of a lazily loaded package.
+    The submodule that defines an attribute is imported the first time the attribute is
+    accessed, so importing the package only loads the modules that are used.
+
+    :param package: ``__name__`` of the package
+    :type package: str
+
+    :param submodules: Names of the subpackages that are imported on access
+    :type submodules: list
+
+    :param attributes: Maps the name of an attribute to the submodule that defines it
+    :type attributes: dict
+
+    :return: ``__getattr__``, ``__dir__`` and ``__all__`` of the package
+    :rtype: tuple
+
+    .. versionadded:: 1.0.5
+    """
+    submodules = set(submodules)
+    attributes = dict(attributes or {})
+    names = list(attributes) + sorted(submodules)
+
+    def __getattr__(name):
+        if name in attributes:
+            module = importlib.import_module(attributes[name], package)
+            value = getattr(module, name)
+        elif name in submodules:
+            value = importlib.import_module(f"{package}.{name}")
+        else:
+            raise AttributeError(
+                f"module {package!r} has no attribute {name!r}"
+            )
+        # cache the attribute so that __getattr__ is not called again
+        setattr(importlib.import_module(package), name, value)
+        return value
+
+    def __dir__():
+        return sorted(set(vars(importlib.import_module(package))) | set(names))
+
+    return __getattr__, __dir__, names
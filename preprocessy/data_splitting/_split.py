@@ -3,6 +3,7 @@ import pandas as pd
 
 from ..exceptions import ArgumentsError
 from ..utils import num_of_samples
+from ..utils import step_io
 
 
 class Split:
@@ -166,6 +167,18 @@ class Split:
                 f"random_state should be None when shuffle is set to False. Received {self.random_state} as random_state."
             )
 
+    @step_io(
+        reads=[
+            "train_df",
+            "test_df",
+            "target_label",
+            "test_size",
+            "train_size",
+            "shuffle",
+            "random_state",
+        ],
+        writes=["X_train", "X_test", "y_train", "y_test"],
+    )
     def train_test_split(self, params):
         """Performs train test split on the input data
 
@@ -4,6 +4,15 @@ import pandas as pd
 from pandas.api.types import is_numeric_dtype
 from pandas.api.types import is_string_dtype
 
+from ..exceptions import ArgumentsError
+from ..utils import count_distinct
+from ..utils import detect_number_format
+from ..utils import parse_numbers
+from ..utils import read_state
+from ..utils import save_state
+from ..utils import step_io
+from ..utils._numeric import DEFAULT_NUMBER_FORMAT
+
 
 class Encoder:
     """Class to encode categorical and ordinal features.
@@ -18,6 +27,12 @@ class Encoder:
         self.ord_dict = None
         self.ord_cols = []
         self.one_hot = False
+        self.vocabularies = None
+        self.currency_cols = []
+        self.number_formats = {}
+        self.learned_cat_cols = None
+        self.approximate = False
+        self.distinct_counts = None
 
     def __repr__(self):
         return f"Encoder(target_label={self.target_label} ,train_df=None, test_df=None, cat_cols=None, ord_dict=None, one_hot={self.one_hot})"
@@ -68,141 +83,294 @@ class Encoder:
                         f" Received {self.ord_dict[key]}"
                     )
 
-    def __encode_categorical_util(self):
-        """
-        Helper function to encode categorical columns using pd.factorize. Encoding will not affect the
-        original columns. Instead a new column will be made with the name 'col_nameEncoding'.
+    def __detect_cat_cols(self):
         """
-        cat = []
-        # cat = self.cat_cols
-        for col in self.cat_cols:
-            if (
-                col in self.train_df
-                and col + str("Encoded") not in self.ord_cols
-            ):
-                if self.test_df is not None:
-                    self.test_df[col + str("Encoded")] = pd.factorize(
-                        self.test_df[col]
-                    )[0]
-                    self.test_df[col + str("Encoded")] = self.test_df[
-                        col + str("Encoded")
-                    ].astype("category")
-                self.train_df[col + str("Encoded")] = pd.factorize(
-                    self.train_df[col]
-                )[0]
-                self.train_df[col + str("Encoded")] = self.train_df[
-                    col + str("Encoded")
-                ].astype("category")
-                cat.append(str(col + str("Encoded")))
-        self.cat_cols += cat
-
-    def __encode_one_hot_util(self):
+        Function to find out which columns may be categorical. A column is categorical if its number of
+        distinct values is less than 20% of the number of rows. Columns of formatted numbers are recorded in
+        self.currency_cols with their format and are converted to floats instead. The distinct values counted by the
+        Parser on the same rows are reused.
         """
-        Helper function to one-hot encode categorical columns using pd.get_dummies. Encoding will not affect the
-        original columns. Instead a new column will be made with the name 'col_labelname'.
+        rows = self.train_df.shape[0]
+        counts = {}
+        if (
+            isinstance(self.distinct_counts, dict)
+            and self.distinct_counts.get("rows") == rows
+        ):
+            counts = self.distinct_counts.get("counts", {})
+        rows = 0.2 * rows
+        ord_keys = list(self.ord_dict.keys()) if self.ord_dict else []
+        cat_cols = []
+        for col in self.train_df.columns:
+            if col in ord_keys or col == self.target_label:
+                continue
+            number_format = detect_number_format(self.train_df[col])
+            if number_format is not None:
+                self.currency_cols.append(col)
+                self.number_formats[col] = number_format
+            elif (
+                is_numeric_dtype(self.train_df[col])
+                or is_string_dtype(self.train_df[col])
+            ) and (
+                counts[col]
+                if col in counts
+                else count_distinct(self.train_df[col], rows, self.approximate)
+            ) < rows:
+                cat_cols.append(col)
+        return cat_cols
+
+    def __read_params(self, params):
+        if "test_df" in params.keys():
+            self.test_df = params["test_df"]
+        if "train_df" in params.keys():
+            self.train_df = params["train_df"]
+        if "target_label" in params.keys():
+            self.target_label = params["target_label"]
+        if "cat_cols" in params.keys():
+            self.cat_cols = params["cat_cols"]
+        if "ord_dict" in params.keys():
+            self.ord_dict = params["ord_dict"]
+        if "one_hot" in params.keys():
+            if params["one_hot"] is True:
+                self.one_hot = True
+        self.approximate = params.get("approximate_distinct", False)
+        self.distinct_counts = params.get("distinct_counts")
+
+    def __vocabulary_cols(self, cat_cols):
+        ord_cols = []
+        if self.ord_dict:
+            ord_cols = [key + str("Encoded") for key in self.ord_dict.keys()]
+        return [
+            col
+            for col in cat_cols
+            if col in self.train_df and col + str("Encoded") not in ord_cols
+        ]
+
+    def reset(self):
+        """Discards the categorical columns and vocabularies learned by :meth:`fit` and
+        :meth:`partial_fit`.
+
+        .. versionadded:: 1.0.5
         """
-        for col in self.cat_cols.copy():
-            if (
-                col in self.train_df
-                and col + str("Encoded") not in self.ord_cols
-            ):
-                if self.test_df is not None:
-                    self.test_df = pd.concat(
-                        [
-                            self.test_df,
-                            pd.get_dummies(
-                                self.test_df[col], prefix=col
-                            ).astype("category"),
-                        ],
-                        axis=1,
-                    )
-                self.train_df = pd.concat(
-                    [
-                        self.train_df,
-                        pd.get_dummies(self.train_df[col], prefix=col).astype(
-                            "category"
-                        ),
-                    ],
-                    axis=1,
-                )
-                for val in self.train_df[col].unique():
-                    if col + "_" + str(val) not in self.train_df.columns:
-                        raise ValueError(
-                            f"Encoded column {col}_{val} not found. {col} has value {val}."
-                        )
-                    else:
-                        self.cat_cols.append(col + "_" + str(val))
-
-    def __encode_categorical(self):
+        self.vocabularies = {}
+        self.currency_cols = []
+        self.number_formats = {}
+        self.learned_cat_cols = None
+
+    def fit(self, params):
+        """Learns the vocabulary of every categorical column of the train dataframe. Values are
+        numbered in the order in which they are first seen, the same way as ``pd.factorize``. If
+        ``cat_cols`` is not provided, the categorical columns are identified first. Takes the same
+        parameters as :meth:`encode`.
+
+        .. versionadded:: 1.0.5
         """
-        Function to find out which columns may be categorical. All such columns will have their title
-        added to self.cat_cols which the user can use to identify which columns the code has identified as
-        categorical. During encoding the map formed for encoding won't be sorted. Sort will be added in v2
-        if demanded.
+        self.__read_params(params)
+        self.__validate_inputs()
+        self.reset()
+        cat_cols = self.cat_cols
+        if cat_cols is None:
+            cat_cols = self.learned_cat_cols = self.__detect_cat_cols()
+
+        for col in self.__vocabulary_cols(cat_cols):
+            values = self.train_df[col].dropna().unique()
+            self.vocabularies[col] = {
+                value: i for i, value in enumerate(values)
+            }
+
+    def partial_fit(self, params):
+        """Learns the vocabulary of every categorical column from a chunk of the train
+        dataframe. Values are numbered in the order in which they are first seen, the same
+        way as ``pd.factorize``. Takes the same parameters as :meth:`encode`.
+
+        :raises ArgumentsError: If ``cat_cols`` is not provided. Use the ``Parser`` to
+                                identify the categorical columns before encoding in chunks.
+
+        .. versionadded:: 1.0.5
         """
+        self.__read_params(params)
+        self.__validate_inputs()
+        if self.vocabularies is None:
+            self.reset()
         if self.cat_cols is None:
-            rows = self.train_df.shape[0]
-            rows = 0.2 * rows
-            self.cat_cols = []
-            for col in self.train_df.columns:
-                if col not in self.ord_cols:
-                    if (
-                        self.train_df[col].dtype == "object"
-                        and type(self.train_df[col][0]) is str
-                    ) and (
-                        "$" in self.train_df[col][0]
-                        or self.train_df[col].str.contains(",").any()
-                    ):
-                        self.train_df[col] = (
-                            self.train_df[col]
-                            .apply(
-                                lambda x: x.replace("$", "").replace(",", "")
-                            )
-                            .astype("float")
-                        )
-                    # elif pd.to_datetime(
-                    #     self.train_df[col], errors="coerce"
-                    # ).isnull().sum() < 0.7 * len(self.train_df[col]):
-                    #     self.train_df[col] = pd.to_datetime(
-                    #         self.train_df[col], errors="coerce"
-                    #     )
-                    elif (
-                        is_numeric_dtype(self.train_df[col])
-                        or is_string_dtype(self.train_df[col])
-                    ) and self.train_df[col].dropna().nunique() < rows:
-                        self.cat_cols.append(col)
-                else:
-                    continue
-
-        if self.one_hot:
-            self.__encode_one_hot_util()
-        else:
-            self.__encode_categorical_util()
-        return
-
-    def __encode_ordinal(self):
+            raise ArgumentsError(
+                "'cat_cols' is required to encode a dataframe in chunks. Add the"
+                " Parser to the pipeline before the Encoder."
+            )
+
+        for col in self.__vocabulary_cols(self.cat_cols):
+            vocabulary = self.vocabularies.setdefault(col, {})
+            for value in self.train_df[col].dropna().unique():
+                if value not in vocabulary:
+                    vocabulary[value] = len(vocabulary)
+
+    def get_state(self):
+        """Returns the vocabularies learned by :meth:`fit` or :meth:`partial_fit`. The
+        vocabulary of a column lists its values in the order of their codes.
+
+        :rtype: dict
+
+        .. versionadded:: 1.0.5
+        """
+        if self.vocabularies is None:
+            raise ValueError(
+                "Encoder is not fitted. Please fit the encoder before calling"
+                " transform."
+            )
+        return {
+            "cat_cols": self.learned_cat_cols,
+            "currency_cols": list(self.currency_cols),
+            "number_formats": {
+                col: dict(self.number_formats.get(col, DEFAULT_NUMBER_FORMAT))
+                for col in self.currency_cols
+            },
+            "vocabularies": {
+                col: list(vocabulary)
+                for col, vocabulary in self.vocabularies.items()
+            },
+        }
+
+    def set_state(self, state):
+        """Restores the state returned by :meth:`get_state`.
+
+        :param state: The categorical columns and their vocabularies
+        :type state: dict
+
+        .. versionadded:: 1.0.5
         """
-        Function to encode ordinal columns as provided by user in the form of a dictionary. Format for the
-        parameter is specified at the top during initialization.
+        self.reset()
+        self.learned_cat_cols = state["cat_cols"]
+        self.currency_cols = list(state["currency_cols"])
+        self.number_formats = dict(state.get("number_formats", {}))
+        self.vocabularies = {
+            col: {value: i for i, value in enumerate(values)}
+            for col, values in state["vocabularies"].items()
+        }
+
+    def save_state(self, file_path):
+        """Saves the state returned by :meth:`get_state` to a ``JSON`` file.
+
+        :param file_path: Path where the state file must be created
+        :type file_path: str
+
+        .. versionadded:: 1.0.5
         """
-        for key, value in self.ord_dict.items():
-            if key in self.train_df.columns:
-                if self.test_df is not None:
-                    self.test_df[key + str("Encoded")] = self.test_df[key].map(
-                        value
+        save_state(file_path, self.get_state())
+
+    def load_state(self, file_path):
+        """Restores the state saved by :meth:`save_state`.
+
+        :param file_path: Path to the state file
+        :type file_path: str
+
+        .. versionadded:: 1.0.5
+        """
+        self.set_state(read_state(file_path))
+
+    def __transform_frame(self, df, cat):
+        for col in self.currency_cols:
+            df[col] = parse_numbers(
+                df[col], self.number_formats.get(col, DEFAULT_NUMBER_FORMAT)
+            )
+
+        if self.ord_dict:
+            for key, value in self.ord_dict.items():
+                if key in df.columns:
+                    df[key + str("Encoded")] = (
+                        df[key].map(value).astype("category")
                     )
-                    self.test_df[key + str("Encoded")] = self.test_df[
-                        key + str("Encoded")
-                    ].astype("category")
 
-                self.train_df[key + str("Encoded")] = self.train_df[key].map(
-                    value
+        for col, vocabulary in self.vocabularies.items():
+            if self.one_hot:
+                categories = list(vocabulary)
+                try:
+                    categories = sorted(categories)
+                except TypeError:
+                    pass
+                dummies = pd.get_dummies(
+                    pd.Categorical(df[col], categories=categories), prefix=col
+                ).astype("category")
+                dummies.index = df.index
+                df = pd.concat([df, dummies], axis=1)
+                cat.extend(dummies.columns)
+            else:
+                column = df[col]
+                if isinstance(column.dtype, pd.CategoricalDtype):
+                    # a mapped categorical stays categorical and rejects the -1
+                    column = column.astype("object")
+                df[col + str("Encoded")] = (
+                    column.map(vocabulary)
+                    .fillna(-1)
+                    .astype("int64")
+                    .astype("category")
                 )
-                self.train_df[key + str("Encoded")] = self.train_df[
-                    key + str("Encoded")
-                ].astype("category")
-                self.ord_cols.append(key + str("Encoded"))
+                cat.append(col + str("Encoded"))
+        return df
+
+    def transform(self, params):
+        """Encodes the train and test dataframes using the vocabularies learned by
+        :meth:`fit`. Values that were not seen while fitting are encoded as ``-1``.
+        Takes the same parameters as :meth:`encode`.
+
+        .. versionadded:: 1.0.5
+        """
+        self.__read_params(params)
+        self.__validate_inputs()
+        state = self.get_state()
 
+        cat = []
+        source = self.train_df
+        self.train_df = self.__transform_frame(self.train_df, cat)
+        statistics = params.get("column_statistics")
+        if statistics is not None:
+            statistics.refresh(
+                source,
+                self.train_df,
+                [
+                    col
+                    for col in source.columns
+                    if col not in self.currency_cols
+                ],
+            )
+        if self.test_df is not None:
+            self.test_df = self.__transform_frame(self.test_df, [])
+
+        cat_cols = (
+            self.cat_cols if self.cat_cols is not None else state["cat_cols"]
+        )
+        self.ord_cols = (
+            [
+                key + str("Encoded")
+                for key in self.ord_dict.keys()
+                if key in self.train_df.columns
+            ]
+            if self.ord_dict
+            else []
+        )
+        params["train_df"] = self.train_df
+        params["test_df"] = self.test_df
+        params["cat_cols"] = list(cat_cols or []) + cat
+        params["ord_cols"] = self.ord_cols
+
+    @step_io(
+        reads=[
+            "train_df",
+            "test_df",
+            "target_label",
+            "cat_cols",
+            "ord_dict",
+            "one_hot",
+            "approximate_distinct",
+            "distinct_counts",
+            "column_statistics",
+        ],
+        writes=[
+            "train_df",
+            "test_df",
+            "cat_cols",
+            "ord_cols",
+            "column_statistics",
+        ],
+    )
     def encode(self, params):
         """
         Function to encode categorical or ordinal columns.
@@ -227,27 +395,20 @@ class Encoder:
         :param one_hot: This parameter takes True or False to indicate whether the user wants to encode using one-hot.
         :type one-hot: bool
 
-        """
-        if "test_df" in params.keys():
-            self.test_df = params["test_df"]
-        if "train_df" in params.keys():
-            self.train_df = params["train_df"]
-        if "target_label" in params.keys():
-            self.target_label = params["target_label"]
-        if "cat_cols" in params.keys():
-            self.cat_cols = params["cat_cols"]
-        if "ord_dict" in params.keys():
-            self.ord_dict = params["ord_dict"]
-        if "one_hot" in params.keys():
-            if params["one_hot"] is True:
-                self.one_hot = True
+        :param approximate_distinct: If ``True`` and ``cat_cols`` is not provided, the distinct
+                                     values of the columns are estimated like the ``Parser``
+                                     does. Defaults to ``False``.
+        :type approximate_distinct: bool
 
-        self.__validate_inputs()
-        if self.ord_dict:
-            self.__encode_ordinal()
-        self.__encode_categorical()
+        :param distinct_counts: Distinct values of the columns of ``train_df`` counted by the
+                                ``Parser``. Used instead of counting them again if
+                                ``train_df`` has the same number of rows.
+        :type distinct_counts: dict
 
-        params["train_df"] = self.train_df
-        params["test_df"] = self.test_df
-        params["cat_cols"] = self.cat_cols
-        params["ord_cols"] = self.ord_cols
+        .. versionchanged:: 1.0.5
+            Does :meth:`fit` and :meth:`transform` in a single step. ``test_df`` is encoded
+            with the vocabularies of ``train_df``. Added ``approximate_distinct`` and
+            ``distinct_counts``.
+        """
+        self.fit(params)
+        self.transform(params)
@@ -1,7 +1,9 @@
 import numpy as np
 import pandas as pd
-from sklearn.feature_selection import f_classif
-from sklearn.feature_selection import f_regression
+
+from ..utils import read_state
+from ..utils import save_state
+from ..utils import step_io
 
 
 class SelectKBest:
@@ -48,6 +50,7 @@ class SelectKBest:
         self.target_label = None
         self.X = None
         self.y = None
+        self.features = None
 
     def __repr__(self):
         return f"SelectKBest(score_func={self.score_func}, k={self.k})"
@@ -148,6 +151,10 @@ class SelectKBest:
         self.y = self.train_df[self.target_label]
 
         if self.score_func is None:
+            # sklearn is slow to import, it is only loaded for the default scoring
+            from sklearn.feature_selection import f_classif
+            from sklearn.feature_selection import f_regression
+
             if (self.y.nunique() // self.X.shape[0]) <= 0.2:
                 self.score_func = f_classif
             else:
@@ -168,8 +175,69 @@ class SelectKBest:
             self.pvalues = None
 
         self.scores = np.asarray(self.scores)
+        self.features = None
         params["score_func"] = self.score_func
 
+    def get_state(self):
+        """Returns the names of the features selected by :meth:`fit`.
+
+        :rtype: dict
+
+        :raises ValueError: If the estimator is not fitted or no features are selected
+
+        .. versionadded:: 1.0.5
+        """
+        if self.features is None:
+            mask = self.__get_mask()
+            if not mask.any():
+                raise ValueError(
+                    "No features were selected: either the data is too noisy or"
+                    " the selection test too strict."
+                )
+            self.features = list(self.X.columns[mask])
+        return {"features": list(self.features)}
+
+    def set_state(self, state):
+        """Restores the state returned by :meth:`get_state`.
+
+        :param state: The names of the selected features
+        :type state: dict
+
+        .. versionadded:: 1.0.5
+        """
+        self.features = list(state["features"])
+
+    def save_state(self, file_path):
+        """Saves the state returned by :meth:`get_state` to a ``JSON`` file.
+
+        :param file_path: Path where the state file must be created
+        :type file_path: str
+
+        .. versionadded:: 1.0.5
+        """
+        save_state(file_path, self.get_state())
+
+    def load_state(self, file_path):
+        """Restores the state saved by :meth:`save_state`.
+
+        :param file_path: Path to the state file
+        :type file_path: str
+
+        .. versionadded:: 1.0.5
+        """
+        self.set_state(read_state(file_path))
+
+    def __select(self, df, features, name):
+        missing = [col for col in features if col not in df.columns]
+        if missing:
+            raise ValueError(
+                f"{name} has a different shape than during fitting. Missing"
+                f" columns: {missing}"
+            )
+        if self.target_label in df.columns:
+            features = features + [self.target_label]
+        return df[features]
+
     def transform(self, params):
         """Function to reduce ``train_df`` and ``test_df`` to the selected features. Adds dataframes of shape ``(n_samples, k)``
         to ``params``
@@ -194,40 +262,36 @@ class SelectKBest:
 
         :raises ValueError: No features are selected when ``k = 0``
         :raises ValueError: After performing ``fit()``, ``ValueError`` is raised if
-                            length of mask and number of ``train_df`` or ``test_df``
-                            columns do not match.
+                            ``train_df`` or ``test_df`` does not have the selected
+                            features.
+
+        .. versionchanged:: 1.0.5
+            The selected features are taken from ``train_df`` and ``test_df`` in
+            ``params`` instead of the dataframe seen by :meth:`fit`. The target
+            column is kept only if it is present.
         """
 
+        if "train_df" in params.keys():
+            self.train_df = params["train_df"]
+        if "test_df" in params.keys():
+            self.test_df = params["test_df"]
+        if "target_label" in params.keys():
+            self.target_label = params["target_label"]
         if "score_func" in params.keys():
             self.score_func = params["score_func"]
-        if "k" in params.keys():
+        if "k" in params.keys() and params["k"] != self.k:
             self.k = params["k"]
+            self.features = None
 
-        mask = self.__get_mask()
-        if not mask.any():
-            raise ValueError(
-                "No features were selected: either the data is too noisy or"
-                " the selection test too strict."
-            )
-
-        if len(mask) != self.X.shape[1]:
-            raise ValueError(
-                "train_df has a different shape than during fitting."
-            )
-
-        self.X = self.X.iloc[:, mask]
-        self.X[self.target_label] = self.y
-        params["train_df"] = self.X
+        features = self.get_state()["features"]
+        params["train_df"] = self.__select(self.train_df, features, "train_df")
         if self.test_df is not None:
-            self.X = self.test_df.drop(self.target_label, axis=1)
-            if len(mask) != self.X.shape[1]:
-                raise ValueError(
-                    "test_df has a different shape than during fitting."
-                )
-            self.X = self.X.iloc[:, mask]
-            self.X[self.target_label] = self.test_df[self.target_label]
-            params["test_df"] = self.X
+            params["test_df"] = self.__select(self.test_df, features, "test_df")
 
+    @step_io(
+        reads=["train_df", "test_df", "target_label", "score_func", "k"],
+        writes=["train_df", "test_df", "score_func"],
+    )
     def fit_transform(self, params):
         """Does fit() and transform() in single step
 
@@ -1,3 +1,4 @@
 from ._read import Reader
+from ._sql import SQLReader
 
-__all__ = ["Reader"]
+__all__ = ["Reader", "SQLReader"]
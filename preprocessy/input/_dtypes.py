@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_float_dtype
+from pandas.api.types import is_integer_dtype
+from pandas.api.types import is_object_dtype
+
+from ..utils import detect_number_format
+
+# same rule as Parser: a column is categorical if its number of distinct values is
+# less than 20% of the number of rows
+CATEGORY_RATIO = 0.2
+
+
+def _is_currency(column):
+    # formatted numbers are converted to floats by Parser and must stay strings, they
+    # are detected with the same rule
+    return detect_number_format(column) is not None
+
+
+def infer_read_dtypes(sample):
+    """Returns the dtypes that can be applied while a file is parsed, learned from a
+    sample of its rows. Float columns are read as ``float32`` and low cardinality string
+    columns as ``category``. Integer columns are left to :func:`downcast`, a sample cannot
+    bound the values of the other rows and integers that do not fit are wrapped around by
+    the parser.
+
+    :param sample: The first rows of the file
+    :type sample: pandas.core.frames.DataFrame
+
+    :rtype: dict
+    """
+    dtypes = {}
+    rows = CATEGORY_RATIO * sample.shape[0]
+    for col in sample.columns:
+        column = sample[col]
+        if is_float_dtype(column):
+            dtypes[col] = "float32"
+        elif (
+            is_object_dtype(column)
+            and column.dropna().nunique() < rows
+            and not _is_currency(column)
+        ):
+            dtypes[col] = "category"
+    return dtypes
+
+
+def downcast(df, read_dtypes=None):
+    """Converts the columns of ``df`` in place to compact dtypes. Integer columns are
+    converted to the smallest of ``int8``, ``int16`` and ``int32`` that holds all their
+    values and float columns to ``float32``. The ``category`` columns of ``read_dtypes``
+    that the parser could not apply are converted too.
+
+    :param df: The dataframe
+    :type df: pandas.core.frames.DataFrame
+
+    :param read_dtypes: Dtypes inferred by :func:`infer_read_dtypes`
+    :type read_dtypes: dict
+    """
+    read_dtypes = read_dtypes or {}
+    for col in df.columns:
+        column = df[col]
+        if is_integer_dtype(column) and column.dtype.itemsize > 1:
+            df[col] = pd.to_numeric(column, downcast="integer")
+        elif is_float_dtype(column) and column.dtype != np.float32:
+            df[col] = column.astype("float32")
+        elif (
+            read_dtypes.get(col) == "category"
+            and column.dtype != "category"
+            and is_object_dtype(column)
+        ):
+            df[col] = column.astype("category")
+
+
+def align_dtypes(frames):
+    """Converts the integer columns that the dataframes share to a common dtype, so
+    that the train and test dataframes are described by the same schema.
+
+    :param frames: The dataframes
+    :type frames: list
+    """
+    frames = [df for df in frames if df is not None]
+    for col in frames[0].columns:
+        dtypes = [df[col].dtype for df in frames if col in df]
+        if len(set(dtypes)) > 1 and all(is_integer_dtype(d) for d in dtypes):
+            common = np.result_type(*dtypes)
+            for df in frames:
+                if col in df:
+                    df[col] = df[col].astype(common)
+
+
+def schema(df):
+    """Returns the dtype of every column of ``df`` as a string.
+
+    :rtype: dict
+    """
+    return {str(col): str(dtype) for col, dtype in df.dtypes.items()}
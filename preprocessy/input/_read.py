@@ -1,13 +1,66 @@
+import copy
+import csv
 import errno
+import glob
+import hashlib
+import io
+import multiprocessing
 import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 
 import pandas as pd
 
+from ..utils import step_io
+from ._dtypes import align_dtypes
+from ._dtypes import downcast
+from ._dtypes import infer_read_dtypes
+from ._dtypes import schema
+from ._schema import file_key
+from ._schema import read_sidecar
+from ._schema import sidecar_path
+from ._schema import write_sidecar
+from ._stream import RangeStream
+from ._stream import open_stream
+
+
+COMPRESSION_EXTENSIONS = ["gz", "bz2", "zip", "xz", "zst"]
+CSV_ENGINES = ["c", "python", "pyarrow"]
+DTYPE_BACKENDS = ["numpy_nullable", "pyarrow"]
+# delimiters that are sniffed and the number of bytes they are sniffed from
+DELIMITERS = ",;\t|"
+SNIFF_BYTES = 16384
+# longest header line that is hashed for the schema sidecar
+HEADER_BYTES = 1 << 20
+
+
+def _shard_context():
+    # shards can be read from a worker thread of the reader or of a pipeline, forking a
+    # process that runs several threads can deadlock the child on a lock held by
+    # another thread
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context(
+        "forkserver" if "forkserver" in methods else "spawn"
+    )
+
 
 class Reader(object):
     """Standard Reader Class that serves to read and load numeric data into pandas dataframe.
 
-    The file extensions allowed are: .csv, .xls, .xlxs, .xlsm, .xlsb, .odf, .ods, .odt
+    The file extensions allowed are: .csv, .tsv, .xls, .xlxs, .xlsm, .xlsb, .odf, .ods, .odt,
+    .parquet, .pq, .feather, .arrow and .ipc
+
+    .csv and .tsv files can be compressed with .gz, .bz2, .xz, .zip or .zst. They are
+    decompressed by a background thread while they are parsed. An uncompressed .csv or
+    .tsv file can be split into byte ranges with :meth:`partitions` that are read
+    independently.
+
+    .. versionchanged:: 1.0.5
+        Added the columnar formats Parquet, Feather and Arrow IPC. They require the
+        ``arrow`` extra. Added compressed files, .zst requires the ``zstd`` extra. Added
+        partitioned reading of .csv and .tsv files.
     """
 
     def __init__(self):
@@ -20,8 +73,28 @@ class Reader(object):
             "ods",
             "odt",
         ]
+        self.columnar_extensions = {
+            "parquet": "parquet",
+            "pq": "parquet",
+            "feather": "ipc",
+            "arrow": "ipc",
+            "ipc": "ipc",
+        }
         self.train_df_path = None
         self.test_df_path = None
+        self.columns = None
+        self.filters = None
+        self.memory_map = False
+        self.optimize_dtypes = False
+        self.sample_size = 10000
+        self.read_dtypes = None
+        self.workers = None
+        self.engine = "c"
+        self.dtype_backend = None
+        self.delimiter = None
+        self.schema_cache = False
+        self.sidecar = None
+        self.partition = None
 
     def _validate_input(self, file_name):
         if type(file_name) is not str:
@@ -31,29 +104,210 @@ class Reader(object):
         else:
             self.file_name = file_name
 
+    def __validate_options(self):
+        if self.columns is not None and (
+            not isinstance(self.columns, list)
+            or not all(isinstance(c, str) for c in self.columns)
+        ):
+            raise TypeError(
+                f"'read_columns' should be a list of str. Received {self.columns} of type {type(self.columns)}"
+            )
+        if self.filters is not None and not isinstance(self.filters, list):
+            raise TypeError(
+                f"'read_filters' should be a list of (column, operator, value) tuples. Received {self.filters} of type {type(self.filters)}"
+            )
+        if not isinstance(self.memory_map, bool):
+            raise TypeError(
+                f"'memory_map' should be of type bool. Received {self.memory_map} of type {type(self.memory_map)}"
+            )
+        if self.workers is not None and (
+            not isinstance(self.workers, int)
+            or isinstance(self.workers, bool)
+            or self.workers <= 0
+        ):
+            raise ValueError(
+                f"'read_workers' should be a positive integer. Received {self.workers}"
+            )
+        if self.engine not in CSV_ENGINES:
+            raise ValueError(
+                f"'csv_engine' should be one of {CSV_ENGINES}. Received {self.engine}"
+            )
+        if (
+            self.dtype_backend is not None
+            and self.dtype_backend not in DTYPE_BACKENDS
+        ):
+            raise ValueError(
+                f"'dtype_backend' should be one of {DTYPE_BACKENDS}. Received {self.dtype_backend}"
+            )
+        if self.delimiter is not None and (
+            not isinstance(self.delimiter, str) or len(self.delimiter) == 0
+        ):
+            raise TypeError(
+                f"'delimiter' should be a non empty str. Received {self.delimiter} of type {type(self.delimiter)}"
+            )
+        if not isinstance(self.schema_cache, (bool, str)):
+            raise TypeError(
+                f"'schema_cache' should be of type bool or str. Received {self.schema_cache} of type {type(self.schema_cache)}"
+            )
+        if not isinstance(self.optimize_dtypes, bool):
+            raise TypeError(
+                f"'optimize_dtypes' should be of type bool. Received {self.optimize_dtypes} of type {type(self.optimize_dtypes)}"
+            )
+        if self.optimize_dtypes and self.dtype_backend is not None:
+            raise ValueError(
+                "'optimize_dtypes' chooses numpy dtypes and cannot be combined with 'dtype_backend'"
+            )
+        if (
+            not isinstance(self.sample_size, int)
+            or isinstance(self.sample_size, bool)
+            or self.sample_size <= 0
+        ):
+            raise ValueError(
+                f"'dtype_sample_size' should be a positive integer. Received {self.sample_size}"
+            )
+
+    def __extension(self):
+        parts = os.path.basename(self.file_name).lower().split(".")
+        if len(parts) > 2 and parts[-1] in COMPRESSION_EXTENSIONS:
+            return parts[-2]
+        return parts[-1] if len(parts) > 1 else ""
+
+    def __read_columnar(self, file_format):
+        try:
+            import pyarrow.dataset as ds
+            import pyarrow.parquet as pq
+            from pyarrow import fs
+        except ImportError as e:
+            raise ImportError(
+                "Reading Parquet, Feather and Arrow IPC files requires pyarrow. Install"
+                " it with 'pip install preprocessy[arrow]'"
+            ) from e
+
+        if not os.path.isfile(self.file_name):
+            raise FileNotFoundError(
+                errno.ENOENT, os.strerror(errno.ENOENT), self.file_name
+            )
+        dataset = ds.dataset(
+            self.file_name,
+            format=file_format,
+            filesystem=fs.LocalFileSystem(use_mmap=self.memory_map),
+        )
+        expression = None
+        if self.filters:
+            expression = pq.filters_to_expression(self.filters)
+        # only the projected columns and the row groups that can match the filters
+        # are read from the file
+        table = dataset.to_table(columns=self.columns, filter=expression)
+        return table.to_pandas()
+
+    def __compression(self):
+        parts = os.path.basename(self.file_name).lower().split(".")
+        if len(parts) > 2 and parts[-1] in COMPRESSION_EXTENSIONS:
+            return parts[-1]
+        return None
+
+    def __open(self, partition=None):
+        if partition is not None:
+            # the header line is parsed before the rows of the partition
+            with open(self.file_name, "rb") as f:
+                header = f.readline()
+            start, end = partition
+            return io.BufferedReader(
+                RangeStream(self.file_name, header, start, end)
+            )
+        # compressed files are decompressed by a background thread and streamed to
+        # the parser
+        compression = self.__compression()
+        if compression is None:
+            return nullcontext(self.file_name)
+        return open_stream(self.file_name, compression)
+
+    def __separator(self):
+        extension = self.__extension()
+        if extension == "tsv":
+            return "\t"
+        if self.delimiter is not None:
+            return self.delimiter
+        compression = self.__compression()
+        if compression is None:
+            source = open(self.file_name, "rb")
+        else:
+            source = open_stream(self.file_name, compression, SNIFF_BYTES)
+        with source as f:
+            sample = f.read(SNIFF_BYTES)
+        text = sample.decode("utf-8", errors="replace")
+        if len(sample) == SNIFF_BYTES:
+            # the last line of the sample is cut
+            text = text[: text.rfind("\n")]
+        try:
+            return csv.Sniffer().sniff(text, delimiters=DELIMITERS).delimiter
+        except csv.Error:
+            return ","
+
+    def __sample_dtypes(self, file_name):
+        self._validate_input(file_name)
+        if self.__extension() not in ["csv", "tsv"]:
+            # the other formats are typed, the dtypes are inferred once they are read
+            return
+        sep = self.__separator()
+        with self.__open() as source:
+            sample = pd.read_csv(
+                source, sep=sep, usecols=self.columns, nrows=self.sample_size
+            )
+        self.read_dtypes = infer_read_dtypes(sample)
+
+    def __read_csv(self):
+        options = {
+            "sep": self.__separator(),
+            "usecols": self.columns,
+            "engine": self.engine,
+        }
+        if self.dtype_backend is not None:
+            options["dtype_backend"] = self.dtype_backend
+        if self.read_dtypes is None:
+            with self.__open(self.partition) as source:
+                return pd.read_csv(source, **options)
+        try:
+            with self.__open(self.partition) as source:
+                return pd.read_csv(source, dtype=self.read_dtypes, **options)
+        except ValueError:
+            # a row after the sample does not fit a float dtype, only the categories
+            # are applied while parsing
+            categories = {
+                col: dtype
+                for col, dtype in self.read_dtypes.items()
+                if dtype == "category"
+            }
+            with self.__open(self.partition) as source:
+                return pd.read_csv(source, dtype=categories, **options)
+
     def __read_file_util(self, file_name):
         self._validate_input(file_name)
+        self.__validate_options()
         df = None
+        extension = self.__extension()
 
-        if ".csv" in self.file_name:
-            df = pd.read_csv(self.file_name)
-            if df is None:
-                df = pd.read_csv(self.file_name, delimiter=";")
-        elif ".tsv" in self.file_name:
-            df = pd.read_csv(self.file_name, sep="\t")
-        elif self.file_name.split(".")[-1] in self.excel_extensions:
-            df = pd.read_excel(self.file_name)
+        if self.__compression() is not None and extension not in ["csv", "tsv"]:
+            raise ValueError(
+                f"Only .csv and .tsv files can be compressed. Received file of type .{extension}.{self.__compression()}"
+            )
+        if extension in self.columnar_extensions:
+            df = self.__read_columnar(self.columnar_extensions[extension])
+        elif self.filters:
+            raise ValueError(
+                f"'read_filters' is only supported for Parquet, Feather and Arrow IPC files. Received file of type .{extension}"
+            )
+        elif extension in ["csv", "tsv"]:
+            df = self.__read_csv()
+        elif extension in self.excel_extensions:
+            df = pd.read_excel(self.file_name, usecols=self.columns)
         else:
             raise ValueError(
-                f'Unsupported filetype. Supported extensions include [.csv, .tsv, .xls, .xlsx, .xlsm, .xlsb, .odf, .ods and .odt]. Received file of type .{self.file_name.split(".")[-1]}'
+                f"Unsupported filetype. Supported extensions include [.csv, .tsv, .xls, .xlsx, .xlsm, .xlsb, .odf, .ods, .odt, .parquet, .pq, .feather, .arrow and .ipc]. Received file of type .{extension}"
             )
 
         if df is not None:
-            df.drop(
-                df.columns[df.columns.str.contains("unnamed", case=False)],
-                axis=1,
-                inplace=True,
-            )
+            self.__drop_unnamed(df)
         else:
             raise FileNotFoundError(
                 errno.ENOENT, os.strerror(errno.ENOENT), self.file_name
@@ -61,21 +315,459 @@ class Reader(object):
 
         return df
 
+    def _read_shard(self, file_name):
+        # executed by the worker processes of __read
+        return self.__read_file_util(file_name)
+
+    def __validate_partitioned(self, file_name):
+        self._validate_input(file_name)
+        extension = self.__extension()
+        if extension not in ["csv", "tsv"]:
+            raise ValueError(
+                f"Unsupported filetype for partitioned reading. Supported extensions include [.csv, .tsv]. Received file of type .{extension}"
+            )
+        if self.__compression() is not None:
+            raise ValueError(
+                f"Compressed files cannot be partitioned. Received file of type .{extension}.{self.__compression()}"
+            )
+        if not os.path.isfile(file_name):
+            raise FileNotFoundError(
+                errno.ENOENT, os.strerror(errno.ENOENT), file_name
+            )
+
+    def __validate_partition(self, paths):
+        if len(paths) != 1:
+            raise ValueError(
+                f"'train_partition' requires a single train file. Received {len(paths)} files"
+            )
+        self.__validate_partitioned(paths[0])
+        if (
+            not isinstance(self.partition, (list, tuple))
+            or len(self.partition) != 2
+            or not all(
+                isinstance(offset, int) and not isinstance(offset, bool)
+                for offset in self.partition
+            )
+        ):
+            raise TypeError(
+                f"'train_partition' should be a (start, end) tuple of int. Received {self.partition} of type {type(self.partition)}"
+            )
+        with open(paths[0], "rb") as f:
+            header_end = len(f.readline())
+        start, end = self.partition
+        size = os.path.getsize(paths[0])
+        if not header_end <= start <= end <= size:
+            raise ValueError(
+                f"'train_partition' should be a range of bytes between the end of the header at {header_end} and the end of the file at {size}. Received {self.partition}"
+            )
+
+    def partitions(self, file_name, n_partitions):
+        """Splits a ``.csv`` or ``.tsv`` file into ``n_partitions`` ranges of bytes of about
+        the same size. The header line is left out of the ranges, every range starts at
+        the beginning of a line and ends after a newline, so that no row is split. A range
+        is read with the ``train_partition`` parameter of :meth:`read_file`, which parses
+        the header of the file before the rows of the range. The ranges of a file can thus
+        be read and processed by independent worker processes without splitting the file
+        on disk.
+
+        Fewer ranges are returned if the file has fewer lines than ``n_partitions``. The
+        file must not be compressed, and quoted fields must not contain newlines.
+
+        :param file_name: Path that points to the dataset
+        :type file_name: str
+
+        :param n_partitions: Number of ranges
+        :type n_partitions: int
+
+        :return: ``(start, end)`` offsets of the ranges in the file
+        :rtype: list
+
+        .. versionadded:: 1.0.5
+        """
+        if not isinstance(n_partitions, int) or isinstance(n_partitions, bool):
+            raise TypeError(
+                f"'n_partitions' should be of type int. Received {n_partitions} of type {type(n_partitions)}"
+            )
+        if n_partitions <= 0:
+            raise ValueError(
+                f"'n_partitions' should be a positive integer. Received {n_partitions}"
+            )
+        self.__validate_partitioned(file_name)
+
+        size = os.path.getsize(file_name)
+        with open(file_name, "rb") as f:
+            f.readline()
+            boundaries = [f.tell()]
+            rows = size - boundaries[0]
+            for i in range(1, n_partitions):
+                offset = boundaries[0] + rows * i // n_partitions
+                if offset <= boundaries[-1]:
+                    continue
+                # the range ends after the newline of the line that holds the offset
+                f.seek(offset - 1)
+                f.readline()
+                boundary = f.tell()
+                if boundary >= size:
+                    break
+                if boundary > boundaries[-1]:
+                    boundaries.append(boundary)
+        boundaries.append(size)
+        return list(zip(boundaries[:-1], boundaries[1:]))
+
+    def __expand(self, file_name):
+        if isinstance(file_name, (list, tuple)):
+            if len(file_name) == 0:
+                raise ValueError("Received an empty list of paths")
+            for path in file_name:
+                self._validate_input(path)
+            return list(file_name)
+
+        self._validate_input(file_name)
+        if not glob.has_magic(file_name):
+            return [file_name]
+        paths = sorted(glob.glob(file_name))
+        if len(paths) == 0:
+            raise FileNotFoundError(
+                errno.ENOENT, os.strerror(errno.ENOENT), file_name
+            )
+        return paths
+
+    def __concat(self, frames):
+        # categories are unified so that the categorical columns stay categorical
+        for col in frames[0].columns:
+            if not all(
+                col in df and isinstance(df[col].dtype, pd.CategoricalDtype)
+                for df in frames
+            ):
+                continue
+            categories = frames[0][col].cat.categories
+            for df in frames[1:]:
+                categories = categories.append(
+                    df[col].cat.categories.difference(categories)
+                )
+            for df in frames:
+                df[col] = df[col].cat.set_categories(categories)
+        return pd.concat(frames, ignore_index=True, sort=False)
+
+    def __is_csv(self, file_name):
+        self._validate_input(file_name)
+        return self.__extension() in ["csv", "tsv"]
+
+    def __header_hash(self, file_name):
+        self._validate_input(file_name)
+        compression = self.__compression()
+        if compression is None:
+            source = open(self.file_name, "rb")
+        else:
+            source = open_stream(self.file_name, compression, SNIFF_BYTES)
+        with source as f:
+            header = f.readline(HEADER_BYTES)
+        return hashlib.sha256(header).hexdigest()
+
+    def __schema_key(self, paths):
+        options = {
+            "read_columns": self.columns,
+            "delimiter": self.delimiter,
+            "csv_engine": self.engine,
+            "dtype_backend": self.dtype_backend,
+            "optimize_dtypes": self.optimize_dtypes,
+            "dtype_sample_size": self.sample_size,
+        }
+        return file_key(paths, self.__header_hash(paths[0]), options)
+
+    def __plan(self, file_name):
+        # validates the input, looks up its sidecar and samples its dtypes before it is
+        # read, so that the next inputs can be read concurrently with the same dtypes
+        paths = self.__expand(file_name)
+        self.__validate_options()
+        if self.partition is not None:
+            self.__validate_partition(paths)
+        self.sidecar = None
+        key = None
+        cached = None
+        if self.schema_cache and all(self.__is_csv(path) for path in paths):
+            self.sidecar = sidecar_path(paths, self.schema_cache)
+            key = self.__schema_key(paths)
+            cached = read_sidecar(self.sidecar, key)
+            if self.partition is not None:
+                # a partition reuses the dtypes of the whole file but does not save
+                # its own
+                self.sidecar = None
+
+        if cached is not None:
+            if self.optimize_dtypes and self.read_dtypes is None:
+                # the next inputs are read with the same float and category dtypes
+                self.read_dtypes = {
+                    col: dtype
+                    for col, dtype in cached["dtypes"].items()
+                    if dtype in ["float32", "category"]
+                }
+        elif self.optimize_dtypes and self.read_dtypes is None:
+            self.__sample_dtypes(paths[0])
+        return paths, key, cached
+
+    def __load(self, paths, key, cached):
+        read_dtypes = self.read_dtypes
+        if cached is not None:
+            # the file has not changed, the dtypes of the last read are exact
+            self.read_dtypes = cached["dtypes"]
+
+        workers = self.workers or min(len(paths), os.cpu_count() or 1)
+        try:
+            if len(paths) == 1 or workers == 1:
+                frames = [self.__read_file_util(path) for path in paths]
+            else:
+                # map returns the shards in the order of the paths
+                with ProcessPoolExecutor(
+                    workers, mp_context=_shard_context()
+                ) as executor:
+                    frames = list(executor.map(self._read_shard, paths))
+        finally:
+            if cached is not None:
+                self.read_dtypes = read_dtypes
+
+        df = frames[0] if len(frames) == 1 else self.__concat(frames)
+        del frames
+        if cached is not None:
+            return df
+
+        if self.optimize_dtypes:
+            if self.read_dtypes is None:
+                self.read_dtypes = infer_read_dtypes(df.head(self.sample_size))
+            downcast(df, self.read_dtypes)
+        if self.sidecar is not None:
+            try:
+                write_sidecar(
+                    self.sidecar,
+                    {"key": key, "rows": df.shape[0], "dtypes": schema(df)},
+                )
+            except OSError as e:
+                warnings.warn(
+                    f"Could not write the schema sidecar {self.sidecar}: {e}",
+                    UserWarning,
+                    stacklevel=2,
+                )
+                self.sidecar = None
+        return df
+
+    def __read(self, file_name):
+        return self.__load(*self.__plan(file_name))
+
+    def __drop_unnamed(self, df):
+        df.drop(
+            df.columns[df.columns.str.contains("unnamed", case=False)],
+            axis=1,
+            inplace=True,
+        )
+
+    def read_chunks(self, file_name, chunksize):
+        """Generator that reads a file in chunks of ``chunksize`` rows instead of loading it
+        into memory at once. Only ``.csv`` and ``.tsv`` files can be read in chunks.
+        Compressed files are decompressed while the chunks are read, so the memory does not
+        grow with the size of the file. The shards of a glob pattern or a list of paths
+        are read one after the other and a chunk never spans two shards.
+
+        :param file_name: Path that points to the dataset, a glob pattern or a list of paths
+        :type file_name: str or list
+
+        :param chunksize: Number of rows in every chunk
+        :type chunksize: int
+
+        :yield: The next chunk of the file
+        :rtype: pandas.core.frames.DataFrame
+
+        .. versionadded:: 1.0.5
+        """
+        paths = self.__expand(file_name)
+        if not isinstance(chunksize, int) or isinstance(chunksize, bool):
+            raise TypeError(
+                f"'chunksize' should be of type int. Received {chunksize} of type {type(chunksize)}"
+            )
+        if chunksize <= 0:
+            raise ValueError(
+                f"'chunksize' should be a positive integer. Received {chunksize}"
+            )
+
+        separators = []
+        for path in paths:
+            self._validate_input(path)
+            extension = self.__extension()
+            if extension not in ["csv", "tsv"]:
+                raise ValueError(
+                    f"Unsupported filetype for chunked reading. Supported extensions include [.csv, .tsv]. Received file of type .{extension}"
+                )
+            separators.append(self.__separator())
+
+        for path, sep in zip(paths, separators):
+            self._validate_input(path)
+            with self.__open() as source, pd.read_csv(
+                source, sep=sep, chunksize=chunksize
+            ) as chunks:
+                for chunk in chunks:
+                    self.__drop_unnamed(chunk)
+                    yield chunk
+
+    @step_io(
+        reads=[
+            "train_df_path",
+            "test_df_path",
+            "read_columns",
+            "read_filters",
+            "memory_map",
+            "optimize_dtypes",
+            "dtype_sample_size",
+            "read_workers",
+            "csv_engine",
+            "dtype_backend",
+            "delimiter",
+            "schema_cache",
+            "train_partition",
+        ],
+        writes=["train_df", "test_df", "schema", "schema_sidecar"],
+    )
     def read_file(self, params):
         """Function to take the train and test dataframe paths and load it in pandas dataframe
 
         :param train_df_path: Path that points to the train dataset(Extension can be any of the above listed).
-                        Should not be ``None``.
-        :type train_df_path: str
+                        Should not be ``None``. A glob pattern or a list of paths reads every
+                        file as a shard of the dataset. The shards are concatenated in the
+                        order of the list, or in sorted order for a pattern.
+        :type train_df_path: str or list
 
         :param test_df_path: Path that points to the test dataset(Extension can be any of the above listed).
-        :type test_df_path: str
+                        Accepts a glob pattern or a list of paths like ``train_df_path``.
+        :type test_df_path: str or list
+
+        :param read_columns: Names of the columns to read. Only these columns are read
+                             from Parquet, Feather and Arrow IPC files.
+        :type read_columns: list
+
+        :param read_filters: Filters on the rows of Parquet, Feather and Arrow IPC files, as
+                             a list of ``(column, operator, value)`` tuples that must all
+                             match, or a list of such lists of which one must match. The
+                             row groups of a Parquet file that cannot match are skipped.
+        :type read_filters: list
+
+        :param memory_map: If ``True``, Parquet, Feather and Arrow IPC files are memory
+                           mapped instead of read into memory. Only the pages of the
+                           projected columns are loaded, and they are copied once when
+                           the dataframe is built. Defaults to ``False``.
+        :type memory_map: bool
+
+        :param optimize_dtypes: If ``True``, the columns are converted to compact dtypes. The
+                                dtypes are inferred from the first ``dtype_sample_size``
+                                rows of the train dataset. Float columns are read as
+                                ``float32`` and string columns with less distinct values
+                                than 20% of the sampled rows as ``category``. Integer
+                                columns are converted to the smallest of ``int8``,
+                                ``int16`` and ``int32`` that holds their values. The
+                                chosen dtypes are inserted into ``params`` as ``schema``.
+                                Defaults to ``False``.
+        :type optimize_dtypes: bool
+
+        :param dtype_sample_size: Number of rows sampled to infer the dtypes. Defaults to
+                                  ``10000``.
+        :type dtype_sample_size: int
+
+        :param csv_engine: Parser of ``.csv`` and ``.tsv`` files, one of ``"c"``, ``"python"``
+                           and ``"pyarrow"``. ``"pyarrow"`` parses on several threads.
+                           Defaults to ``"c"``.
+        :type csv_engine: str
+
+        :param dtype_backend: ``"pyarrow"`` returns Arrow backed columns and
+                              ``"numpy_nullable"`` nullable numpy columns. Defaults to
+                              numpy dtypes.
+        :type dtype_backend: str
+
+        :param delimiter: Delimiter of ``.csv`` files. If not provided, it is sniffed from the
+                          first bytes of the file among ``,``, ``;``, ``\t`` and ``|``.
+        :type delimiter: str
+
+        :param schema_cache: If ``True``, the dtypes of every ``.csv`` and ``.tsv`` input are
+                             saved to a sidecar ``JSON`` file next to it, or in the
+                             directory ``schema_cache``. The sidecar is keyed by the size,
+                             modification time and header of the file and the read
+                             options. The next reads of the unchanged file use the saved
+                             dtypes instead of inferring them, and :class:`Parser` reuses the
+                             categorical and currency columns that it saved to the sidecar
+                             of the train dataset. The path of this sidecar is inserted
+                             into ``params`` as ``schema_sidecar``. Defaults to ``False``.
+        :type schema_cache: bool or str
+
+        :param read_workers: Number of processes that read the shards concurrently. Defaults
+                             to the number of processors, or the number of shards if it is
+                             smaller.
+        :type read_workers: int
+
+        :param train_partition: ``(start, end)`` range of bytes of the train dataset returned
+                                by :meth:`partitions`. Only the rows of the range are read
+                                into ``train_df``, under the header of the file. With
+                                ``optimize_dtypes``, the dtypes are sampled from the first
+                                rows of the file, so that every partition is read with the
+                                same float and category dtypes. The dtypes saved to the
+                                sidecar of ``schema_cache`` are used if the file has one.
+        :type train_partition: tuple
+
+        .. versionchanged:: 1.0.5
+            Added ``read_columns``, ``read_filters``, ``memory_map``, ``optimize_dtypes``,
+            ``dtype_sample_size``, ``read_workers``, ``csv_engine``, ``dtype_backend``,
+            ``delimiter``, ``schema_cache`` and ``train_partition``. ``train_df_path`` and
+            ``test_df_path`` accept glob patterns and lists of paths. The test dataset is
+            read on a separate thread while the train dataset is read, unless
+            ``optimize_dtypes`` infers its dtypes from a Parquet, Feather, Arrow IPC or
+            Excel train dataset that must be read first.
         """
         if "train_df_path" in params.keys():
             self.train_df_path = params["train_df_path"]
         if "test_df_path" in params.keys():
             self.test_df_path = params["test_df_path"]
+        self.columns = params.get("read_columns")
+        self.filters = params.get("read_filters")
+        self.memory_map = params.get("memory_map", False)
+        self.optimize_dtypes = params.get("optimize_dtypes", False)
+        self.sample_size = params.get("dtype_sample_size", 10000)
+        self.read_dtypes = None
+        self.workers = params.get("read_workers")
+        self.engine = params.get("csv_engine", "c")
+        self.dtype_backend = params.get("dtype_backend")
+        self.delimiter = params.get("delimiter")
+        self.schema_cache = params.get("schema_cache", False)
 
-        params["train_df"] = self.__read_file_util(self.train_df_path)
-        if self.test_df_path:
-            params["test_df"] = self.__read_file_util(self.test_df_path)
+        inputs = [("test_df", self.test_df_path)]
+        inputs = [(name, path) for name, path in inputs if path]
+        self.partition = params.get("train_partition")
+        try:
+            train = self.__plan(self.train_df_path)
+            if not inputs or (
+                self.optimize_dtypes and self.read_dtypes is None
+            ):
+                # the dtypes of a typed train file are inferred once it is read and
+                # the other inputs are read with them
+                params["train_df"] = self.__load(*train)
+                sidecar = self.sidecar
+                self.partition = None
+                frames = {name: self.__read(path) for name, path in inputs}
+            else:
+                # every input is read by its own copy of the reader while the train
+                # file is read on the current thread
+                with ThreadPoolExecutor(len(inputs)) as executor:
+                    futures = {}
+                    for name, path in inputs:
+                        reader = copy.copy(self)
+                        reader.partition = None
+                        futures[name] = executor.submit(reader.__read, path)
+                    params["train_df"] = self.__load(*train)
+                    sidecar = self.sidecar
+                    frames = {
+                        name: future.result()
+                        for name, future in futures.items()
+                    }
+        finally:
+            self.partition = None
+        if sidecar is not None:
+            params["schema_sidecar"] = sidecar
+        params.update(frames)
+        if self.optimize_dtypes:
+            align_dtypes([params["train_df"], params.get("test_df")])
+        if self.optimize_dtypes or self.schema_cache:
+            params["schema"] = schema(params["train_df"])
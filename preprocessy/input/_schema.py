@@ -0,0 +1,97 @@
+import hashlib
+import json
+import os
+import uuid
+
+SIDECAR_VERSION = 1
+SIDECAR_SUFFIX = ".schema.json"
+
+
+def sidecar_path(paths, cache):
+    """Returns the path of the schema sidecar of an input. The sidecar of a single file is
+    stored next to it unless ``cache`` is a directory. The sidecar of several shards is
+    named after the hash of their paths.
+
+    :param paths: The files of the input
+    :type paths: list
+
+    :param cache: ``True`` or the directory where the sidecars are stored
+    :type cache: bool or str
+
+    :rtype: str
+    """
+    paths = [os.path.abspath(p) for p in paths]
+    if isinstance(cache, str):
+        name = hashlib.sha256("\n".join(paths).encode()).hexdigest()[:16]
+        return os.path.join(cache, name + SIDECAR_SUFFIX)
+    if len(paths) == 1:
+        return paths[0] + SIDECAR_SUFFIX
+    name = hashlib.sha256("\n".join(paths).encode()).hexdigest()[:16]
+    return os.path.join(os.path.dirname(paths[0]), "." + name + SIDECAR_SUFFIX)
+
+
+def file_key(paths, header_hash, options):
+    """Returns the key that a sidecar must match to be used: the size and modification
+    time of the files, the hash of the header and the read options.
+
+    :rtype: dict
+    """
+    files = []
+    for path in paths:
+        stat = os.stat(path)
+        files.append([os.path.abspath(path), stat.st_size, stat.st_mtime_ns])
+    return {
+        "version": SIDECAR_VERSION,
+        "files": files,
+        "header": header_hash,
+        "options": options,
+    }
+
+
+def read_sidecar(path, key=None):
+    """Returns the content of the sidecar at ``path``, or ``None`` if it does not exist,
+    cannot be read or does not match ``key``.
+
+    :rtype: dict
+    """
+    try:
+        with open(path) as f:
+            sidecar = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(sidecar, dict):
+        return None
+    if key is not None and sidecar.get("key") != json.loads(json.dumps(key)):
+        return None
+    return sidecar
+
+
+def write_sidecar(path, sidecar):
+    """Writes ``sidecar`` to ``path``. The file is replaced atomically so that concurrent
+    readers never see a partial sidecar.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    try:
+        with open(tmp_path, "w") as f:
+            json.dump(sidecar, f, indent=2)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def update_sidecar(path, **fields):
+    """Adds ``fields`` to the sidecar at ``path`` if it exists.
+
+    :return: ``True`` if the sidecar was updated
+    :rtype: bool
+    """
+    sidecar = read_sidecar(path)
+    if sidecar is None:
+        return False
+    sidecar.update(fields)
+    write_sidecar(path, sidecar)
+    return True
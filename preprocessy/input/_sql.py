@@ -0,0 +1,210 @@
+import sqlite3
+
+import pandas as pd
+
+from ..utils import step_io
+from ._dtypes import downcast
+from ._dtypes import infer_read_dtypes
+from ._dtypes import schema
+
+
+def _quote(identifier):
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+class SQLReader(object):
+    """Reader that loads the train and test dataframes from ``SQL`` queries. The rows of a
+    query are fetched in batches of ``fetch_size`` rows with ``fetchmany`` and every batch
+    is converted to one typed array per column, so only one batch of Python rows is held
+    in memory while the query is read.
+
+    ``train_df_path`` and ``test_df_path`` are the databases that the queries are executed
+    on. They are opened with ``connect``, :func:`sqlite3.connect` by default, and closed
+    once the query is read. An open ``connection`` is used as is and is left open.
+
+    ``SQLReader().read_file`` is passed to a pipeline as ``custom_reader``:
+
+    .. code:: python
+
+        pipeline = BasePipeline(
+            train_df_path="data.db",
+            steps=[...],
+            params={"train_query": "SELECT * FROM houses", ...},
+            custom_reader=SQLReader().read_file,
+        )
+
+    :param connect: Function of the ``DB-API`` driver that opens a connection to a
+                    database from ``train_df_path`` or ``test_df_path``
+    :type connect: callable
+
+    :param connection: An open ``DB-API`` connection used instead of ``connect``
+    :type connection: object
+
+    .. versionadded:: 1.0.5
+    """
+
+    def __init__(self, connect=sqlite3.connect, connection=None):
+        self.connect = connect
+        self.connection = connection
+        self.train_df_path = None
+        self.test_df_path = None
+        self.columns = None
+        self.fetch_size = 10000
+
+    def __validate_input(self, params):
+        if self.connection is None and not callable(self.connect):
+            raise TypeError(
+                f"'connect' should be a callable. Received {self.connect} of type {type(self.connect)}"
+            )
+        if self.connection is None and not isinstance(self.train_df_path, str):
+            raise TypeError(
+                f"'train_df_path' should be of type str. Received {self.train_df_path} of type {type(self.train_df_path)}"
+            )
+        for key in ["train_query", "test_query"]:
+            if key in params and not isinstance(params[key], str):
+                raise TypeError(
+                    f"'{key}' should be of type str. Received {params[key]} of type {type(params[key])}"
+                )
+        if "train_query" not in params:
+            raise KeyError("'train_query' should be present in params.")
+        if self.columns is not None and (
+            not isinstance(self.columns, list)
+            or len(self.columns) == 0
+            or not all(isinstance(c, str) for c in self.columns)
+        ):
+            raise TypeError(
+                f"'read_columns' should be a non empty list of str. Received {self.columns} of type {type(self.columns)}"
+            )
+        if (
+            not isinstance(self.fetch_size, int)
+            or isinstance(self.fetch_size, bool)
+            or self.fetch_size <= 0
+        ):
+            raise ValueError(
+                f"'fetch_size' should be a positive integer. Received {self.fetch_size}"
+            )
+
+    def __project(self, query):
+        # the projection is pushed into the query so that the database only returns
+        # the selected columns
+        if self.columns is None:
+            return query
+        columns = ", ".join(_quote(c) for c in self.columns)
+        return (
+            f"SELECT {columns} FROM ({query.strip().rstrip(';')}) AS projection"
+        )
+
+    def __fetch(self, connection, query):
+        cursor = connection.cursor()
+        try:
+            cursor.execute(self.__project(query))
+            names = [d[0] for d in cursor.description]
+            buffers = [[] for _ in names]
+            while True:
+                rows = cursor.fetchmany(self.fetch_size)
+                if not rows:
+                    break
+                # the batch is transposed into one typed array per column and the
+                # rows are released before the next batch is fetched
+                for buffer, values in zip(buffers, zip(*rows)):
+                    buffer.append(pd.Series(values))
+                del rows
+        finally:
+            cursor.close()
+
+        data = {}
+        for name, buffer in zip(names, buffers):
+            if len(buffer) == 0:
+                data[name] = pd.Series([], dtype=object)
+            elif len(buffer) == 1:
+                data[name] = buffer[0]
+            else:
+                column = pd.concat(buffer, ignore_index=True)
+                if column.dtype == object:
+                    # a batch of nulls is an object array, the column takes the
+                    # type of the values of the other batches
+                    column = column.infer_objects()
+                data[name] = column
+            buffer.clear()
+        return pd.DataFrame(data)
+
+    def __read(self, database, query):
+        if self.connection is not None:
+            return self.__fetch(self.connection, query)
+        connection = self.connect(database)
+        try:
+            return self.__fetch(connection, query)
+        finally:
+            connection.close()
+
+    @step_io(
+        reads=[
+            "train_df_path",
+            "test_df_path",
+            "train_query",
+            "test_query",
+            "read_columns",
+            "fetch_size",
+            "optimize_dtypes",
+            "dtype_sample_size",
+        ],
+        writes=["train_df", "test_df", "schema"],
+    )
+    def read_file(self, params):
+        """Function that executes the train and test queries and loads their rows in pandas
+        dataframes.
+
+        :param train_df_path: Database of the train query. Ignored if a ``connection`` is
+                              provided.
+        :type train_df_path: str
+
+        :param test_df_path: Database of the test query. Defaults to ``train_df_path``.
+        :type test_df_path: str
+
+        :param train_query: ``SELECT`` query that returns the rows of the train dataset.
+                            Should not be ``None``.
+        :type train_query: str
+
+        :param test_query: ``SELECT`` query that returns the rows of the test dataset.
+        :type test_query: str
+
+        :param read_columns: Names of the columns to read. The query is wrapped in a
+                             ``SELECT`` of these columns, so that the other columns are
+                             not returned by the database.
+        :type read_columns: list
+
+        :param fetch_size: Number of rows fetched from the cursor at once. Defaults to
+                           ``10000``.
+        :type fetch_size: int
+
+        :param optimize_dtypes: If ``True``, the columns are converted to compact dtypes
+                                like :meth:`Reader.read_file` does and the dtypes are
+                                inserted into ``params`` as ``schema``. Defaults to
+                                ``False``.
+        :type optimize_dtypes: bool
+
+        :param dtype_sample_size: Number of rows sampled to infer the dtypes. Defaults to
+                                  ``10000``.
+        :type dtype_sample_size: int
+        """
+        self.train_df_path = params.get("train_df_path")
+        self.test_df_path = params.get("test_df_path") or self.train_df_path
+        self.columns = params.get("read_columns")
+        self.fetch_size = params.get("fetch_size", 10000)
+        self.__validate_input(params)
+
+        params["train_df"] = self.__read(
+            self.train_df_path, params["train_query"]
+        )
+        if params.get("test_query"):
+            params["test_df"] = self.__read(
+                self.test_df_path, params["test_query"]
+            )
+        if params.get("optimize_dtypes", False):
+            read_dtypes = infer_read_dtypes(
+                params["train_df"].head(params.get("dtype_sample_size", 10000))
+            )
+            for key in ["train_df", "test_df"]:
+                if key in params:
+                    downcast(params[key], read_dtypes)
+            params["schema"] = schema(params["train_df"])
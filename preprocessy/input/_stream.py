@@ -0,0 +1,184 @@
+import bz2
+import gzip
+import io
+import lzma
+import queue
+import threading
+import zipfile
+
+# size of the decompressed blocks and number of blocks decompressed ahead of the parser
+BLOCK_SIZE = 1 << 20
+MAX_BLOCKS = 8
+
+
+def _open_compressed(file_name, compression):
+    if compression == "gz":
+        return gzip.open(file_name, "rb")
+    if compression == "bz2":
+        return bz2.open(file_name, "rb")
+    if compression == "xz":
+        return lzma.open(file_name, "rb")
+    if compression == "zip":
+        archive = zipfile.ZipFile(file_name)
+        names = [n for n in archive.namelist() if not n.endswith("/")]
+        if len(names) != 1:
+            archive.close()
+            raise ValueError(
+                f"Expected a single file in the zip archive {file_name}. Received {names}"
+            )
+        return archive.open(names[0])
+    if compression == "zst":
+        try:
+            import zstandard
+        except ImportError as e:
+            raise ImportError(
+                "Reading .zst files requires zstandard. Install it with"
+                " 'pip install preprocessy[zstd]'"
+            ) from e
+        return zstandard.ZstdDecompressor().stream_reader(
+            open(file_name, "rb"), closefd=True
+        )
+    raise ValueError(f"Unsupported compression .{compression}")
+
+
+class DecompressingStream(io.RawIOBase):
+    """Binary file object with the decompressed content of a compressed file. A
+    background thread decompresses the file in blocks of ``block_size`` bytes while the
+    blocks that were already decompressed are read, so decompression and parsing overlap
+    and nothing is written to disk. At most ``max_blocks`` blocks are held in memory.
+
+    Closing the stream stops the thread, so a stream can be closed before it is read
+    to the end.
+
+    :param file_name: Path of the compressed file
+    :type file_name: str
+
+    :param compression: One of ``"gz"``, ``"bz2"``, ``"xz"``, ``"zip"`` and ``"zst"``
+    :type compression: str
+
+    .. versionadded:: 1.0.5
+    """
+
+    def __init__(
+        self,
+        file_name,
+        compression,
+        block_size=BLOCK_SIZE,
+        max_blocks=MAX_BLOCKS,
+    ):
+        super().__init__()
+        # opened here so that a missing file raises in the calling thread
+        self.__source = _open_compressed(file_name, compression)
+        self.__block_size = block_size
+        self.__blocks = queue.Queue(max_blocks)
+        self.__stop = threading.Event()
+        self.__error = None
+        self.__buffer = memoryview(b"")
+        self.__eof = False
+        self.__thread = threading.Thread(target=self.__decompress, daemon=True)
+        self.__thread.start()
+
+    def __put(self, block):
+        while not self.__stop.is_set():
+            try:
+                self.__blocks.put(block, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def __decompress(self):
+        try:
+            while not self.__stop.is_set():
+                block = self.__source.read(self.__block_size)
+                self.__put(block)
+                if not block:
+                    return
+        except BaseException as e:
+            self.__error = e
+            self.__put(b"")
+        finally:
+            self.__source.close()
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        if len(self.__buffer) == 0:
+            if self.__eof:
+                return 0
+            block = self.__blocks.get()
+            if not block:
+                self.__eof = True
+                if self.__error is not None:
+                    raise self.__error
+                return 0
+            self.__buffer = memoryview(block)
+        n = min(len(b), len(self.__buffer))
+        b[:n] = self.__buffer[:n]
+        self.__buffer = self.__buffer[n:]
+        return n
+
+    def close(self):
+        if not self.closed:
+            self.__stop.set()
+            self.__thread.join()
+        super().close()
+
+
+def open_stream(file_name, compression, buffer_size=BLOCK_SIZE):
+    """Returns a buffered :class:`DecompressingStream` of ``file_name``.
+
+    :rtype: io.BufferedReader
+    """
+    return io.BufferedReader(
+        DecompressingStream(file_name, compression), buffer_size
+    )
+
+
+class RangeStream(io.RawIOBase):
+    """Binary file object with the header line of a file followed by the bytes of the
+    file from ``start`` to ``end``. Used to parse a partition of a file without copying
+    it into memory.
+
+    :param file_name: Path of the file
+    :type file_name: str
+
+    :param header: The header line of the file
+    :type header: bytes
+
+    :param start: Offset of the first byte of the partition
+    :type start: int
+
+    :param end: Offset after the last byte of the partition
+    :type end: int
+
+    .. versionadded:: 1.0.5
+    """
+
+    def __init__(self, file_name, header, start, end):
+        super().__init__()
+        self.__file = open(file_name, "rb")
+        self.__file.seek(start)
+        self.__header = memoryview(header)
+        self.__remaining = end - start
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        if len(self.__header):
+            n = min(len(b), len(self.__header))
+            b[:n] = self.__header[:n]
+            self.__header = self.__header[n:]
+            return n
+        if self.__remaining <= 0:
+            return 0
+        view = memoryview(b)[: min(len(b), self.__remaining)]
+        n = self.__file.readinto(view)
+        self.__remaining -= n
+        return n
+
+    def close(self):
+        if not self.closed:
+            self.__file.close()
+        super().close()
@@ -4,6 +4,14 @@ import numpy as np
 import pandas as pd
 
 from ..exceptions import ArgumentsError
+from ..utils import column_statistics
+from ..utils import KLLSketch
+from ..utils import read_state
+from ..utils import RunningMoments
+from ..utils import save_state
+from ..utils import step_io
+from ..utils._parallel import map_columns
+from ..utils._parallel import resolve_n_jobs
 
 
 class NullValuesHandler:
@@ -15,11 +23,22 @@ class NullValuesHandler:
         self.replace_cat_nulls = None
         self.fill_missing = None
         self.fill_values = None
-        self.new_df = None
+        self.fill_quantile = 0.5
+        self.quantile_error = 0.01
         self.final_train = None
         self.final_test = None
-        self.final_df = None
-        self.dtypeList = [np.int64, np.int32, np.float32, np.float64]
+        self.dtypeList = [
+            np.int64,
+            np.int32,
+            np.int16,
+            np.int8,
+            np.float32,
+            np.float64,
+        ]
+        self.moments = None
+        self.sketches = None
+        self.statistics = None
+        self.column_jobs = 1
 
     def __repr__(self):
         return f"NullValuesHandler(train_df=None, test_df=None, drop_cols={self.drop_cols}, fill_missing={self.fill_missing}, fill_values={self.fill_values})"
@@ -69,73 +88,55 @@ class NullValuesHandler:
                 raise TypeError('Expected dict for argument "fill_missing"')
 
             for key in self.fill_missing.keys():
-                if key not in ["mean", "median"]:
+                if key not in ["mean", "median", "quantile"]:
                     raise ArgumentsError(
-                        f'The only two options allowed are "mean" and "median". Given "{key}"'
+                        f'The only options allowed are "mean", "median" and "quantile". Given "{key}"'
                     )
 
-            if "mean" in self.fill_missing.keys():
-                if type(self.fill_missing["mean"]) is list:
-                    if len(self.fill_missing["mean"]) == 0:
-                        if "median" in self.fill_missing.keys():
-                            raise ArgumentsError(
-                                "Since given empty list for mean which indicates mean applied everywhere, median can not also be given. Remove median or add columns in the mean column list."
-                            )
-                        warnings.warn(
-                            'No columns specified."mean" will be applied on all columns containing null values.',
-                            UserWarning,
-                            stacklevel=2,
-                        )
-                    else:
-                        for c in self.fill_missing["mean"]:
-                            if c not in col_list:
-                                raise ArgumentsError(
-                                    f'Column "{c}" does not exist in dataframe'
-                                )
-                            else:
-                                if (
-                                    self.train_df.dtypes[c]
-                                    not in self.dtypeList
-                                ):
-                                    raise TypeError(
-                                        f'Expected integer or float datatype in columns to be filled with mean or median. Column in error here : "{c}"'
-                                    )
-                else:
+            for key, cols in self.fill_missing.items():
+                others = [k for k in self.fill_missing.keys() if k != key]
+                if type(cols) is not list:
                     raise TypeError(
-                        f'List containing column names to apply mean is required. Given: "{type(self.fill_missing["mean"])}"'
+                        f'List containing column names to apply {key} is required. Given: "{type(cols)}"'
                     )
-            if (
-                "median" in self.fill_missing.keys()
-            ):  # median is the only other option
-                if type(self.fill_missing["median"]) is list:
-                    if len(self.fill_missing["median"]) == 0:
-                        if "mean" in self.fill_missing.keys():
-                            raise ArgumentsError(
-                                "Since given empty list for median which indicates median applied everywhere, mean can not also be given. Remove mean or add columns in the median column list."
-                            )
-                        warnings.warn(
-                            'No columns specified."median" will be applied on all columns containing null values.',
-                            UserWarning,
-                            stacklevel=2,
+                if len(cols) == 0:
+                    if others:
+                        raise ArgumentsError(
+                            f"Since given empty list for {key} which indicates {key} applied everywhere, {others[0]} can not also be given. Remove {others[0]} or add columns in the {key} column list."
                         )
-                    else:
-                        for c in self.fill_missing["median"]:
-                            if c not in col_list:
-                                raise ArgumentsError(
-                                    f'Column "{c}" does not exist in dataframe'
-                                )
-                            else:
-                                if (
-                                    self.train_df.dtypes[c]
-                                    not in self.dtypeList
-                                ):
-                                    raise TypeError(
-                                        f'Expected integer or float datatype in columns to be filled with mean or median. Column in error here : "{c}"'
-                                    )
-                else:
-                    raise TypeError(
-                        f'List containing column names to apply median is required. Given: "{type(self.fill_missing["median"])}"'
+                    warnings.warn(
+                        f'No columns specified."{key}" will be applied on all columns containing null values.',
+                        UserWarning,
+                        stacklevel=2,
                     )
+                for c in cols:
+                    if c not in col_list:
+                        raise ArgumentsError(
+                            f'Column "{c}" does not exist in dataframe'
+                        )
+                    if self.train_df.dtypes[c] not in self.dtypeList:
+                        raise TypeError(
+                            f'Expected integer or float datatype in columns to be filled with mean or median. Column in error here : "{c}"'
+                        )
+
+        if not isinstance(self.fill_quantile, float):
+            raise TypeError(
+                f"'fill_quantile' should be of type float. Received {self.fill_quantile} of"
+                f" type {type(self.fill_quantile)}"
+            )
+        if self.fill_quantile > 1 or self.fill_quantile < 0:
+            raise ValueError(
+                f"Value of fill_quantile must range between 0-1.\n Received value {self.fill_quantile}"
+            )
+        if not isinstance(self.quantile_error, float):
+            raise TypeError(
+                f"'quantile_error' should be of type float. Received {self.quantile_error} of"
+                f" type {type(self.quantile_error)}"
+            )
+        if self.quantile_error >= 1 or self.quantile_error <= 0:
+            raise ValueError(
+                f"Value of quantile_error must range between 0-1(exclusive).\n Received value {self.quantile_error}"
+            )
 
         if self.fill_values is not None:
             if type(self.fill_values) is not dict:
@@ -148,6 +149,8 @@ class NullValuesHandler:
                     raise ArgumentsError(
                         f"Column {column} does not exist in dataframe"
                     )
+        resolve_n_jobs(self.column_jobs, "column_jobs")
+
         if self.cat_cols is not None:
             if type(self.cat_cols) is not list:
                 raise TypeError('Expected list for argument "cat_cols"')
@@ -157,96 +160,371 @@ class NullValuesHandler:
                         f"Column {col} does not exist in dataframe"
                     )
 
-    # function to drop all rows with nan values
-    def __drop_all_rows_with_null_values(self):
-        self.new_train = self.train_df.dropna()
-        if self.test_df is not None:
-            self.new_test = self.test_df.dropna()
-            return self.new_train, self.new_test
-        return self.new_train, None
+    def __fill_mapping(self, state):
+        # the value that fills every column, categorical columns first and the values
+        # given by the user last
+        values = {}
+        if self.cat_cols and self.replace_cat_nulls is not None:
+            for col in self.cat_cols:
+                values.setdefault(col, self.replace_cat_nulls)
+        for method in ["mean", "median", "quantile"]:
+            for col, value in state.get(method, {}).items():
+                values.setdefault(col, value)
+        if self.fill_values is not None:
+            for column, value in self.fill_values.items():
+                values.setdefault(column, value)
+        return values
+
+    def __impute(self, df, values, nulls):
+        # drops the rows with null categorical values and the dropped columns, fills the
+        # null values of all the columns with one fillna and drops the rows that still
+        # have null values in one step. Columns with no null values in nulls are not
+        # filled or checked again.
+        dropped = None
+        if self.cat_cols and self.replace_cat_nulls is None:
+            dropped = df[self.cat_cols].isna().any(axis=1).to_numpy()
+        if self.drop_cols is not None:
+            df = df.drop(self.drop_cols, axis=1)
+
+        values = {col: v for col, v in values.items() if col in df.columns}
+        # categories do not accept values that are not categories yet
+        categories = {
+            col: v
+            for col, v in values.items()
+            if isinstance(df[col].dtype, pd.CategoricalDtype)
+            and v not in df[col].cat.categories
+        }
+        filled = df.fillna(
+            {
+                col: v
+                for col, v in values.items()
+                if col not in categories and nulls.get(col, 1) > 0
+            }
+        )
+        for col, v in categories.items():
+            filled[col] = df[col].cat.add_categories([v]).fillna(v)
+
+        check = [
+            col
+            for col in filled.columns
+            if nulls.get(col, 1) > 0 and pd.isna(values.get(col, np.nan))
+        ]
+        keep = filled[check].notna().all(axis=1).to_numpy()
+        if dropped is not None:
+            keep = keep & ~dropped
+        if keep.all():
+            return filled
+        return filled[keep]
+
+    def __read_params(self, params):
+        if "train_df" in params.keys():
+            self.train_df = params["train_df"]
+        if "test_df" in params.keys():
+            self.test_df = params["test_df"]
+        if "cat_cols" in params.keys():
+            self.cat_cols = params["cat_cols"]
+        if "replace_cat_nulls" in params.keys():
+            self.replace_cat_nulls = params["replace_cat_nulls"]
+        if "drop_cols" in params.keys():
+            self.drop_cols = params["drop_cols"]
+        if "fill_missing" in params.keys():
+            self.fill_missing = params["fill_missing"]
+        if "fill_values" in params.keys():
+            self.fill_values = params["fill_values"]
+        if "fill_quantile" in params.keys():
+            self.fill_quantile = params["fill_quantile"]
+        if "quantile_error" in params.keys():
+            self.quantile_error = params["quantile_error"]
+        self.column_jobs = params.get("column_jobs", 1)
+
+    def __fit_cols(self, col_list):
+        # the columns of train_df that the fill statistics are learned from
+        if len(col_list) == 0:
+            col_list = [
+                col
+                for col in self.train_df.columns
+                if self.drop_cols is None or col not in self.drop_cols
+            ]
+        return [
+            col
+            for col in col_list
+            if self.train_df.dtypes[col] in self.dtypeList
+            and self.__filled_dtype(col) in self.dtypeList
+        ]
+
+    def __filled_dtype(self, col):
+        # dtype of a column once its categorical null values are replaced, a value that is
+        # not a number makes the column an object column
+        column = self.train_df[col]
+        if (
+            self.cat_cols
+            and col in self.cat_cols
+            and self.replace_cat_nulls is not None
+            and column.hasnans
+        ):
+            return column.fillna(self.replace_cat_nulls).dtype
+        return column.dtype
+
+    def __fit_frame(self, col_list):
+        # the rows and columns of train_df that the fill statistics are learned from
+        cols = self.__fit_cols(col_list)
+        df = self.train_df
+        if self.cat_cols and self.replace_cat_nulls is None:
+            df = df[df[self.cat_cols].notna().all(axis=1)]
+        df = df[cols]
+        if self.cat_cols and self.replace_cat_nulls is not None:
+            df = df.fillna(
+                {
+                    col: self.replace_cat_nulls
+                    for col in self.cat_cols
+                    if col in cols
+                }
+            )
+        return df
+
+    def __reduce(self, block, methods):
+        # one row of fill statistics for every column of a block
+        return pd.DataFrame(
+            {
+                method: block.quantile(self.fill_quantile)
+                if method == "quantile"
+                else getattr(block, method)()
+                for method in methods
+            }
+        )
+
+    def __fit_statistics(self, statistics):
+        # the means and quantiles of the catalog, unless rows with null categorical values
+        # are dropped or filled before the statistics are learned. All the statistics are
+        # then computed in one reduction of the rows of train_df.
+        methods = {
+            method: self.__fit_cols(col_list)
+            for method, col_list in self.fill_missing.items()
+        }
+        cols = list(dict.fromkeys(c for cs in methods.values() for c in cs))
+        cat_cols = list(self.cat_cols or [])
+        statistics.add(self.train_df, cols + cat_cols, n_jobs=self.column_jobs)
+        if any(
+            statistics.nulls[col] > 0
+            and (self.replace_cat_nulls is None or col in cols)
+            for col in cat_cols
+        ):
+            reduced = map_columns(
+                lambda block: self.__reduce(block, methods),
+                self.__fit_frame(cols),
+                n_jobs=self.column_jobs,
+            )
+            return {
+                method: {col: reduced.at[col, method] for col in method_cols}
+                for method, method_cols in methods.items()
+            }
+        quantiles = {"median": 0.5, "quantile": self.fill_quantile}
+        return {
+            method: {
+                col: float(statistics.moments.mean[col])
+                if method == "mean"
+                else statistics.quantile(col, quantiles[method])
+                for col in method_cols
+            }
+            for method, method_cols in methods.items()
+        }
+
+    def reset(self):
+        """Discards the statistics learned by :meth:`fit` and :meth:`partial_fit`.
+
+        .. versionadded:: 1.0.5
+        """
+        self.moments = RunningMoments()
+        self.sketches = {}
+        self.statistics = None
+
+    def fit(self, params):
+        """Learns the means, medians and quantiles required by ``fill_missing`` from the
+        train dataframe. The learned values are used by :meth:`transform` to fill the null
+        values of both the train and test dataframes. The statistics are read from the
+        :class:`preprocessy.utils.ColumnStatistics` of ``params``. Takes the same parameters
+        as :meth:`execute`.
+
+        .. versionadded:: 1.0.5
+        """
+        self.__read_params(params)
+        self.__validate_input()
+        self.reset()
+        self.statistics = {"mean": {}, "median": {}, "quantile": {}}
+        if self.fill_missing is None:
+            return
+        self.statistics.update(self.__fit_statistics(column_statistics(params)))
+
+    def partial_fit(self, params):
+        """Learns the means, medians and quantiles required by ``fill_missing`` from a chunk
+        of the train dataframe. The statistics of all the chunks are accumulated until
+        :meth:`reset` is called and are used by :meth:`transform`. Medians and quantiles are
+        estimated from a :class:`preprocessy.utils.KLLSketch` of every column, whose memory
+        does not grow with the number of rows. Takes the same parameters as :meth:`execute`.
+
+        .. versionadded:: 1.0.5
+        """
+        self.__read_params(params)
+        self.__validate_input()
+        if self.moments is None:
+            self.reset()
+        self.statistics = None
+        if self.fill_missing is None:
+            return
+        if "mean" in self.fill_missing.keys():
+            self.moments.update(self.__fit_frame(self.fill_missing["mean"]))
+        cols = [
+            col
+            for method in ["median", "quantile"]
+            if method in self.fill_missing.keys()
+            for col in self.__fit_cols(self.fill_missing[method])
+        ]
+        if len(cols) == 0:
+            return
+        df = self.__fit_frame(list(dict.fromkeys(cols)))
+        for col in df.columns:
+            if col not in self.sketches:
+                self.sketches[col] = KLLSketch(self.quantile_error)
+            self.sketches[col].update(df[col])
+
+    def merge(self, other):
+        """Adds the statistics learned by another :class:`NullValuesHandler` with
+        :meth:`partial_fit`, for example from another partition of the train dataframe. The
+        means are combined exactly and the quantile sketches are merged.
+
+        :param other: The handler whose statistics are added
+        :type other: NullValuesHandler
+
+        .. versionadded:: 1.0.5
+        """
+        if other.moments is None:
+            return
+        if self.moments is None:
+            self.reset()
+        self.statistics = None
+        self.moments.merge(other.moments)
+        for col, sketch in other.sketches.items():
+            if col not in self.sketches:
+                self.sketches[col] = KLLSketch(sketch.error)
+            self.sketches[col].merge(sketch)
+
+    def get_state(self):
+        """Returns the means, medians and quantiles learned by :meth:`fit` or
+        :meth:`partial_fit`.
+
+        :rtype: dict
+
+        .. versionadded:: 1.0.5
+        """
+        if self.statistics is None:
+            if self.moments is None:
+                raise ValueError(
+                    "NullValuesHandler is not fitted. Please fit the handler"
+                    " before calling transform."
+                )
+            methods = self.fill_missing or {}
+            self.statistics = {"mean": self.moments.mean.to_dict()}
+            for method, q in [
+                ("median", 0.5),
+                ("quantile", self.fill_quantile),
+            ]:
+                cols = (
+                    self.__fit_cols(methods[method])
+                    if method in methods
+                    else []
+                )
+                self.statistics[method] = {
+                    col: self.sketches[col].quantile(q)
+                    for col in cols
+                    if col in self.sketches
+                }
+        return self.statistics
 
-    # function to drop a particular column
-    def __drop_column_with_null_values(self):
-        self.new_train = self.train_df.drop(self.drop_cols, axis=1)
-        if self.test_df is not None:
-            self.new_test = self.test_df.drop(self.drop_cols, axis=1)
-            return self.new_train, self.new_test
-        return self.new_train, None
+    def set_state(self, state):
+        """Restores the state returned by :meth:`get_state`.
 
-    # function to fill the missing values with mean or median as per the arguments passed
+        :param state: The means, medians and quantiles of the columns
+        :type state: dict
 
-    def __fill_missing_with_mean(self, col_list):
-        self.new_train = self.train_df
-        self.new_test = self.test_df
-        if len(col_list) == 0:
-            col_list = self.train_df.columns
-        for col in col_list:
-            if self.new_train.dtypes[col] in self.dtypeList:
-                self.new_train[col].fillna(
-                    self.new_train[col].mean(), inplace=True
-                )
-        if self.test_df is not None:
-            for col in col_list:
-                if self.new_test.dtypes[col] in self.dtypeList:
-                    self.new_test[col].fillna(
-                        self.new_test[col].mean(), inplace=True
-                    )
-        return self.new_train, self.new_test
+        .. versionadded:: 1.0.5
+        """
+        self.reset()
+        self.statistics = {
+            "mean": dict(state["mean"]),
+            "median": dict(state["median"]),
+            "quantile": dict(state.get("quantile", {})),
+        }
 
-    def __fill_missing_with_median(self, col_list):
-        self.new_train = self.train_df
-        self.new_test = self.test_df
-        if len(col_list) == 0:
-            col_list = self.train_df.columns
-        for col in col_list:
-            if self.new_train.dtypes[col] in self.dtypeList:
-                self.new_train[col].fillna(
-                    self.new_train[col].median(), inplace=True
-                )
+    def save_state(self, file_path):
+        """Saves the state returned by :meth:`get_state` to a ``JSON`` file.
+
+        :param file_path: Path where the state file must be created
+        :type file_path: str
+
+        .. versionadded:: 1.0.5
+        """
+        save_state(file_path, self.get_state())
+
+    def load_state(self, file_path):
+        """Restores the state saved by :meth:`save_state`.
+
+        :param file_path: Path to the state file
+        :type file_path: str
+
+        .. versionadded:: 1.0.5
+        """
+        self.set_state(read_state(file_path))
+
+    def transform(self, params):
+        """Handles the null values of the train and test dataframes using the statistics
+        learned by :meth:`fit`. Takes the same parameters as :meth:`execute`.
+
+        .. versionadded:: 1.0.5
+        """
+        self.__read_params(params)
+        self.__validate_input()
+        state = self.get_state()
+        source = self.train_df
+
+        values = self.__fill_mapping(state)
+        statistics = params.get("column_statistics")
+        self.final_train = self.__impute(
+            self.train_df,
+            values,
+            statistics.null_counts(source) if statistics is not None else {},
+        )
+        self.final_test = None
         if self.test_df is not None:
-            for col in col_list:
-                if self.new_test.dtypes[col] in self.dtypeList:
-                    self.new_test[col].fillna(
-                        self.new_test[col].median(), inplace=True
-                    )
-        return self.new_train, self.new_test
-
-    # function to fill columns containing null values with the character supplied by the user
-    def __fill_values_columns(self):
-        self.new_train = self.train_df
-        for column in list(self.fill_values.keys()):
-            self.new_train[column].fillna(
-                self.fill_values[column], inplace=True
+            self.final_test = self.__impute(self.test_df, values, {})
+
+        if statistics is not None:
+            # only the columns without null values are unchanged
+            statistics.refresh(
+                source,
+                self.final_train,
+                [col for col, nulls in statistics.nulls.items() if nulls == 0],
             )
-        if self.test_df is not None:
-            for column in list(self.fill_values.keys()):
-                self.new_test[column].fillna(
-                    self.fill_values[column], inplace=True
-                )
-                return self.new_train, self.new_test
-        return self.new_train, None
-
-    # function to remove or fill null values in categorical columns
-    def __categoricalnull(self):
-        self.new_train = self.train_df
-        for col in self.cat_cols:
-            if self.replace_cat_nulls is not None:
-                self.new_train[col].fillna(self.replace_cat_nulls, inplace=True)
-            else:
-                self.new_train.dropna(axis=0, subset=[col], inplace=True)
-        if self.test_df is not None:
-            self.new_test = self.test_df
-            for col in self.cat_cols:
-                if self.replace_cat_nulls is not None:
-                    self.new_test[col].fillna(
-                        self.replace_cat_nulls, inplace=True
-                    )
-                else:
-                    self.new_test.dropna(axis=0, subset=[col], inplace=True)
-            self.test_df = self.new_test
-        self.train_df = self.new_train
+
+        params["train_df"] = self.final_train
+        params["test_df"] = self.final_test
 
     # main function
+    @step_io(
+        reads=[
+            "train_df",
+            "test_df",
+            "cat_cols",
+            "replace_cat_nulls",
+            "drop_cols",
+            "fill_missing",
+            "fill_values",
+            "fill_quantile",
+            "quantile_error",
+            "column_jobs",
+            "column_statistics",
+        ],
+        writes=["train_df", "test_df", "column_statistics"],
+    )
     def execute(self, params):
         """Function that handles null values in the supplied dataframe and returns a new dataframe. If no user parameters are supplied, the rows containing null values are dropped by default.
 
@@ -266,55 +544,29 @@ class NullValuesHandler:
         :param drop_cols: List of column names of columns to be dropped
         :type drop_cols: list
 
-        :param fill_missing: Dictionary of format {"method": [col_list]} to indicate the method (``mean``/``median``) to be applied on specified col_list
+        :param fill_missing: Dictionary of format {"method": [col_list]} to indicate the method (``mean``/``median``/``quantile``) to be applied on specified col_list
         :type fill_missing: dict
 
-        :param fill_values: Column and value mapping, where the key is the column name and value is the custom value to be filled in place of null values
-        :type fill_values: dict
+        :param fill_quantile: The quantile that the ``quantile`` method fills the null values
+                              with. Defaults to ``0.5``.
+        :type fill_quantile: float
 
-        """
+        :param quantile_error: Relative error on the rank of the medians and quantiles
+                               estimated by :meth:`partial_fit`. Defaults to ``0.01``.
+        :type quantile_error: float
 
-        if "train_df" in params.keys():
-            self.train_df = params["train_df"]
-        if "test_df" in params.keys():
-            self.test_df = params["test_df"]
-        if "cat_cols" in params.keys():
-            self.cat_cols = params["cat_cols"]
-        if "replace_cat_nulls" in params.keys():
-            self.replace_cat_nulls = params["replace_cat_nulls"]
-        if "drop_cols" in params.keys():
-            self.drop_cols = params["drop_cols"]
-        if "fill_missing" in params.keys():
-            self.fill_missing = params["fill_missing"]
-        if "fill_values" in params.keys():
-            self.fill_values = params["fill_values"]
-
-        self.__validate_input()
-
-        self.__categoricalnull()
-        if self.drop_cols is not None:
-            (
-                self.train_df,
-                self.test_df,
-            ) = self.__drop_column_with_null_values()
-
-        if self.fill_missing is not None:
-            if "mean" in self.fill_missing.keys():
-                self.train_df, self.test_df = self.__fill_missing_with_mean(
-                    self.fill_missing["mean"]
-                )
-            if "median" in self.fill_missing.keys():
-                self.train_df, self.test_df = self.__fill_missing_with_median(
-                    self.fill_missing["median"]
-                )
+        :param fill_values: Column and value mapping, where the key is the column name and value is the custom value to be filled in place of null values
+        :type fill_values: dict
 
-        if self.fill_values is not None:
-            self.train_df, self.test_df = self.__fill_values_columns()
+        :param column_jobs: Number of threads that blocks of columns are processed on, ``-1``
+                       uses all the processors. Defaults to ``1``.
+        :type column_jobs: int
 
-        (
-            self.final_train,
-            self.final_test,
-        ) = self.__drop_all_rows_with_null_values()
+        .. versionchanged:: 1.0.5
+            Does :meth:`fit` and :meth:`transform` in a single step. The null values of
+            ``test_df`` are filled with the means and medians of ``train_df``. Added ``column_jobs``,
+            the ``quantile`` method, ``fill_quantile`` and ``quantile_error``.
+        """
 
-        params["train_df"] = self.final_train
-        params["test_df"] = self.final_test
+        self.fit(params)
+        self.transform(params)
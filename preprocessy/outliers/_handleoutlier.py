@@ -1,8 +1,16 @@
 import warnings
 
+import numpy as np
 import pandas as pd
 
 from ..exceptions import ArgumentsError
+from ..utils import column_statistics
+from ..utils import read_state
+from ..utils import ReservoirSample
+from ..utils import save_state
+from ..utils import step_io
+from ..utils._parallel import map_columns
+from ..utils._parallel import resolve_n_jobs
 
 
 class HandleOutlier:
@@ -40,9 +48,12 @@ class HandleOutlier:
         self.target_label = []
         self.remove_outliers = True
         self.replace = False
-        self.quartiles = {}
+        self.quartiles = None
         self.first_quartile = 0.05
         self.third_quartile = 0.95
+        self.sample = None
+        self.fitted_cols = None
+        self.column_jobs = 1
 
     def __validate_input(self):
         if self.train_df is None:
@@ -143,17 +154,34 @@ class HandleOutlier:
                 "Value of first quartile should not be greater than value of third quartile"
             )
 
+        resolve_n_jobs(self.column_jobs, "column_jobs")
+
     def __repr__(self):
         return f"HandleOutlier(remove_outliers={self.remove_outliers}, replace={self.replace}, first_quartile={self.first_quartile}, third_quartile={self.third_quartile})"
 
-    def __return_quartiles(self, col):
+    def __return_quartiles(self, col, statistics):
         # return the quartile range or q1 and q3 values for the column passed as parameter
-        q1 = self.train_df[col].quantile(self.first_quartile)
-        q1 = round(q1)
-        q3 = self.train_df[col].quantile(self.third_quartile)
-        q3 = round(q3)
+        q1 = round(statistics.quantile(col, self.first_quartile))
+        q3 = round(statistics.quantile(col, self.third_quartile))
         self.quartiles[col] = [q1, q3]
 
+    @step_io(
+        reads=[
+            "train_df",
+            "test_df",
+            "target_label",
+            "cat_cols",
+            "ord_cols",
+            "out_cols",
+            "remove_outliers",
+            "replace",
+            "first_quartile",
+            "third_quartile",
+            "column_jobs",
+            "column_statistics",
+        ],
+        writes=["train_df", "test_df", "column_statistics"],
+    )
     def handle_outliers(self, params):
         """This function is used to handle outliers is flexible in how to calculate the percentiles and what to do
         about the outliers.
@@ -188,12 +216,25 @@ class HandleOutlier:
         :param third_quartile: Float value <1 representing the other percentile marker.
         :type third_quartile: float
 
+        :param column_jobs: Number of threads that blocks of columns are processed on, ``-1``
+                       uses all the processors. Defaults to ``1``.
+        :type column_jobs: int
+
+        .. versionchanged:: 1.0.5
+            Does :meth:`fit` and :meth:`transform` in a single step. Added ``column_jobs``.
         """
+        self.fit(params)
+        self.transform(params)
+
+    def __read_params(self, params):
         if "train_df" in params.keys():
             self.train_df = params["train_df"]
         if "test_df" in params.keys():
             self.test_df = params["test_df"]
-        if "target_label" in params.keys():
+        if (
+            "target_label" in params.keys()
+            and params["target_label"] not in self.target_label
+        ):
             self.target_label.append(params["target_label"])
         if "cat_cols" in params.keys():
             self.cat_cols = params["cat_cols"]
@@ -207,9 +248,9 @@ class HandleOutlier:
             self.first_quartile = params["first_quartile"]
         if "third_quartile" in params.keys():
             self.third_quartile = params["third_quartile"]
+        self.column_jobs = params.get("column_jobs", 1)
 
-        self.__validate_input()
-
+    def __select_cols(self, params):
         if "out_cols" in params.keys():
             self.cols = params["out_cols"]
             self.cols = [
@@ -229,32 +270,192 @@ class HandleOutlier:
                 ):
                     self.cols.append(col)
 
+    def __markers(self, block):
+        q1 = np.array([self.quartiles[col][0] for col in block.columns])
+        q3 = np.array([self.quartiles[col][1] for col in block.columns])
+        return block.to_numpy(dtype="float64"), q1, q3
+
+    def __kept(self, block):
+        # rows of a block of columns whose values are all between the markers
+        values, q1, q3 = self.__markers(block)
+        kept = ((values > q1) & (values <= q3)).all(axis=1)
+        return pd.Series(kept, index=block.index)
+
+    def __outliers(self, block, inclusive):
+        # mask of the outliers of a block of columns
+        values, q1, q3 = self.__markers(block)
+        if inclusive:
+            outliers = (values <= q1) | (values >= q3)
+        else:
+            outliers = (values < q1) | (values > q3)
+        return pd.DataFrame(outliers, index=block.index, columns=block.columns)
+
+    def __apply_quartiles(self):
+        # the columns are split into blocks that are compared with their markers on
+        # column_jobs threads
+
         # if user has marked removeoutliers = True and wants outliers removed..
         if self.remove_outliers:
-            if len(self.cols) >= 1:
-                for col in self.cols:
-                    self.__return_quartiles(col)
-                for col in self.cols:
-                    q1, q3 = self.quartiles[col]
-                    self.train_df = self.train_df[(self.train_df[col] > q1)]
-                    self.train_df = self.train_df[(self.train_df[col] <= q3)]
-                    if self.test_df is not None:
-                        self.test_df = self.test_df[(self.test_df[col] > q1)]
-                        self.test_df = self.test_df[(self.test_df[col] <= q3)]
+            for df_name in ["train_df", "test_df"]:
+                df = getattr(self, df_name)
+                if df is None:
+                    continue
+                kept = map_columns(
+                    self.__kept, df, self.cols, self.column_jobs, axis=1
+                )
+                if isinstance(kept, pd.DataFrame):
+                    kept = kept.all(axis=1)
+                setattr(self, df_name, df[kept.to_numpy()])
 
         # if removeoutliers = False and replace=True i.e. user wants outliers
         # replaced by a value to indicate these are outliers
         elif self.replace:
-            if len(self.cols) >= 1:
-                for col in self.cols:
-                    self.__return_quartiles(col)
-                for col in self.cols:
-                    q1, q3 = self.quartiles[col]
-                    self.train_df[col][(self.train_df[col] < q1)] = -999
-                    self.train_df[col][(self.train_df[col] > q3)] = -999
-                    if self.test_df is not None:
-                        self.test_df[col][(self.test_df[col] <= q1)] = -999
-                        self.test_df[col][(self.test_df[col] >= q3)] = -999
+            for df, inclusive in [(self.train_df, False), (self.test_df, True)]:
+                if df is None:
+                    continue
+                outliers = map_columns(
+                    lambda block: self.__outliers(block, inclusive),
+                    df,
+                    self.cols,
+                    self.column_jobs,
+                    axis=1,
+                )
+                for col in outliers.columns[outliers.any(axis=0).to_numpy()]:
+                    df.loc[outliers[col].to_numpy(), col] = -999
+
+    def reset(self):
+        """Discards the percentiles learned by :meth:`fit` and :meth:`partial_fit`.
+
+        .. versionadded:: 1.0.5
+        """
+        self.sample = ReservoirSample()
+        self.fitted_cols = None
+        self.quartiles = None
+
+    def fit(self, params):
+        """Selects the outlier columns and learns their percentile markers from the train
+        dataframe. The learned markers are used by :meth:`transform` for both the train
+        and test dataframes. The percentiles of numeric columns are read from the
+        :class:`preprocessy.utils.ColumnStatistics` of ``params``. Takes the same
+        parameters as :meth:`handle_outliers`.
+
+        .. versionadded:: 1.0.5
+        """
+        self.__read_params(params)
+        self.__validate_input()
+        self.reset()
+        self.__select_cols(params)
+        self.fitted_cols = self.cols
+        self.quartiles = {}
+        statistics = column_statistics(params).add(
+            self.train_df, self.cols, n_jobs=self.column_jobs
+        )
+        for col in self.cols:
+            self.__return_quartiles(col, statistics)
+
+    def partial_fit(self, params):
+        """Collects a uniform sample of the outlier columns from a chunk of the train
+        dataframe. The percentiles used by :meth:`transform` are estimated from the
+        sample of all the chunks seen until :meth:`reset` is called. Takes the same
+        parameters as :meth:`handle_outliers`.
+
+        .. versionadded:: 1.0.5
+        """
+        self.__read_params(params)
+        self.__validate_input()
+        if self.sample is None:
+            self.reset()
+        self.quartiles = None
+        if self.train_df.shape[0] == 0:
+            return
+        if self.fitted_cols is None:
+            self.__select_cols(params)
+            self.fitted_cols = self.cols
+        self.sample.update(self.train_df[self.fitted_cols])
+
+    def get_state(self):
+        """Returns the outlier columns and their percentile markers learned by :meth:`fit`
+        or :meth:`partial_fit`.
+
+        :rtype: dict
+
+        .. versionadded:: 1.0.5
+        """
+        if self.quartiles is None:
+            if self.sample is None:
+                raise ValueError(
+                    "HandleOutlier is not fitted. Please fit it before calling"
+                    " transform."
+                )
+            self.quartiles = {
+                col: [
+                    round(self.sample.quantile(col, self.first_quartile)),
+                    round(self.sample.quantile(col, self.third_quartile)),
+                ]
+                for col in self.fitted_cols or []
+            }
+        return {
+            "cols": list(self.fitted_cols or []),
+            "quartiles": self.quartiles,
+        }
+
+    def set_state(self, state):
+        """Restores the state returned by :meth:`get_state`.
+
+        :param state: The outlier columns and their percentile markers
+        :type state: dict
+
+        .. versionadded:: 1.0.5
+        """
+        self.reset()
+        self.fitted_cols = list(state["cols"])
+        self.quartiles = {col: list(q) for col, q in state["quartiles"].items()}
+
+    def save_state(self, file_path):
+        """Saves the state returned by :meth:`get_state` to a ``JSON`` file.
+
+        :param file_path: Path where the state file must be created
+        :type file_path: str
+
+        .. versionadded:: 1.0.5
+        """
+        save_state(file_path, self.get_state())
+
+    def load_state(self, file_path):
+        """Restores the state saved by :meth:`save_state`.
+
+        :param file_path: Path to the state file
+        :type file_path: str
+
+        .. versionadded:: 1.0.5
+        """
+        self.set_state(read_state(file_path))
+
+    def transform(self, params):
+        """Removes or replaces the outliers of the train and test dataframes using the
+        percentile markers learned by :meth:`fit`. Takes the same parameters as
+        :meth:`handle_outliers`.
+
+        .. versionadded:: 1.0.5
+        """
+        self.__read_params(params)
+        self.__validate_input()
+        self.cols = self.get_state()["cols"]
+        source = self.train_df
+        self.__apply_quartiles()
+
+        statistics = params.get("column_statistics")
+        if statistics is not None:
+            # removing outliers keeps the values of the rows, replacing them does not
+            statistics.refresh(
+                source,
+                self.train_df,
+                [
+                    col
+                    for col in source.columns
+                    if self.remove_outliers or col not in self.cols
+                ],
+            )
 
         params["train_df"] = self.train_df
         params["test_df"] = self.test_df
@@ -0,0 +1,3 @@
+from ._write import Writer
+
+__all__ = ["Writer"]
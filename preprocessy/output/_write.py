@@ -0,0 +1,185 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_bool_dtype
+from pandas.api.types import is_numeric_dtype
+
+from ..utils import step_io
+
+OUTPUT_FORMATS = {"parquet": "parquet", "arrow": "arrow", "npy": "npy"}
+OUTPUT_KEYS = ["X_train", "X_test", "y_train", "y_test"]
+MANIFEST = "manifest.json"
+
+
+class Writer(object):
+    """Class that writes the outputs of :meth:`Split.train_test_split` to files that can be
+    read without ``pandas``. ``X_train``, ``X_test``, ``y_train`` and ``y_test`` are
+    written to Parquet, Arrow IPC or ``.npy`` files, optionally split into shards of
+    ``shard_rows`` rows.
+
+    Arrow IPC files are written uncompressed and ``.npy`` files hold a single array, so both
+    can be memory mapped with ``pyarrow.memory_map`` and ``numpy.load(mmap_mode="r")``.
+    Parquet files are compressed and smaller. Parquet and Arrow IPC require the ``arrow``
+    extra.
+
+    A ``manifest.json`` file in ``output_dir`` lists the files, columns, dtypes and number
+    of rows of every output.
+
+    .. versionadded:: 1.0.5
+    """
+
+    def __init__(self):
+        self.output_dir = None
+        self.output_format = "parquet"
+        self.shard_rows = None
+
+    def __validate_input(self):
+        if not isinstance(self.output_dir, str):
+            raise TypeError(
+                f"'output_dir' should be of type str. Received {self.output_dir} of type {type(self.output_dir)}"
+            )
+        if self.output_format not in OUTPUT_FORMATS:
+            raise ValueError(
+                f"'output_format' should be one of {list(OUTPUT_FORMATS)}. Received {self.output_format}"
+            )
+        if self.shard_rows is not None and (
+            not isinstance(self.shard_rows, int)
+            or isinstance(self.shard_rows, bool)
+            or self.shard_rows <= 0
+        ):
+            raise ValueError(
+                f"'shard_rows' should be a positive integer. Received {self.shard_rows}"
+            )
+
+    def __shards(self, data):
+        rows = data.shape[0]
+        if self.shard_rows is None or rows <= self.shard_rows:
+            return [data]
+        return [
+            data.iloc[start : start + self.shard_rows]
+            for start in range(0, rows, self.shard_rows)
+        ]
+
+    def __to_array(self, key, data):
+        frame = data.to_frame() if isinstance(data, pd.Series) else data
+        invalid = [
+            str(col)
+            for col, dtype in frame.dtypes.items()
+            if not is_numeric_dtype(dtype) and not is_bool_dtype(dtype)
+        ]
+        if invalid:
+            raise ValueError(
+                f"'{key}' can only be written to .npy files if all its columns are numeric. Received non numeric columns {invalid}"
+            )
+        return data.to_numpy()
+
+    def __write(self, key, data, file_path):
+        if self.output_format == "npy":
+            np.save(file_path, self.__to_array(key, data))
+            return
+
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError(
+                "Writing Parquet and Arrow IPC files requires pyarrow. Install it with"
+                " 'pip install preprocessy[arrow]'"
+            ) from e
+
+        frame = data.to_frame() if isinstance(data, pd.Series) else data
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        if self.output_format == "parquet":
+            pq.write_table(table, file_path)
+        else:
+            with pa.OSFile(file_path, "wb") as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+
+    @step_io(
+        reads=[
+            "X_train",
+            "X_test",
+            "y_train",
+            "y_test",
+            "output_dir",
+            "output_format",
+            "shard_rows",
+        ],
+        writes=["output_files"],
+    )
+    def write_file(self, params):
+        """Writes the split dataframes and target labels of ``params`` to ``output_dir``.
+        Every output is written to ``<output_dir>/<key>.<format>``, or to
+        ``<output_dir>/<key>-00000.<format>``, ``<output_dir>/<key>-00001.<format>`` ... if it
+        is split into shards. The outputs that are not present in ``params`` are skipped.
+
+        :param X_train: Features of the train set
+        :type X_train: pandas.core.frames.DataFrame
+
+        :param X_test: Features of the test set
+        :type X_test: pandas.core.frames.DataFrame
+
+        :param y_train: Target label of the train set
+        :type y_train: pandas.core.series.Series
+
+        :param y_test: Target label of the test set
+        :type y_test: pandas.core.series.Series
+
+        :param output_dir: Directory of the files. It is created if it does not exist.
+                           Should not be ``None``
+        :type output_dir: str
+
+        :param output_format: One of ``"parquet"``, ``"arrow"`` and ``"npy"``. ``.npy``
+                              files require numeric columns. Defaults to ``"parquet"``.
+        :type output_format: str
+
+        :param shard_rows: Maximum number of rows of a file. Defaults to a single file for
+                           every output.
+        :type shard_rows: int
+
+        The function inserts the paths of the written files into ``params`` as
+        ``output_files``, a ``dict`` that maps every written output to the list of its
+        files.
+        """
+        self.output_dir = params.get("output_dir")
+        self.output_format = params.get("output_format", "parquet")
+        self.shard_rows = params.get("shard_rows")
+        self.__validate_input()
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        extension = OUTPUT_FORMATS[self.output_format]
+        files = {}
+        manifest = {"format": self.output_format, "outputs": {}}
+        for key in OUTPUT_KEYS:
+            data = params.get(key)
+            if data is None:
+                continue
+            if not isinstance(data, (pd.DataFrame, pd.Series)):
+                raise TypeError(
+                    f"'{key}' should be a pandas DataFrame or Series. Received {data} of type {type(data)}"
+                )
+            shards = self.__shards(data)
+            if len(shards) == 1:
+                names = [f"{key}.{extension}"]
+            else:
+                names = [
+                    f"{key}-{i:05d}.{extension}" for i in range(len(shards))
+                ]
+            for shard, name in zip(shards, names):
+                self.__write(key, shard, os.path.join(self.output_dir, name))
+
+            frame = data.to_frame() if isinstance(data, pd.Series) else data
+            files[key] = [os.path.join(self.output_dir, name) for name in names]
+            manifest["outputs"][key] = {
+                "files": names,
+                "rows": [shard.shape[0] for shard in shards],
+                "columns": [str(col) for col in frame.columns],
+                "dtypes": [str(dtype) for dtype in frame.dtypes],
+            }
+
+        with open(os.path.join(self.output_dir, MANIFEST), "w") as f:
+            json.dump(manifest, f, indent=2)
+        params["output_files"] = files
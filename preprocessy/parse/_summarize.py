@@ -1,8 +1,28 @@
 import warnings
 
+import pandas as pd
+from pandas.api.types import is_datetime64_any_dtype
 from pandas.api.types import is_numeric_dtype
 from pandas.api.types import is_string_dtype
 
+from ..input._schema import read_sidecar
+from ..input._schema import update_sidecar
+from ..utils import column_statistics
+from ..utils import detect_date_format
+from ..utils import detect_number_format
+from ..utils import expand_dates
+from ..utils import HyperLogLog
+from ..utils import parse_numbers
+from ..utils import read_state
+from ..utils import save_state
+from ..utils import step_io
+from ..utils._parallel import map_columns
+from ..utils._parallel import resolve_n_jobs
+from ..utils._numeric import DEFAULT_NUMBER_FORMAT
+
+# distinct values kept per column by partial_fit before it switches to a HyperLogLog
+EXACT_DISTINCT_VALUES = 1 << 16
+
 
 class Parser:
     def __init__(self):
@@ -12,6 +32,16 @@ class Parser:
         self.cat_cols = None
         self.ord_cols = []
         self.ord_dict = None
+        self.rows_seen = None
+        self.number_formats = None
+        self.distinct_values = None
+        self.currency_cols = None
+        self.learned_cat_cols = None
+        self.approximate = False
+        self.distinct_counts = None
+        self.parse_dates = True
+        self.date_formats = None
+        self.column_jobs = 1
 
     def __validate_input(self):
         if self.train_df is None:
@@ -51,34 +81,19 @@ class Parser:
                         f" Received {self.ord_dict[key]}"
                     )
 
-    def __get_cat_cols(self):
-        rows = self.train_df.shape[0]
-        rows = 0.2 * rows
-        self.cat_cols = []
-        for col in self.train_df.columns:
-            if col not in self.ord_cols:
-                if (
-                    self.train_df[col].dtype == "object"
-                    and type(self.train_df[col][0]) is str
-                ) and (
-                    "$" in self.train_df[col][0]
-                    or self.train_df[col].str.contains(",").any()
-                ):
-                    self.train_df[col] = (
-                        self.train_df[col]
-                        .apply(lambda x: x.replace("$", "").replace(",", ""))
-                        .astype("float")
-                    )
-                elif (
-                    is_numeric_dtype(self.train_df[col])
-                    or is_string_dtype(self.train_df[col])
-                ) and self.train_df[col].dropna().nunique() < rows:
-                    self.cat_cols.append(col)
-            else:
-                continue
-        return self.cat_cols
+        if not isinstance(self.approximate, bool):
+            raise TypeError(
+                f"'approximate_distinct' should be of type bool. Received {self.approximate} of type {type(self.approximate)}"
+            )
 
-    def parse_dataset(self, params):
+        resolve_n_jobs(self.column_jobs, "column_jobs")
+
+        if not isinstance(self.parse_dates, bool):
+            raise TypeError(
+                f"'parse_dates' should be of type bool. Received {self.parse_dates} of type {type(self.parse_dates)}"
+            )
+
+    def __read_params(self, params):
         if "train_df" in params.keys():
             self.train_df = params["train_df"]
         if "test_df" in params.keys():
@@ -87,22 +102,399 @@ class Parser:
             self.ord_dict = params["ord_dict"]
         if "target_label" in params.keys():
             self.target_label = params["target_label"]
+        self.cat_cols = (
+            params["cat_cols"] if "cat_cols" in params.keys() else None
+        )
+        if self.ord_dict:
+            self.ord_cols = [k for k in self.ord_dict.keys()]
+        self.approximate = params.get("approximate_distinct", False)
+        self.parse_dates = params.get("parse_dates", True)
+        self.column_jobs = params.get("column_jobs", 1)
+
+    def __validate_cat_cols(self):
+        for col in self.cat_cols:
+            if col not in self.train_df or (
+                self.test_df is not None and col not in self.test_df
+            ):
+                raise ValueError(
+                    f"Column {col} is not present in the given dataset"
+                )
+
+    def __column_kind(self, column):
+        # ("currency", number format), ("date", date format), ("categorical", None) for
+        # the columns whose distinct values are counted, or None
+        number_format = detect_number_format(column)
+        if number_format is not None:
+            return "currency", number_format
+        if self.parse_dates and column.name != self.target_label:
+            if is_datetime64_any_dtype(column):
+                return "date", None
+            date_format = detect_date_format(column)
+            if date_format is not None:
+                return "date", date_format
+        if is_numeric_dtype(column) or is_string_dtype(column):
+            return "categorical", None
+        return None
+
+    def __add_kind(self, col, kind):
+        # saves the format of a currency or date column, returns True if it has one
+        if kind is None or kind[0] == "categorical":
+            return False
+        if kind[0] == "currency":
+            self.currency_cols.append(col)
+            self.number_formats[col] = kind[1]
+        else:
+            self.date_formats[col] = kind[1]
+        return True
+
+    def reset(self):
+        """Discards the categorical, currency and date columns learned by :meth:`fit` and
+        :meth:`partial_fit`.
+
+        .. versionadded:: 1.0.5
+        """
+        self.rows_seen = 0
+        self.number_formats = {}
+        self.date_formats = {}
+        self.distinct_values = {}
+        self.currency_cols = []
+        self.learned_cat_cols = None
+        self.distinct_counts = None
 
+    def fit(self, params):
+        """Learns the categorical, currency and date columns of the train dataframe. A
+        column is categorical if its number of distinct values is less than 20% of the
+        number of rows. A column is a currency column if its first values are numbers
+        formatted with a currency symbol, thousands separators or a decimal comma, whose
+        format is detected by :func:`preprocessy.utils.detect_number_format`. A column is a
+        date column if it has a ``datetime64`` dtype or if its first values are dates, whose
+        format is detected by :func:`preprocessy.utils.detect_date_format`. Nothing is
+        learned if ``cat_cols`` is provided. Takes the same parameters as
+        :meth:`parse_dataset`.
+
+        If ``schema_sidecar`` is present in ``params``, the columns are saved to the schema
+        sidecar written by :class:`preprocessy.input.Reader` and loaded from it when the
+        same file is parsed again with the same ``target_label`` and ``ord_dict``.
+
+        If ``approximate_distinct`` is ``True``, the distinct values are estimated with
+        :func:`preprocessy.utils.count_distinct`, which stops reading a column once it has
+        more distinct values than 20% of the rows. The distinct values of every column are
+        inserted into ``params`` by :meth:`transform` as ``distinct_counts``, so that the
+        :class:`preprocessy.encoding.Encoder` does not count them again.
+
+        The distinct values are counted by the :class:`preprocessy.utils.ColumnStatistics`
+        of ``params``, which is created if ``column_statistics`` is not present. The null
+        values and moments of all the columns are computed in the same pass and are reused
+        by the next stages, which ask the catalog for the quantiles of the columns they
+        need.
+
+        .. versionadded:: 1.0.5
+        """
+        self.__read_params(params)
         self.__validate_input()
+        self.reset()
+        if self.cat_cols is not None:
+            self.__validate_cat_cols()
+            return
 
-        if "cat_cols" in params.keys():
-            self.cat_cols = params["cat_cols"]
-            for col in self.cat_cols:
-                if col not in self.train_df or (
-                    self.test_df is not None and col not in self.test_df
-                ):
-                    raise ValueError(
-                        f"Column {col} is not present in the given dataset"
-                    )
+        sidecar = params.get("schema_sidecar")
+        if sidecar is not None and self.__load_sidecar(sidecar):
+            return
+
+        rows = 0.2 * self.train_df.shape[0]
+        kinds = map_columns(
+            lambda block: {
+                col: self.__column_kind(block[col]) for col in block.columns
+            },
+            self.train_df,
+            [col for col in self.train_df.columns if col not in self.ord_cols],
+            self.column_jobs,
+        )
+        candidates = [
+            col
+            for col, kind in kinds.items()
+            if not self.__add_kind(col, kind)
+            and kind is not None
+            and col != self.target_label
+        ]
+        # the statistics of every column are computed once for all the stages
+        statistics = column_statistics(params).add(
+            self.train_df, distinct=candidates, n_jobs=self.column_jobs
+        )
+        counts = {col: statistics.distinct[col] for col in candidates}
+        self.learned_cat_cols = [
+            col for col in candidates if counts[col] < rows
+        ]
+        self.distinct_values = None
+        self.distinct_counts = {
+            "rows": self.train_df.shape[0],
+            "counts": counts,
+        }
+        if sidecar is not None:
+            update_sidecar(
+                sidecar,
+                parser=dict(self.__sidecar_key(), state=self.get_state()),
+            )
+
+    def __sidecar_key(self):
+        return {
+            "target_label": self.target_label,
+            "ord_cols": list(self.ord_cols),
+            "columns": [str(col) for col in self.train_df.columns],
+            "rows": self.train_df.shape[0],
+            "parse_dates": self.parse_dates,
+        }
+
+    def __load_sidecar(self, path):
+        # the columns saved by an earlier fit on the same file and parameters
+        cached = read_sidecar(path)
+        if cached is None or "parser" not in cached:
+            return False
+        entry = dict(cached["parser"])
+        state = entry.pop("state", None)
+        if state is None or entry != self.__sidecar_key():
+            return False
+        self.set_state(state)
+        return True
+
+    def partial_fit(self, params):
+        """Learns the categorical and currency columns from a chunk of the train dataframe.
+        The distinct values of every column are accumulated until :meth:`reset` is called
+        and are used by :meth:`transform`. Once a column has more than 65536 distinct
+        values, or from the first chunk with ``approximate_distinct``, they are counted by
+        a :class:`preprocessy.utils.HyperLogLog` of fixed size instead, so the memory does
+        not grow with the number of distinct values. The format of a currency or date
+        column is detected from the first chunk in which it is formatted. Takes the same
+        parameters as :meth:`parse_dataset`.
+
+        .. versionadded:: 1.0.5
+        """
+        self.__read_params(params)
+        self.__validate_input()
+        if self.distinct_values is None:
+            self.reset()
+        if self.cat_cols is not None:
+            self.__validate_cat_cols()
             return
 
+        for col in self.train_df.columns:
+            if (
+                col in self.ord_cols
+                or col in self.currency_cols
+                or col in self.date_formats
+            ):
+                continue
+            column = self.train_df[col]
+            kind = self.__column_kind(column)
+            if self.__add_kind(col, kind):
+                self.distinct_values.pop(col, None)
+            elif kind is not None:
+                self.__add_distinct(col, column)
+        self.rows_seen += self.train_df.shape[0]
+        self.learned_cat_cols = None
+
+    def __add_distinct(self, col, column):
+        # distinct values are kept exactly until a column has EXACT_DISTINCT_VALUES of
+        # them, then they are counted by a HyperLogLog so that the memory is bounded
+        values = self.distinct_values.get(col)
+        if values is None:
+            values = HyperLogLog() if self.approximate else set()
+        if isinstance(values, set):
+            values.update(column.dropna().unique())
+            if len(values) > EXACT_DISTINCT_VALUES:
+                sketch = HyperLogLog()
+                sketch.update(pd.Series(list(values)))
+                values = sketch
+        else:
+            values.update(column)
+        self.distinct_values[col] = values
+
+    def get_state(self):
+        """Returns the categorical and currency columns learned by :meth:`fit` or
+        :meth:`partial_fit`.
+
+        :rtype: dict
+
+        .. versionadded:: 1.0.5
+        """
+        if self.learned_cat_cols is None:
+            if self.distinct_values is None:
+                raise ValueError(
+                    "Parser is not fitted. Please fit the parser before calling"
+                    " transform."
+                )
+            rows = 0.2 * self.rows_seen
+            self.learned_cat_cols = [
+                col
+                for col, values in self.distinct_values.items()
+                if (
+                    values.count()
+                    if isinstance(values, HyperLogLog)
+                    else len(values)
+                )
+                < rows
+                and col != self.target_label
+            ]
+        return {
+            "cat_cols": list(self.learned_cat_cols),
+            "currency_cols": list(self.currency_cols),
+            "number_formats": {
+                col: dict(self.number_formats.get(col, DEFAULT_NUMBER_FORMAT))
+                for col in self.currency_cols
+            },
+            "date_formats": dict(self.date_formats),
+        }
+
+    def set_state(self, state):
+        """Restores the state returned by :meth:`get_state`.
+
+        :param state: The categorical and currency columns
+        :type state: dict
+
+        .. versionadded:: 1.0.5
+        """
+        self.reset()
+        self.distinct_values = None
+        self.learned_cat_cols = list(state["cat_cols"])
+        self.currency_cols = list(state["currency_cols"])
+        self.number_formats = dict(state.get("number_formats", {}))
+        self.date_formats = dict(state.get("date_formats", {}))
+
+    def save_state(self, file_path):
+        """Saves the state returned by :meth:`get_state` to a ``JSON`` file.
+
+        :param file_path: Path where the state file must be created
+        :type file_path: str
+
+        .. versionadded:: 1.0.5
+        """
+        save_state(file_path, self.get_state())
+
+    def load_state(self, file_path):
+        """Restores the state saved by :meth:`save_state`.
+
+        :param file_path: Path to the state file
+        :type file_path: str
+
+        .. versionadded:: 1.0.5
+        """
+        self.set_state(read_state(file_path))
+
+    def __expand_dates(self, df, col, date_format):
+        # the date column is replaced by its numeric parts in place
+        if col not in df:
+            return
+        parts = expand_dates(df[col], date_format)
+        loc = df.columns.get_loc(col)
+        df.drop(columns=col, inplace=True)
+        for i, name in enumerate(parts.columns):
+            df.insert(loc + i, name, parts[name])
+
+    def transform(self, params):
+        """Converts the currency columns of the train and test dataframes to floats,
+        replaces every date column ``<name>`` by the numeric columns ``<name>Year``,
+        ``<name>Month``, ``<name>DayOfWeek`` and ``<name>Epoch`` with
+        :func:`preprocessy.utils.expand_dates` and inserts the categorical columns learned
+        by :meth:`fit` into ``params``. Only the columns are validated if ``cat_cols`` is
+        provided. Takes the same parameters as :meth:`parse_dataset`.
+
+        .. versionadded:: 1.0.5
+        """
+        self.__read_params(params)
+        self.__validate_input()
         if self.ord_dict:
-            self.ord_cols = [k for k in self.ord_dict.keys()]
             params["ord_cols"] = self.ord_cols
+        if self.cat_cols is not None:
+            self.__validate_cat_cols()
+            return
+
+        state = self.get_state()
+        for df in [self.train_df, self.test_df]:
+            if df is None:
+                continue
+            for col in state["currency_cols"]:
+                df[col] = parse_numbers(df[col], state["number_formats"][col])
+            for col, date_format in state["date_formats"].items():
+                self.__expand_dates(df, col, date_format)
+
+        statistics = params.get("column_statistics")
+        if statistics is not None:
+            changed = state["currency_cols"] + list(state["date_formats"])
+            statistics.refresh(
+                self.train_df,
+                self.train_df,
+                [col for col in self.train_df.columns if col not in changed],
+            )
+
+        self.cat_cols = state["cat_cols"]
+        params["cat_cols"] = self.cat_cols
+        if self.distinct_counts is not None:
+            params["distinct_counts"] = self.distinct_counts
+
+    @step_io(
+        reads=[
+            "train_df",
+            "test_df",
+            "target_label",
+            "cat_cols",
+            "ord_dict",
+            "approximate_distinct",
+            "parse_dates",
+            "schema_sidecar",
+            "column_jobs",
+            "column_statistics",
+        ],
+        writes=[
+            "train_df",
+            "test_df",
+            "cat_cols",
+            "ord_cols",
+            "distinct_counts",
+            "column_statistics",
+        ],
+    )
+    def parse_dataset(self, params):
+        """Identifies the categorical columns of the train dataframe and converts the
+        currency columns to floats. Does :meth:`fit` and :meth:`transform` in a single step.
+
+        :param train_df: Input dataframe, may or may not consist of the target label.
+                  Should not be ``None``
+        :type train_df: pandas.core.frames.DataFrame
+
+        :param test_df: Input dataframe, may or may not consist of the target label.
+        :type test_df: pandas.core.frames.DataFrame
+
+        :param target_label: Name of the Target Column. This parameter is needed to ensure
+                            that the target column isn't identified as categorical.
+        :type target_label: str
+
+        :param cat_cols: List containing the names of categorical columns. If provided, the
+                        columns are only validated.
+        :type cat_cols: list
+
+        :param ord_dict: Dictionary with the the key as name of column to be encoded
+                        ordinally and the corresponding value is the dictionary containing
+                        the mapping.
+        :type ord_dict: dict
+
+        :param approximate_distinct: If ``True``, the distinct values of the columns are
+                                     estimated and counting stops once a column is known
+                                     not to be categorical. Defaults to ``False``.
+        :type approximate_distinct: bool
+
+        :param parse_dates: If ``True``, date columns are detected and replaced by their
+                            year, month, day of the week and seconds since the epoch.
+                            Defaults to ``True``.
+        :type parse_dates: bool
+
+        :param column_jobs: Number of threads that blocks of columns are processed on, ``-1``
+                       uses all the processors. Defaults to ``1``.
+        :type column_jobs: int
 
-        params["cat_cols"] = self.__get_cat_cols()
+        .. versionchanged:: 1.0.5
+            The currency columns of ``test_df`` are converted as well and ``target_label``
+            is never identified as categorical. Added ``approximate_distinct``,
+            ``parse_dates`` and ``column_jobs``.
+        """
+        self.fit(params)
+        self.transform(params)
@@ -1,5 +1,17 @@
-from ._base import BasePipeline
-from ._feature_selection_pipeline import FeatureSelectionPipeline
-from ._standard_pipeline import StandardPipeline
+from .._lazy import attach
 
-__all__ = ["BasePipeline", "StandardPipeline", "FeatureSelectionPipeline"]
+__getattr__, __dir__, __all__ = attach(
+    __name__,
+    attributes={
+        "BasePipeline": "._base",
+        "StandardPipeline": "._standard_pipeline",
+        "FeatureSelectionPipeline": "._feature_selection_pipeline",
+        "FittedPipeline": "._fitted",
+        "load_pipeline": "._fitted",
+        "StageCache": "._cache",
+        "DagScheduler": "._scheduler",
+        "ProfileReport": "._profile",
+        "Reporter": "._reporter",
+        "ConsoleReporter": "._reporter",
+    },
+)
@@ -1,32 +1,30 @@
 import warnings
+from contextlib import nullcontext
 from copy import deepcopy
 
-import stringcase
-from alive_progress import alive_bar
-from colorama import Fore
-from colorama import init
-from colorama import Style
-from prettytable import PrettyTable
-
 from ..exceptions import ArgumentsError
 from ..input import Reader
+from ._cache import StageCache
+from ._fitted import FittedPipeline
+from ._profile import ProfileReport
+from ._reporter import ConsoleReporter
+from ._reporter import Reporter
+from ._scheduler import DagScheduler
 from .config import read_config
 from .config import save_config
 
-init()
-
 
 class BasePipeline:
 
     """The ``BasePipeline`` Class can be used to create your own customized pipeline.
 
-    :param train_df_path: Path to train dataframe
+    :param train_df_path: Path to train dataframe, a glob pattern or a list of paths
               Should not be ``None``
-    :type train_df_path: str
+    :type train_df_path: str or list
 
-    :param test_df_path: Path to train dataframe
+    :param test_df_path: Path to train dataframe, a glob pattern or a list of paths
               Should not be ``None``
-    :type test_df_path: str
+    :type test_df_path: str or list
 
     :param steps: A list of functions which will be executed sequentially.
             All the functions should be callables
@@ -41,9 +39,17 @@ class BasePipeline:
     :param custom_reader: Custom function to read the data
     :type custom_reader: callable
 
+    :param reporter: Receives the progress of :meth:`process`. Defaults to a
+                     :class:`ConsoleReporter`, or to a headless :class:`Reporter` if
+                     ``headless`` is ``True`` in ``params``.
+    :type reporter: Reporter
+
     .. versionchanged:: 1.0.4
         ``params`` field of the pipeline is made private and is initialised as a deepcopy of the
         passed in parameter dict.
+
+    .. versionchanged:: 1.0.5
+        Added ``reporter``.
     """
 
     def __init__(
@@ -54,6 +60,7 @@ class BasePipeline:
         config_file=None,
         params=None,
         custom_reader=None,
+        reporter=None,
     ):
         self.__params = deepcopy(params)
         self.train_df_path = train_df_path
@@ -74,6 +81,10 @@ class BasePipeline:
         else:
             self.steps = steps
         self.custom_reader = custom_reader
+        self.__fitted_config = None
+        self.cache = None
+        self.report = None
+        self.reporter = reporter
         self.__validate_input()
 
         if self.config_file and not self.__params:
@@ -141,16 +152,16 @@ class BasePipeline:
         if not self.train_df_path:
             raise ArgumentsError("'train_df_path' should not be None.")
 
-        if not isinstance(self.train_df_path, str):
+        if not self.__is_path(self.train_df_path):
             raise TypeError(
-                f"'train_df_path' should be of type str. Received {self.train_df_path} "
+                f"'train_df_path' should be of type str or a list of str. Received {self.train_df_path} "
                 f"of type {type(self.train_df_path)}"
             )
 
         if self.test_df_path:
-            if not isinstance(self.test_df_path, str):
+            if not self.__is_path(self.test_df_path):
                 raise TypeError(
-                    f"'test_df_path' should be of type str. Received {self.test_df_path} "
+                    f"'test_df_path' should be of type str or a list of str. Received {self.test_df_path} "
                     f"of type {type(self.test_df_path)}"
                 )
 
@@ -160,25 +171,266 @@ class BasePipeline:
                 f" {self.custom_reader} of type {type(self.custom_reader)}"
             )
 
+        if self.reporter is not None and not isinstance(
+            self.reporter, Reporter
+        ):
+            raise TypeError(
+                "'reporter' should be an instance of Reporter. Received"
+                f" {self.reporter} of type {type(self.reporter)}"
+            )
+
+    def __is_path(self, path):
+        # a path, a glob pattern or a list of paths
+        if isinstance(path, list):
+            return all(isinstance(p, str) for p in path)
+        return isinstance(path, str)
+
     def process(self):
-        """Method that executes the pipeline sequentially."""
-        self.print_info()
-        with alive_bar(
-            len(self.steps),
-            title="Pipeline Stages",
-            enrich_print=False,
-        ) as bar:
-            print("\nProcessing...\n")
-            for step in self.steps:
-                step(self.__params)
-                print(
-                    f"==> Completed Stage: {stringcase.sentencecase(step.__name__)}\n"
+        """Method that executes the pipeline sequentially.
+
+        If ``chunksize`` is present in ``params``, the pipeline is executed in chunks
+        using :meth:`process_chunks` and the processed chunks are discarded. Add a step
+        at the end of the pipeline to store the output of every chunk.
+
+        If ``cache_dir`` is present in ``params``, the output of every step is stored in a
+        :class:`StageCache` in that directory and loaded from it when the step is executed
+        again with the same inputs. The cache holds at most ``cache_size`` bytes. The hits
+        and misses of the last run are available from ``self.cache.info()``. The cache is
+        not used in the chunked execution mode.
+
+        If ``n_jobs`` is present in ``params``, the steps are executed by a
+        :class:`DagScheduler` on ``n_jobs`` threads. Steps that do not depend on each
+        other run concurrently and the train and test dataframes are transformed
+        concurrently by every stage. ``n_jobs`` is ignored when ``cache_dir`` is provided.
+
+        If ``profile`` is ``True`` in ``params``, the wall time, CPU time, memory, shapes of
+        the dataframes and the bytes added to ``params`` by every step are recorded in a
+        :class:`ProfileReport`. ``profile_memory`` selects how memory is measured, either
+        ``"rss"`` or ``"tracemalloc"``. ``"tracemalloc"`` cannot be used with ``n_jobs``
+        as the steps executed concurrently would share its counters. Profiling is not
+        available in the chunked execution mode.
+
+        The progress is sent to the ``reporter`` of the pipeline, a :class:`ConsoleReporter`
+        by default. If ``headless`` is ``True`` in ``params`` and no reporter is provided,
+        nothing is printed and the display libraries are not imported.
+
+        :return: The :class:`ProfileReport` of the run if ``profile`` is ``True``
+        :rtype: ProfileReport
+
+        .. versionchanged:: 1.0.5
+            Added the chunked execution mode, the stage cache, ``n_jobs``, profiling and
+            reporters.
+        """
+        self.__fitted_config = self.__config()
+        reporter = self.reporter
+        if reporter is None:
+            reporter = (
+                Reporter()
+                if self.__params.get("headless")
+                else ConsoleReporter()
+            )
+
+        if "chunksize" in self.__params:
+            reporter.start(self)
+            try:
+                for params in self.process_chunks():
+                    reporter.chunk_completed(params)
+            except BaseException:
+                reporter.finish(success=False)
+                raise
+            reporter.finish()
+            return
+
+        self.report = None
+        if self.__params.get("profile"):
+            self.report = ProfileReport(
+                self.__class__.__name__,
+                self.__params.get("profile_memory", "rss"),
+            )
+
+        parallel = (
+            "n_jobs" in self.__params and "cache_dir" not in self.__params
+        )
+        if parallel and self.report and self.report.memory == "tracemalloc":
+            raise ValueError(
+                "'profile_memory' cannot be \"tracemalloc\" when 'n_jobs' is provided,"
+                ' use "rss" or execute the steps sequentially'
+            )
+
+        self.cache = None
+        if "cache_dir" in self.__params:
+            self.cache = StageCache(
+                self.__params["cache_dir"],
+                self.__params.get("cache_size", 2**30),
+            )
+
+        reporter.start(self, len(self.steps))
+        try:
+            if parallel:
+                scheduler = DagScheduler(self.steps, self.__params["n_jobs"])
+                scheduler.run(
+                    self.__params,
+                    on_complete=reporter.step_completed,
+                    measure=self.report.measure if self.report else None,
                 )
-                bar()
-        print(
-            Fore.GREEN + "\nPipeline Completed Successfully\n" + Style.RESET_ALL
+            else:
+                for step in self.steps:
+                    with self.__measure(step):
+                        if self.cache is not None:
+                            self.cache.run(step, self.__params)
+                        else:
+                            step(self.__params)
+                    reporter.step_completed(step)
+        except BaseException:
+            reporter.finish(success=False)
+            raise
+
+        if self.cache is not None:
+            reporter.message(
+                f"Stage cache: {self.cache.hits} hits, {self.cache.misses} misses\n"
+            )
+        reporter.finish()
+        return self.report
+
+    def __measure(self, step):
+        if self.report is None:
+            return nullcontext()
+        return self.report.measure(step, self.__params)
+
+    def __config(self):
+        return deepcopy(
+            {
+                k: v
+                for k, v in self.__params.items()
+                if k not in self.config_drop_keys
+            }
         )
 
+    def __stage_of(self, step):
+        # stages that learn statistics over all the chunks before transforming them
+        stage = getattr(step, "__self__", None)
+        if (
+            stage is not None
+            and callable(getattr(stage, "partial_fit", None))
+            and callable(getattr(stage, "transform", None))
+            and callable(getattr(stage, "reset", None))
+        ):
+            return stage
+        return None
+
+    def __run_chunk_step(self, step, params):
+        stage = self.__stage_of(step)
+        if stage is not None:
+            stage.transform(params)
+        else:
+            step(params)
+
+    def process_chunks(self):
+        """Generator that executes the pipeline over chunks of ``chunksize`` rows so that
+        the peak memory is set by the size of a chunk and not by the size of the dataset.
+
+        Every stage that learns statistics from the data (``Parser``, ``NullValuesHandler``,
+        ``Encoder``, ``HandleOutlier`` and ``Scaler``) first runs a statistics pass over all
+        the chunks of ``train_df_path`` using its ``partial_fit`` method. Once all the
+        stages are fitted, every chunk of ``train_df_path`` and ``test_df_path`` is
+        transformed by the stages in order. Steps without a ``partial_fit`` method are
+        applied to each chunk independently.
+
+        The chunks of ``train_df_path`` are passed to the steps as ``train_df`` with
+        ``test_df`` set to ``None``. The chunks of ``test_df_path`` are passed as
+        ``test_df`` with an empty ``train_df`` of the same columns.
+
+        :param chunksize: Number of rows read from the dataset at a time
+        :type chunksize: int
+
+        :yield: The ``params`` of the processed chunk. Only the dataframes differ between
+                chunks.
+        :rtype: dict
+
+        :raises ArgumentsError: If the reader of the pipeline cannot read files in chunks
+
+        .. versionadded:: 1.0.5
+        """
+        chunksize = self.__params.get("chunksize")
+        reader = getattr(self.custom_reader, "__self__", None)
+        if not callable(getattr(reader, "read_chunks", None)):
+            raise ArgumentsError(
+                "Chunked processing requires a reader with a 'read_chunks'"
+                f" method. Received {self.custom_reader}"
+            )
+
+        steps = [step for step in self.steps if step != self.custom_reader]
+        config = self.__config()
+        self.__fitted_config = config
+
+        def chunk_params(train_df, test_df):
+            params = deepcopy(config)
+            params["train_df"] = train_df
+            params["test_df"] = test_df
+            return params
+
+        for i, step in enumerate(steps):
+            stage = self.__stage_of(step)
+            if stage is None:
+                continue
+            stage.reset()
+            for chunk in reader.read_chunks(self.train_df_path, chunksize):
+                params = chunk_params(chunk, None)
+                for previous in steps[:i]:
+                    self.__run_chunk_step(previous, params)
+                stage.partial_fit(params)
+
+        for is_test, path in enumerate([self.train_df_path, self.test_df_path]):
+            if not path:
+                continue
+            for chunk in reader.read_chunks(path, chunksize):
+                if not is_test:
+                    params = chunk_params(chunk, None)
+                else:
+                    params = chunk_params(chunk.iloc[:0], chunk)
+                for step in steps:
+                    self.__run_chunk_step(step, params)
+                yield params
+
+    def export(self, file_path):
+        """Method to save the fitted pipeline to a binary file after :meth:`process`. The file
+        holds the order of the steps, the statistics learned by every stage and the
+        parameters of the pipeline. It can be read with :func:`load_pipeline` to transform
+        new batches of rows without the training data.
+
+        Only the steps that are methods of a stage with ``get_state``, ``set_state`` and
+        ``transform`` methods are exported. The reader, ``Split`` and plain functions are
+        not part of the fitted pipeline.
+
+        :param file_path: Path where the file must be created
+        :type file_path: str
+
+        :return: The exported pipeline
+        :rtype: FittedPipeline
+
+        :raises ValueError: If the pipeline has not been processed
+
+        .. versionadded:: 1.0.5
+        """
+        if self.__fitted_config is None:
+            raise ValueError(
+                "Pipeline is not fitted. Please call process before export."
+            )
+
+        stages = []
+        for step in self.steps:
+            stage = getattr(step, "__self__", None)
+            if step == self.custom_reader or not all(
+                callable(getattr(stage, method, None))
+                for method in ["get_state", "set_state", "transform"]
+            ):
+                continue
+            stages.append((type(stage).__name__, stage))
+
+        fitted = FittedPipeline(stages, self.__fitted_config)
+        fitted.save(file_path)
+        return fitted
+
     def __insert(self, index, func, params):
         self.steps.insert(index, func)
         if params:
@@ -304,6 +556,9 @@ class BasePipeline:
 
     def print_info(self):
         """Prints the current configuration of the pipeline. Shows the steps, dataframe paths and config paths."""
+        import stringcase
+        from prettytable import PrettyTable
+
         print(f"\nPipeline Class: {self.__class__.__name__}\n")
         table = PrettyTable(["Pipeline Property", "Value"])
         table.align = "l"
@@ -0,0 +1,446 @@
+import glob
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import uuid
+from collections.abc import KeysView
+
+import numpy as np
+import pandas as pd
+
+MISSING = "__missing__"
+FRAME_TYPES = (pd.DataFrame, pd.Series)
+MUTABLE_TYPES = (pd.DataFrame, pd.Series, np.ndarray, list, dict, set)
+
+
+class _RecordingParams(dict):
+    """Copy of ``params`` that records the keys read and written by a step. The
+    fingerprint of a key is taken when it is first read, before the step can modify
+    its value in place."""
+
+    def __init__(self, params, fingerprint):
+        super().__init__(params)
+        self.fingerprint = fingerprint
+        self.read = {}
+        self.written = set()
+
+    def __record(self, key):
+        if key not in self.read and key not in self.written:
+            self.read[key] = (
+                self.fingerprint(super().__getitem__(key))
+                if super().__contains__(key)
+                else MISSING
+            )
+
+    def __record_all(self):
+        for key in list(super().keys()):
+            self.__record(key)
+
+    def __getitem__(self, key):
+        self.__record(key)
+        return super().__getitem__(key)
+
+    def __contains__(self, key):
+        self.__record(key)
+        return super().__contains__(key)
+
+    def __iter__(self):
+        self.__record_all()
+        return super().__iter__()
+
+    def get(self, key, default=None):
+        self.__record(key)
+        return super().get(key, default)
+
+    def keys(self):
+        return KeysView(self)
+
+    def items(self):
+        self.__record_all()
+        return super().items()
+
+    def values(self):
+        self.__record_all()
+        return super().values()
+
+    def __setitem__(self, key, value):
+        self.written.add(key)
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self.written.add(key)
+        super().__delitem__(key)
+
+    def pop(self, key, *args):
+        self.__record(key)
+        self.written.add(key)
+        return super().pop(key, *args)
+
+    def setdefault(self, key, default=None):
+        self.__record(key)
+        self.written.add(key)
+        return super().setdefault(key, default)
+
+    def update(self, *args, **kwargs):
+        other = dict(*args, **kwargs)
+        self.written.update(other.keys())
+        super().update(other)
+
+
+def _step_identity(step):
+    # the qualified name of the step and the bytecode of the step and its stage class
+    func = getattr(step, "__func__", step)
+    stage = getattr(step, "__self__", None)
+    name = f"{getattr(func, '__module__', '')}.{getattr(func, '__qualname__', repr(func))}"
+    functions = [func]
+    if stage is not None:
+        for klass in type(stage).__mro__:
+            functions.extend(
+                v for _, v in sorted(vars(klass).items()) if callable(v)
+            )
+
+    digest = hashlib.sha256(name.encode())
+    for f in functions:
+        code = getattr(f, "__code__", None)
+        if code is not None:
+            digest.update(code.co_code)
+            digest.update(repr(code.co_consts).encode())
+    return f"{name}:{digest.hexdigest()[:16]}"
+
+
+def _is_file_list(value):
+    return (
+        isinstance(value, list)
+        and len(value) > 0
+        and all(isinstance(v, str) and os.path.isfile(v) for v in value)
+    )
+
+
+def _fingerprint(value):
+    digest = hashlib.sha256()
+    if isinstance(value, FRAME_TYPES):
+        if isinstance(value, pd.DataFrame):
+            layout = [
+                list(map(str, value.columns)),
+                list(map(str, value.dtypes)),
+            ]
+        else:
+            layout = [str(value.name), str(value.dtype)]
+        digest.update(json.dumps(layout).encode())
+        try:
+            digest.update(
+                pd.util.hash_pandas_object(value, index=True)
+                .to_numpy()
+                .tobytes()
+            )
+        except TypeError:
+            digest.update(pickle.dumps(value, protocol=4))
+    elif _is_file_list(value):
+        for path in value:
+            stat = os.stat(path)
+            digest.update(f"{path}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    elif isinstance(value, str) and glob.has_magic(value):
+        digest.update(_fingerprint(sorted(glob.glob(value))).encode())
+    elif isinstance(value, str) and os.path.isfile(value):
+        stat = os.stat(value)
+        digest.update(f"{value}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    else:
+        try:
+            digest.update(pickle.dumps(value, protocol=4))
+        except Exception:
+            digest.update(repr(value).encode())
+    return digest.hexdigest()
+
+
+def _write_arrow(df, file_path):
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(df, preserve_index=True)
+    with pa.OSFile(file_path, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+
+def _read_arrow(file_path):
+    import pyarrow as pa
+
+    with pa.memory_map(file_path) as source:
+        return pa.ipc.open_file(source).read_all().to_pandas()
+
+
+class StageCache:
+    """Content addressed on-disk cache of the outputs of pipeline steps. Used by
+    :meth:`BasePipeline.process` when ``cache_dir`` is present in ``params``.
+
+    The key of a step is computed from the identity of the step and the values of the
+    ``params`` keys that the step read the last time it was executed. Dataframes are
+    fingerprinted by their content and paths of existing files, lists of paths and
+    glob patterns by the size and modification time of the files. The dataframes
+    written by a step are stored as memory mapped Arrow IPC files and the other values
+    are pickled. The statistics learned by a stage are stored with its output and
+    restored with ``set_state`` on a hit.
+
+    When the entries take more than ``max_size`` bytes, the least recently used entries
+    are removed.
+
+    :param cache_dir: Directory where the entries are stored
+    :type cache_dir: str
+
+    :param max_size: Maximum size of the cache in bytes, defaults to 1 GiB
+    :type max_size: int
+
+    :raises ImportError: If ``pyarrow`` is not installed
+
+    .. versionadded:: 1.0.5
+    """
+
+    def __init__(self, cache_dir, max_size=2**30):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError as e:
+            raise ImportError(
+                "The stage cache requires pyarrow. Install it with"
+                " 'pip install preprocessy[arrow]'."
+            ) from e
+
+        if not isinstance(cache_dir, (str, os.PathLike)):
+            raise TypeError(
+                f"'cache_dir' should be of type str. Received {cache_dir} of"
+                f" type {type(cache_dir)}"
+            )
+        if (
+            not isinstance(max_size, int)
+            or isinstance(max_size, bool)
+            or max_size <= 0
+        ):
+            raise ValueError(
+                f"'cache_size' should be a positive int. Received {max_size}"
+            )
+
+        self.cache_dir = str(cache_dir)
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.__known = {}
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def __repr__(self):
+        return (
+            f"StageCache(cache_dir={self.cache_dir}, max_size={self.max_size})"
+        )
+
+    def __index_path(self):
+        return os.path.join(self.cache_dir, "index.json")
+
+    def __read_index(self):
+        try:
+            with open(self.__index_path()) as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def __write_index(self, index):
+        tmp = f"{self.__index_path()}.{uuid.uuid4().hex}"
+        with open(tmp, "w") as f:
+            json.dump(index, f)
+        os.replace(tmp, self.__index_path())
+
+    def __fingerprint(self, value):
+        known = self.__known.get(id(value))
+        if known is not None and known[0] is value:
+            return known[1]
+        return _fingerprint(value)
+
+    def __key(self, identity, fingerprints):
+        digest = hashlib.sha256(identity.encode())
+        for key in sorted(fingerprints, key=str):
+            digest.update(json.dumps([str(key), fingerprints[key]]).encode())
+        return digest.hexdigest()
+
+    def __entry_dir(self, key):
+        return os.path.join(self.cache_dir, key)
+
+    def __load(self, key, params, stage):
+        entry = self.__entry_dir(key)
+        try:
+            with open(os.path.join(entry, "meta.pkl"), "rb") as f:
+                meta = pickle.load(f)
+            outputs = dict(meta["values"])
+            for k, (file_name, kind, name) in meta["frames"].items():
+                path = os.path.join(entry, file_name)
+                if kind == "pickle":
+                    outputs[k] = pd.read_pickle(path)
+                else:
+                    outputs[k] = _read_arrow(path)
+                    if kind == "series":
+                        outputs[k] = outputs[k].iloc[:, 0].rename(name)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError, OSError):
+            return False
+
+        if stage is not None and meta["state"] is not None:
+            stage.set_state(meta["state"])
+        for k in meta["deleted"]:
+            params.pop(k, None)
+        params.update(outputs)
+        self.__known = {
+            id(outputs[k]): (outputs[k], fp)
+            for k, fp in meta["fingerprints"].items()
+        }
+        os.utime(os.path.join(entry, "meta.pkl"))
+        return True
+
+    def __store(self, key, identity, read_keys, outputs, deleted, stage):
+        tmp = self.__entry_dir(f"tmp-{uuid.uuid4().hex}")
+        os.makedirs(tmp)
+        meta = {
+            "identity": identity,
+            "read_keys": read_keys,
+            "values": {},
+            "frames": {},
+            "fingerprints": {},
+            "deleted": deleted,
+            "state": None,
+        }
+        for i, (k, value) in enumerate(outputs.items()):
+            if not isinstance(value, FRAME_TYPES):
+                meta["values"][k] = value
+                continue
+            file_name = f"{i}.arrow"
+            if isinstance(value, pd.Series):
+                kind, name, frame = (
+                    "series",
+                    value.name,
+                    value.to_frame("__0__"),
+                )
+            else:
+                kind, name, frame = "frame", None, value
+            try:
+                _write_arrow(frame, os.path.join(tmp, file_name))
+            except (TypeError, ValueError, NotImplementedError):
+                # non string column names or mixed object columns
+                file_name, kind = f"{i}.pkl", "pickle"
+                value.to_pickle(os.path.join(tmp, file_name))
+            meta["frames"][k] = (file_name, kind, name)
+            meta["fingerprints"][k] = _fingerprint(value)
+
+        if stage is not None:
+            try:
+                meta["state"] = stage.get_state()
+            except ValueError:
+                pass
+
+        try:
+            with open(os.path.join(tmp, "meta.pkl"), "wb") as f:
+                pickle.dump(meta, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            # outputs that cannot be pickled are never cached
+            shutil.rmtree(tmp, ignore_errors=True)
+            return
+
+        shutil.rmtree(self.__entry_dir(key), ignore_errors=True)
+        os.replace(tmp, self.__entry_dir(key))
+        self.__known = {
+            id(outputs[k]): (outputs[k], fp)
+            for k, fp in meta["fingerprints"].items()
+        }
+
+        index = self.__read_index()
+        read_sets = index.setdefault(identity, [])
+        if read_keys not in read_sets:
+            read_sets.append(read_keys)
+        self.__write_index(index)
+        self.__evict()
+
+    def __entries(self):
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            entry = self.__entry_dir(name)
+            meta = os.path.join(entry, "meta.pkl")
+            if not os.path.isfile(meta):
+                continue
+            size = sum(
+                os.path.getsize(os.path.join(entry, f))
+                for f in os.listdir(entry)
+            )
+            entries.append((os.path.getmtime(meta), size, entry))
+        return entries
+
+    def __evict(self):
+        entries = sorted(self.__entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in entries:
+            if total <= self.max_size:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+
+    def __stage_of(self, step):
+        stage = getattr(step, "__self__", None)
+        if callable(getattr(stage, "get_state", None)) and callable(
+            getattr(stage, "set_state", None)
+        ):
+            return stage
+        return None
+
+    def run(self, step, params):
+        """Executes ``step`` on ``params`` or loads its output from the cache.
+
+        :param step: The step of the pipeline
+        :type step: callable
+
+        :param params: The parameters of the pipeline. Updated in place.
+        :type params: dict
+        """
+        identity = _step_identity(step)
+        stage = self.__stage_of(step)
+        for read_keys in self.__read_index().get(identity, []):
+            fingerprints = {
+                key: self.__fingerprint(params[key])
+                if key in params
+                else MISSING
+                for key in read_keys
+            }
+            if self.__load(self.__key(identity, fingerprints), params, stage):
+                self.hits += 1
+                return
+
+        self.misses += 1
+        recorder = _RecordingParams(params, self.__fingerprint)
+        step(recorder)
+        self.__known = {}
+
+        read_keys = sorted(recorder.read, key=str)
+        deleted = [k for k in params if not dict.__contains__(recorder, k)]
+        outputs = {
+            k: v
+            for k, v in dict.items(recorder)
+            if k in recorder.written
+            or (k in recorder.read and isinstance(v, MUTABLE_TYPES))
+        }
+        key = self.__key(identity, recorder.read)
+        params.clear()
+        params.update(dict.items(recorder))
+        self.__store(key, identity, read_keys, outputs, deleted, stage)
+
+    def info(self):
+        """Returns the number of hits, misses and entries and the size of the cache in bytes.
+
+        :rtype: dict
+        """
+        entries = self.__entries()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(entries),
+            "size": sum(size for _, size, _ in entries),
+        }
+
+    def clear(self):
+        """Removes every entry of the cache and resets the counters."""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self.__known = {}
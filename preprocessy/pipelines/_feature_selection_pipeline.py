@@ -33,6 +33,7 @@ class FeatureSelectionPipeline(BasePipeline):
         config_file=None,
         params=None,
         custom_reader=None,
+        reporter=None,
     ):
         steps = [
             Parser().parse_dataset,
@@ -50,4 +51,5 @@ class FeatureSelectionPipeline(BasePipeline):
             config_file=config_file,
             params=params,
             custom_reader=custom_reader,
+            reporter=reporter,
         )
@@ -0,0 +1,121 @@
+import pickle
+from copy import deepcopy
+
+import pandas as pd
+
+ARTIFACT_FORMAT = "preprocessy.FittedPipeline"
+ARTIFACT_VERSION = 1
+
+
+class FittedPipeline:
+    """Applies the stages of a fitted pipeline to new data. A ``FittedPipeline`` is created
+    by :meth:`BasePipeline.export` and read back with :func:`load_pipeline`.
+
+    Only the ``transform`` method of every stage is called, with the statistics learned
+    while the pipeline was processed. No file is read, no progress bar is shown and the
+    categorical columns are not identified again by the ``Parser``.
+
+    :param stages: List of ``(name, stage)`` tuples in the order of the pipeline. Every
+                   stage must already be fitted.
+    :type stages: list
+
+    :param config: The parameters of the pipeline without the dataframes
+    :type config: dict
+
+    .. versionadded:: 1.0.5
+    """
+
+    def __init__(self, stages, config):
+        self.stages = stages
+        self.config = config
+
+    def __repr__(self):
+        return f"FittedPipeline(stages={[name for name, _ in self.stages]})"
+
+    def transform(self, df):
+        """Transforms a batch of rows. Steps that drop rows, such as ``NullValuesHandler``
+        with ``drop`` or ``HandleOutlier`` without ``replace``, drop them from the batch.
+
+        :param df: Batch of rows with the columns of the train dataframe. The target
+                   column is not required.
+        :type df: pandas.core.frames.DataFrame
+
+        :return: The transformed batch
+        :rtype: pandas.core.frames.DataFrame
+        """
+        if not isinstance(df, pd.core.frame.DataFrame):
+            raise TypeError(
+                f"Expected a pandas DataFrame. Received {df} of type {type(df)}"
+            )
+
+        params = deepcopy(self.config)
+        params["train_df"] = df.copy()
+        params["test_df"] = None
+        for _, stage in self.stages:
+            stage.transform(params)
+        return params["train_df"]
+
+    def get_state(self):
+        """Returns the artifact stored by :meth:`save`.
+
+        :rtype: dict
+        """
+        return {
+            "format": ARTIFACT_FORMAT,
+            "version": ARTIFACT_VERSION,
+            "config": self.config,
+            "stages": [
+                {"name": name, "class": type(stage), "state": stage.get_state()}
+                for name, stage in self.stages
+            ],
+        }
+
+    def save(self, file_path):
+        """Saves the pipeline to a binary file that can be read with :func:`load_pipeline`.
+
+        :param file_path: Path where the file must be created
+        :type file_path: str
+        """
+        with open(file_path, "wb") as f:
+            pickle.dump(self.get_state(), f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def load_pipeline(file_path):
+    """Reads a fitted pipeline saved by :meth:`BasePipeline.export`. The file is unpickled,
+    so only load files from a trusted source.
+
+    :param file_path: Path to the file
+    :type file_path: str
+
+    :return: The fitted pipeline
+    :rtype: FittedPipeline
+
+    :raises ValueError: If the file is not a fitted pipeline
+
+    .. versionadded:: 1.0.5
+    """
+    with open(file_path, "rb") as f:
+        try:
+            artifact = pickle.load(f)
+        except (pickle.UnpicklingError, EOFError) as e:
+            raise ValueError(
+                f"{file_path} is not a fitted preprocessy pipeline."
+            ) from e
+
+    if (
+        not isinstance(artifact, dict)
+        or artifact.get("format") != ARTIFACT_FORMAT
+    ):
+        raise ValueError(f"{file_path} is not a fitted preprocessy pipeline.")
+    if artifact["version"] > ARTIFACT_VERSION:
+        raise ValueError(
+            f"{file_path} was created by a newer version of preprocessy."
+            f" Received artifact version {artifact['version']}"
+        )
+
+    stages = []
+    for entry in artifact["stages"]:
+        stage = entry["class"]()
+        stage.set_state(entry["state"])
+        stages.append((entry["name"], stage))
+    return FittedPipeline(stages, artifact["config"])
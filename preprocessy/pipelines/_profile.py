@@ -0,0 +1,206 @@
+import json
+import os
+import time
+import tracemalloc
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from datetime import timezone
+
+import pandas as pd
+
+try:
+    import psutil
+except ImportError:  # pragma: no cover
+    psutil = None
+
+FRAMES = ["train_df", "test_df"]
+MEMORY_METHODS = ["rss", "tracemalloc"]
+
+
+def _current_rss():
+    # second field of statm is the resident set size in pages, psutil is used on the
+    # platforms without procfs
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    if psutil is not None:  # pragma: no cover
+        return psutil.Process().memory_info().rss
+    return None  # pragma: no cover
+
+
+def _shapes(params):
+    shapes = {}
+    for key in FRAMES:
+        df = params.get(key)
+        if isinstance(df, pd.DataFrame):
+            shapes[key] = list(df.shape)
+    return shapes
+
+
+def _nbytes(value):
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    return int(value.memory_usage(deep=True))
+
+
+class ProfileReport:
+    """Per step measurements of a run of a pipeline. Created by
+    :meth:`BasePipeline.process` when ``profile`` is ``True`` in ``params``.
+
+    Every record of :attr:`records` is a dictionary with:
+
+    - **step**: Name of the step
+    - **wall_time**: Elapsed time in seconds
+    - **cpu_time**: CPU time of the process in seconds while the step was executed
+    - **memory**: Change of the resident set size of the process, negative if memory
+      was released, or the peak of the memory allocated by the step if ``memory`` is
+      ``"tracemalloc"``, in bytes
+    - **shape_in** and **shape_out**: ``[rows, columns]`` of ``train_df`` and ``test_df``
+      before and after the step
+    - **added_bytes**: Memory in bytes of every dataframe or series that the step
+      added to ``params`` or replaced in ``params``
+
+    :param pipeline: Name of the pipeline
+    :type pipeline: str
+
+    :param memory: ``"rss"`` or ``"tracemalloc"``. ``tracemalloc`` is precise but slows
+                   down the pipeline and measures one step at a time, it cannot be used
+                   with steps executed concurrently.
+    :type memory: str
+
+    .. versionadded:: 1.0.5
+    """
+
+    def __init__(self, pipeline=None, memory="rss"):
+        if memory not in MEMORY_METHODS:
+            raise ValueError(
+                f"'profile_memory' should be one of {MEMORY_METHODS}. Received"
+                f" {memory}"
+            )
+        self.pipeline = pipeline
+        self.memory = memory
+        self.run_id = uuid.uuid4().hex
+        self.started_at = datetime.now(timezone.utc).isoformat()
+        self.records = []
+
+    def __repr__(self):
+        return f"ProfileReport(pipeline={self.pipeline}, steps={len(self.records)})"
+
+    @contextmanager
+    def measure(self, step, params):
+        """Context manager that records the execution of ``step`` on ``params``.
+
+        :param step: The step of the pipeline
+        :type step: callable
+
+        :param params: The parameters of the pipeline
+        :type params: dict
+        """
+        before = dict(params)
+        shape_in = _shapes(params)
+        if self.memory == "tracemalloc":
+            started_tracing = not tracemalloc.is_tracing()
+            if started_tracing:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            memory_start = tracemalloc.get_traced_memory()[0]
+        else:
+            memory_start = _current_rss()
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+            wall_time = time.perf_counter() - wall_start
+            cpu_time = time.process_time() - cpu_start
+            if self.memory == "tracemalloc":
+                memory = tracemalloc.get_traced_memory()[1] - memory_start
+            elif memory_start is not None:
+                memory = _current_rss() - memory_start
+            else:
+                memory = None
+        finally:
+            if self.memory == "tracemalloc" and started_tracing:
+                tracemalloc.stop()
+
+        added_bytes = {
+            str(k): _nbytes(v)
+            for k, v in params.items()
+            if isinstance(v, (pd.DataFrame, pd.Series))
+            and (k not in before or before[k] is not v)
+        }
+        self.records.append(
+            {
+                "step": getattr(step, "__name__", repr(step)),
+                "wall_time": wall_time,
+                "cpu_time": cpu_time,
+                "memory": memory,
+                "shape_in": shape_in,
+                "shape_out": _shapes(params),
+                "added_bytes": added_bytes,
+            }
+        )
+
+    def total(self):
+        """Returns the sum of the wall time, CPU time and added bytes of all the steps.
+
+        :rtype: dict
+        """
+        return {
+            "wall_time": sum(r["wall_time"] for r in self.records),
+            "cpu_time": sum(r["cpu_time"] for r in self.records),
+            "added_bytes": sum(
+                sum(r["added_bytes"].values()) for r in self.records
+            ),
+        }
+
+    def to_dict(self):
+        """Returns the report as a dictionary.
+
+        :rtype: dict
+        """
+        return {
+            "run_id": self.run_id,
+            "pipeline": self.pipeline,
+            "started_at": self.started_at,
+            "memory_method": self.memory,
+            "total": self.total(),
+            "steps": self.records,
+        }
+
+    def to_json(self, file_path=None):
+        """Returns the report as a ``JSON`` string and writes it to ``file_path`` if
+        provided.
+
+        :param file_path: Path where the report must be written
+        :type file_path: str
+
+        :rtype: str
+        """
+        report = json.dumps(self.to_dict(), indent=2)
+        if file_path is not None:
+            with open(file_path, "w") as f:
+                f.write(report)
+        return report
+
+    def to_jsonl(self, file_path):
+        """Appends one ``JSON`` line per step to ``file_path``. Every line holds the
+        ``run_id``, ``pipeline`` and ``started_at`` of the run so that the lines of
+        several runs can be kept in the same file.
+
+        :param file_path: Path of the file
+        :type file_path: str
+        """
+        with open(file_path, "a") as f:
+            for i, record in enumerate(self.records):
+                line = {
+                    "run_id": self.run_id,
+                    "pipeline": self.pipeline,
+                    "started_at": self.started_at,
+                    "index": i,
+                    **record,
+                }
+                f.write(json.dumps(line) + "\n")
@@ -0,0 +1,103 @@
+class Reporter:
+    """Receives the progress of :meth:`BasePipeline.process`. The methods do nothing, so
+    an instance of ``Reporter`` runs a pipeline headless: no output is printed and the
+    display libraries are never imported. Subclass it to send the progress elsewhere.
+
+    .. versionadded:: 1.0.5
+    """
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}()"
+
+    def start(self, pipeline, total=None):
+        """Called before the first step is executed.
+
+        :param pipeline: The pipeline being processed
+        :type pipeline: BasePipeline
+
+        :param total: Number of steps, ``None`` in the chunked execution mode
+        :type total: int
+        """
+
+    def step_completed(self, step):
+        """Called after every step.
+
+        :param step: The step that was executed
+        :type step: callable
+        """
+
+    def chunk_completed(self, params):
+        """Called after every chunk in the chunked execution mode.
+
+        :param params: The ``params`` of the processed chunk
+        :type params: dict
+        """
+
+    def message(self, text):
+        """Called with information about the run, like the hits of the stage cache.
+
+        :param text: The message
+        :type text: str
+        """
+
+    def finish(self, success=True):
+        """Called after the last step, or when a step raises an exception.
+
+        :param success: ``False`` if the pipeline raised an exception
+        :type success: bool
+        """
+
+
+class ConsoleReporter(Reporter):
+    """Default reporter of :meth:`BasePipeline.process`. Prints the configuration of the
+    pipeline as a table, shows a progress bar and prints the completed steps.
+
+    .. versionadded:: 1.0.5
+    """
+
+    def __init__(self):
+        self.__bar_context = None
+        self.__bar = None
+
+    def start(self, pipeline, total=None):
+        from alive_progress import alive_bar
+        from colorama import init
+
+        init()
+        pipeline.print_info()
+        title = "Pipeline Stages" if total is not None else "Pipeline Chunks"
+        self.__bar_context = alive_bar(total, title=title, enrich_print=False)
+        self.__bar = self.__bar_context.__enter__()
+        if total is not None:
+            print("\nProcessing...\n")
+        else:
+            print("\nProcessing in chunks...\n")
+
+    def step_completed(self, step):
+        import stringcase
+
+        print(
+            f"==> Completed Stage: {stringcase.sentencecase(step.__name__)}\n"
+        )
+        self.__bar()
+
+    def chunk_completed(self, params):
+        self.__bar()
+
+    def message(self, text):
+        print(text)
+
+    def finish(self, success=True):
+        from colorama import Fore
+        from colorama import Style
+
+        if self.__bar_context is not None:
+            self.__bar_context.__exit__(None, None, None)
+            self.__bar_context = None
+            self.__bar = None
+        if success:
+            print(
+                Fore.GREEN
+                + "\nPipeline Completed Successfully\n"
+                + Style.RESET_ALL
+            )
@@ -0,0 +1,179 @@
+import threading
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+from contextlib import nullcontext
+from copy import copy
+
+import pandas as pd
+
+from ..utils._parallel import resolve_n_jobs
+
+
+class DagScheduler:
+    """Executes the steps of a pipeline on a thread pool. A step waits for the earlier
+    steps that write a key it reads or writes and for the earlier steps that read a key
+    it writes. The keys of a step are declared with
+    :func:`preprocessy.utils.step_io`, steps without a declaration run alone.
+
+    Steps that are methods of a stage with ``fit`` and ``transform`` methods, like
+    ``Parser().parse_dataset`` or ``Scaler().execute``, are split into ``fit`` on
+    ``params`` followed by ``transform`` of ``train_df`` and ``test_df`` concurrently.
+    Steps and transforms of ``test_df`` share the ``n_jobs`` threads, ``test_df`` is
+    transformed after ``train_df`` on the thread of the step when no thread is free.
+
+    :param steps: The steps of the pipeline
+    :type steps: list
+
+    :param n_jobs: Number of threads. ``-1`` uses all the processors.
+    :type n_jobs: int
+
+    .. versionadded:: 1.0.5
+    """
+
+    def __init__(self, steps, n_jobs=-1):
+        self.steps = steps
+        self.n_jobs = resolve_n_jobs(n_jobs)
+
+    def __repr__(self):
+        return f"DagScheduler(n_jobs={self.n_jobs})"
+
+    def __io(self, step):
+        reads = getattr(step, "reads", None)
+        writes = getattr(step, "writes", None)
+        if reads is None or writes is None:
+            return None
+        return set(reads), set(writes)
+
+    def dependencies(self):
+        """Returns the indices of the steps that every step waits for.
+
+        :rtype: list
+        """
+        ios = [self.__io(step) for step in self.steps]
+        dependencies = []
+        for j, io_j in enumerate(ios):
+            deps = set()
+            for i in range(j):
+                io_i = ios[i]
+                if (
+                    io_i is None
+                    or io_j is None
+                    or io_i[1] & (io_j[0] | io_j[1])
+                    or io_i[0] & io_j[1]
+                ):
+                    deps.add(i)
+            dependencies.append(deps)
+        return dependencies
+
+    def __stage_of(self, step):
+        stage = getattr(step, "__self__", None)
+        if (
+            stage is not None
+            and step.__name__ not in ["fit", "transform", "partial_fit"]
+            and callable(getattr(stage, "fit", None))
+            and callable(getattr(stage, "transform", None))
+        ):
+            return stage
+        return None
+
+    def __release(self, slots, func, *args):
+        # runs func on a thread that holds one of the slots
+        try:
+            return func(*args)
+        finally:
+            slots.release()
+
+    def __run_step(self, step, params, pool, slots, measure):
+        with measure(step, params) if measure else nullcontext():
+            self.__run_branches(step, params, pool, slots)
+
+    def __run_branches(self, step, params, pool, slots):
+        stage = self.__stage_of(step)
+        test_df = params.get("test_df")
+        if (
+            stage is None
+            or not isinstance(test_df, pd.DataFrame)
+            or not isinstance(params.get("train_df"), pd.DataFrame)
+        ):
+            step(params)
+            return
+
+        stage.fit(params)
+        before = dict(params)
+        train_params = dict(before, test_df=None)
+        test_params = dict(
+            before, train_df=params["train_df"].iloc[:0], test_df=test_df
+        )
+        # the stages keep the dataframes as attributes, each branch uses its own copy
+        test_stage = copy(stage)
+        if slots.acquire(blocking=False):
+            test_branch = pool.submit(
+                self.__release, slots, test_stage.transform, test_params
+            )
+            stage.transform(train_params)
+            test_branch.result()
+        else:
+            stage.transform(train_params)
+            test_stage.transform(test_params)
+
+        for k, v in train_params.items():
+            if k == "test_df":
+                continue
+            if k not in before or before[k] is not v:
+                params[k] = v
+        for k in before:
+            if k not in train_params:
+                params.pop(k, None)
+        params["test_df"] = test_params["test_df"]
+
+    def run(self, params, on_complete=None, measure=None):
+        """Executes the steps on ``params``.
+
+        :param params: The parameters of the pipeline. Updated in place.
+        :type params: dict
+
+        :param on_complete: Called with every step once it has been executed
+        :type on_complete: callable
+
+        :param measure: Called with every step and ``params``, returns a context manager
+                        that the step is executed in. Used for profiling.
+        :type measure: callable
+        """
+        dependencies = self.dependencies()
+        done = set()
+        running = {}
+        # every task of the pool holds a slot, so a task never waits for a thread and
+        # at most n_jobs threads are started
+        slots = threading.Semaphore(self.n_jobs)
+        with ThreadPoolExecutor(self.n_jobs) as pool:
+            while len(done) < len(self.steps):
+                for i, step in enumerate(self.steps):
+                    if (
+                        i not in done
+                        and i not in running.values()
+                        and dependencies[i] <= done
+                        and slots.acquire(blocking=False)
+                    ):
+                        future = pool.submit(
+                            self.__release,
+                            slots,
+                            self.__run_step,
+                            step,
+                            params,
+                            pool,
+                            slots,
+                            measure,
+                        )
+                        running[future] = i
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    i = running.pop(future)
+                    error = future.exception()
+                    if error is not None:
+                        wait(running)
+                        raise error
+                    done.add(i)
+                    if on_complete is not None:
+                        on_complete(self.steps[i])
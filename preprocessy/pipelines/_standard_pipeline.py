@@ -28,6 +28,7 @@ class StandardPipeline(BasePipeline):
         config_file=None,
         params=None,
         custom_reader=None,
+        reporter=None,
     ):
         steps = [
             Parser().parse_dataset,
@@ -44,4 +45,5 @@ class StandardPipeline(BasePipeline):
             config_file=config_file,
             params=params,
             custom_reader=custom_reader,
+            reporter=reporter,
         )
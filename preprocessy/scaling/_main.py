@@ -1,6 +1,16 @@
+import numpy as np
 import pandas as pd
 
 from ..exceptions import ArgumentsError
+from ..utils import column_statistics
+from ..utils import read_state
+from ..utils import RunningMoments
+from ..utils import save_state
+from ..utils import step_io
+from ..utils._parallel import map_columns
+from ..utils._parallel import resolve_n_jobs
+
+COMBINED = "__combined__"
 
 
 class Scaler:
@@ -17,6 +27,9 @@ class Scaler:
         self.final_test_df = None
         self.cat_cols = None
         self.target_label = None
+        self.moments = None
+        self.statistics = None
+        self.column_jobs = 1
 
     def __repr__(self):
         return f"Scaler(type={self.type}, is_combined={self.is_combined}, threshold={self.threshold})"
@@ -100,16 +113,26 @@ class Scaler:
                 f"Expected str type for argument target_col, got {type(self.columns)}"
             )
 
+        resolve_n_jobs(self.column_jobs, "column_jobs")
+
         self.new_train_df = self.train_df
         self.new_test_df = self.test_df
 
-    def __min_max_scaler_helper(self, df):
-        new_df = df.copy()
+    def __dropped_columns(self):
         to_be_dropped_columns = list()
         if self.cat_cols is not None:
-            to_be_dropped_columns = self.cat_cols
+            to_be_dropped_columns = list(self.cat_cols)
         to_be_dropped_columns.append(self.target_label)
+        return to_be_dropped_columns
+
+    def __fit_moments(self, df, moments=None, statistics=None):
+        # statistics of the scaled columns, or of all the values when is_combined is set.
+        # The moments of the columns are read from the catalog if one is given
+        if moments is None:
+            moments = RunningMoments()
+        to_be_dropped_columns = self.__dropped_columns()
         if not self.is_combined:
+            columns = []
             for column in self.columns:
                 if column in to_be_dropped_columns:
                     continue
@@ -117,38 +140,58 @@ class Scaler:
                     raise TypeError(
                         f"Unexpected datatype of column, {type(column)}"
                     )
-                cur_col = df[column]
-                max = cur_col.max()
-                min = cur_col.min()
-                cur_col = (cur_col - min) / (max - min)
-                new_df[column] = cur_col
+                columns.append(column)
+            if statistics is not None:
+                return statistics.add(
+                    df, columns, n_jobs=self.column_jobs
+                ).column_moments(columns)
+            moments.update(df[columns])
         else:
-            temp_df = new_df.drop(columns=to_be_dropped_columns)
-            max = temp_df.to_numpy().max()
-            min = temp_df.to_numpy().min()
-            for column in self.columns:
-                if column in to_be_dropped_columns:
-                    continue
-                if not self.isNumeric(df[column]):
-                    raise TypeError(
-                        f"Unexpected datatype of column, {type(column)}"
-                    )
-                new_df[column] = (temp_df[column] - min) / (max - min)
+            temp_df = df.drop(columns=to_be_dropped_columns)
+            moments.update(
+                pd.DataFrame(
+                    {COMBINED: temp_df.to_numpy(dtype="float64").ravel()}
+                )
+            )
+        return moments
+
+    def __scale(self, df, offset, scale):
+        to_be_dropped_columns = self.__dropped_columns()
+        columns = [c for c in self.columns if c not in to_be_dropped_columns]
+        for column in columns:
+            if not self.isNumeric(df[column]):
+                raise TypeError(
+                    f"Unexpected datatype of column, {type(column)}"
+                )
+
+        def scale_block(block):
+            keys = [COMBINED if self.is_combined else c for c in block.columns]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                values = (
+                    block.to_numpy(dtype="float64")
+                    - np.array([offset[k] for k in keys], dtype="float64")
+                ) / np.array([scale[k] for k in keys], dtype="float64")
+            return pd.DataFrame(
+                values, index=block.index, columns=block.columns
+            )
+
+        new_df = df.copy()
+        if columns:
+            new_df[columns] = map_columns(
+                scale_block, df, columns, self.column_jobs, axis=1
+            )
         return new_df
 
-    def __min_max_scaler(self):
-        if self.train_df is not None:
-            self.new_train_df = self.__min_max_scaler_helper(self.train_df)
-        if self.test_df is not None:
-            self.new_test_df = self.__min_max_scaler_helper(self.test_df)
-        return self.new_train_df, self.new_test_df
+    def __min_max_scaler_helper(self, df, stats):
+        return self.__scale(
+            df,
+            stats["min"],
+            {k: stats["max"][k] - stats["min"][k] for k in stats["min"]},
+        )
 
     def __binary_scaler_helper(self, df):
         new_df = df.copy()
-        to_be_dropped_columns = list()
-        if self.cat_cols is not None:
-            to_be_dropped_columns = self.cat_cols
-        to_be_dropped_columns.append(self.target_label)
+        to_be_dropped_columns = self.__dropped_columns()
         for column in self.columns:
             if not self.isNumeric(df[column]):
                 raise TypeError(
@@ -165,53 +208,186 @@ class Scaler:
             )
         return new_df
 
-    def __binary_scaler(self):
-        if self.train_df is not None:
-            self.new_train_df = self.__binary_scaler_helper(self.train_df)
-        if self.test_df is not None:
-            self.new_test_df = self.__binary_scaler_helper(self.test_df)
-        return self.new_train_df, self.new_test_df
+    def __standard_scaler_helper(self, df, stats):
+        return self.__scale(df, stats["mean"], stats["std"])
 
-    def __standard_scaler_helper(self, df):
-        new_df = df.copy()
-        to_be_dropped_columns = list()
-        if self.cat_cols is not None:
-            to_be_dropped_columns = self.cat_cols
-        to_be_dropped_columns.append(self.target_label)
-        if not self.is_combined:
-            for column in self.columns:
-                if column in to_be_dropped_columns:
-                    continue
-                if not self.isNumeric(df[column]):
-                    raise TypeError(
-                        f"Unexpected datatype of column, {type(column)}"
-                    )
-                cur_col = df[column]
-                mean = cur_col.mean()
-                std = cur_col.std()
-                cur_col = (cur_col - mean) / std
-                new_df[column] = cur_col
+    def __read_params(self, params):
+        if "type" in params.keys():
+            self.type = params["type"]
+        if "columns" in params.keys():
+            self.columns = params["columns"]
+        if "is_combined" in params.keys():
+            self.is_combined = params["is_combined"]
+        if "train_df" in params.keys():
+            self.train_df = params["train_df"]
+        if "test_df" in params.keys():
+            self.test_df = params["test_df"]
+        if "threshold" in params.keys():
+            self.threshold = params["threshold"]
+        if "cat_cols" in params.keys():
+            self.cat_cols = params["cat_cols"]
+        if "target_label" in params.keys():
+            self.target_label = params["target_label"]
+        self.column_jobs = params.get("column_jobs", 1)
+
+    def reset(self):
+        """Discards the statistics learned by :meth:`fit` and :meth:`partial_fit`.
+
+        .. versionadded:: 1.0.5
+        """
+        self.moments = RunningMoments()
+        self.statistics = None
+
+    def fit(self, params):
+        """Learns the minimum, maximum, mean and standard deviation of the columns to be
+        scaled from the train dataframe. The learned values are used by :meth:`transform`
+        to scale both the train and test dataframes. The statistics of the columns are
+        read from the :class:`preprocessy.utils.ColumnStatistics` of ``params``. Takes the
+        same parameters as :meth:`execute`.
+
+        .. versionadded:: 1.0.5
+        """
+        self.__read_params(params)
+        self.__validate_input()
+        self.reset()
+        if self.type != "BinaryScaler":
+            self.moments = self.__fit_moments(
+                self.train_df, statistics=column_statistics(params)
+            )
+        self.get_state()
+
+    def partial_fit(self, params):
+        """Learns the minimum, maximum, mean and standard deviation of the columns to be
+        scaled from a chunk of the train dataframe. The statistics of all the chunks are
+        accumulated until :meth:`reset` is called and are used by :meth:`transform`.
+        Takes the same parameters as :meth:`execute`.
+
+        .. versionadded:: 1.0.5
+        """
+        self.__read_params(params)
+        self.__validate_input()
+        if self.moments is None:
+            self.reset()
+        self.statistics = None
+        if self.type != "BinaryScaler":
+            self.__fit_moments(self.train_df, self.moments)
+
+    def get_state(self):
+        """Returns the minimum, maximum, mean and standard deviation of every scaled column
+        learned by :meth:`fit` or :meth:`partial_fit`. If ``is_combined`` is set, the
+        statistics of all the values are stored under the ``"__combined__"`` key.
+
+        :rtype: dict
+
+        .. versionadded:: 1.0.5
+        """
+        if self.statistics is None:
+            if self.moments is None:
+                raise ValueError(
+                    "Scaler is not fitted. Please fit the scaler before calling"
+                    " transform."
+                )
+            self.statistics = {
+                "min": self.moments.min.to_dict(),
+                "max": self.moments.max.to_dict(),
+                "mean": self.moments.mean.to_dict(),
+                "std": self.moments.std().to_dict(),
+            }
+        return self.statistics
+
+    def set_state(self, state):
+        """Restores the state returned by :meth:`get_state`.
+
+        :param state: The statistics of the scaled columns
+        :type state: dict
+
+        .. versionadded:: 1.0.5
+        """
+        self.reset()
+        self.statistics = {
+            k: dict(state[k]) for k in ["min", "max", "mean", "std"]
+        }
+
+    def save_state(self, file_path):
+        """Saves the state returned by :meth:`get_state` to a ``JSON`` file.
+
+        :param file_path: Path where the state file must be created
+        :type file_path: str
+
+        .. versionadded:: 1.0.5
+        """
+        save_state(file_path, self.get_state())
+
+    def load_state(self, file_path):
+        """Restores the state saved by :meth:`save_state`.
+
+        :param file_path: Path to the state file
+        :type file_path: str
+
+        .. versionadded:: 1.0.5
+        """
+        self.set_state(read_state(file_path))
+
+    def transform(self, params):
+        """Scales the train and test dataframes using the statistics learned by
+        :meth:`fit`. Takes the same parameters as :meth:`execute`.
+
+        .. versionadded:: 1.0.5
+        """
+        self.__read_params(params)
+        self.__validate_input()
+        stats = self.get_state()
+
+        if self.type == "MinMaxScaler":
+            helper = self.__min_max_scaler_helper
+        elif self.type == "StandardScaler":
+            helper = self.__standard_scaler_helper
         else:
-            temp_df = new_df.drop(columns=to_be_dropped_columns)
-            mean = temp_df.stack().mean()
-            std = temp_df.stack().std()
-            for column in self.columns:
-                if column in to_be_dropped_columns:
-                    continue
-                if not self.isNumeric(df[column]):
-                    raise TypeError(
-                        f"Unexpected datatype of column, {type(column)}"
-                    )
-                new_df[column] = (temp_df[column] - mean) / std
-        return new_df
+            helper = None
+
+        for key in ["train_df", "test_df"]:
+            df = getattr(self, key)
+            if df is not None:
+                df = (
+                    helper(df, stats)
+                    if helper
+                    else self.__binary_scaler_helper(df)
+                )
+            if key == "train_df":
+                self.final_train_df = df
+            else:
+                self.final_test_df = df
+
+        statistics = params.get("column_statistics")
+        if statistics is not None:
+            statistics.refresh(
+                self.train_df,
+                self.final_train_df,
+                [
+                    col
+                    for col in self.train_df.columns
+                    if col not in self.columns
+                ],
+            )
 
-    def __standard_scaler(self):
-        if self.train_df is not None:
-            self.new_train_df = self.__standard_scaler_helper(self.train_df)
-        if self.test_df is not None:
-            self.new_test_df = self.__standard_scaler_helper(self.test_df)
-        return self.new_train_df, self.new_test_df
+        params["train_df"] = self.final_train_df
+        params["test_df"] = self.final_test_df
 
+    @step_io(
+        reads=[
+            "train_df",
+            "test_df",
+            "type",
+            "columns",
+            "cat_cols",
+            "target_label",
+            "is_combined",
+            "threshold",
+            "column_jobs",
+            "column_statistics",
+        ],
+        writes=["train_df", "test_df", "column_statistics"],
+    )
     def execute(self, params):
         """Method for scaling the columns in a dataset
 
@@ -241,33 +417,13 @@ class Scaler:
         :param threshold: Dictionary of threshold values where the key is the column name and the value is the threshold for that column.
         :type threshold: dict
 
+        :param column_jobs: Number of threads that blocks of columns are processed on, ``-1``
+                       uses all the processors. Defaults to ``1``.
+        :type column_jobs: int
 
+        .. versionchanged:: 1.0.5
+            Does :meth:`fit` and :meth:`transform` in a single step. ``test_df`` is scaled
+            with the statistics of ``train_df``. Added ``column_jobs``.
         """
-        if "type" in params.keys():
-            self.type = params["type"]
-        if "columns" in params.keys():
-            self.columns = params["columns"]
-        if "is_combined" in params.keys():
-            self.is_combined = params["is_combined"]
-        if "train_df" in params.keys():
-            self.train_df = params["train_df"]
-        if "test_df" in params.keys():
-            self.test_df = params["test_df"]
-        if "threshold" in params.keys():
-            self.threshold = params["threshold"]
-        if "cat_cols" in params.keys():
-            self.cat_cols = params["cat_cols"]
-        if "target_label" in params.keys():
-            self.target_label = params["target_label"]
-
-        self.__validate_input()
-
-        if self.type == "MinMaxScaler":
-            self.final_train_df, self.final_test_df = self.__min_max_scaler()
-        elif self.type == "BinaryScaler":
-            self.final_train_df, self.final_test_df = self.__binary_scaler()
-        elif self.type == "StandardScaler":
-            self.final_train_df, self.final_test_df = self.__standard_scaler()
-
-        params["train_df"] = self.final_train_df
-        params["test_df"] = self.final_test_df
+        self.fit(params)
+        self.transform(params)
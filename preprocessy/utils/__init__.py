@@ -1,3 +1,33 @@
+from ._accumulators import count_distinct
+from ._accumulators import HyperLogLog
+from ._accumulators import KLLSketch
+from ._accumulators import ReservoirSample
+from ._accumulators import RunningMoments
+from ._dates import detect_date_format
+from ._dates import expand_dates
+from ._numeric import detect_number_format
+from ._numeric import parse_numbers
+from ._state import read_state
+from ._state import save_state
+from ._statistics import column_statistics
+from ._statistics import ColumnStatistics
 from .main import num_of_samples
+from .main import step_io
 
-__all__ = [num_of_samples]
+__all__ = [
+    "column_statistics",
+    "count_distinct",
+    "detect_date_format",
+    "detect_number_format",
+    "expand_dates",
+    "num_of_samples",
+    "parse_numbers",
+    "read_state",
+    "save_state",
+    "step_io",
+    "ColumnStatistics",
+    "HyperLogLog",
+    "KLLSketch",
+    "ReservoirSample",
+    "RunningMoments",
+]
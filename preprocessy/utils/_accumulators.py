@@ -0,0 +1,315 @@
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_bool_dtype
+from pandas.api.types import is_numeric_dtype
+
+
+class RunningMoments:
+    """Mergeable count, mean, variance, minimum and maximum of the numeric columns of a
+    dataframe. The statistics of several chunks can be accumulated with :meth:`update`
+    without keeping the chunks in memory.
+    """
+
+    def __init__(self):
+        self.count = pd.Series(dtype="float64")
+        self.mean = pd.Series(dtype="float64")
+        self.m2 = pd.Series(dtype="float64")
+        self.min = pd.Series(dtype="float64")
+        self.max = pd.Series(dtype="float64")
+
+    def __repr__(self):
+        return f"RunningMoments(columns={list(self.count.index)})"
+
+    def update(self, df):
+        """Merges the statistics of the numeric dataframe ``df``."""
+        other = RunningMoments()
+        other.count = df.count().astype("float64")
+        other.mean = df.mean()
+        other.m2 = df.var(ddof=0) * other.count
+        other.min = df.min()
+        other.max = df.max()
+        self.merge(other)
+
+    def merge(self, other):
+        """Merges the statistics of the :class:`RunningMoments` ``other``."""
+        count, mean, m2 = other.count, other.mean, other.m2
+        columns = self.count.index.union(count.index, sort=False)
+
+        count_a = self.count.reindex(columns, fill_value=0.0)
+        count_b = count.reindex(columns, fill_value=0.0)
+        mean_a = self.mean.reindex(columns).fillna(0.0)
+        mean_b = mean.reindex(columns).fillna(0.0)
+        total = count_a + count_b
+        delta = mean_b - mean_a
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.mean = (mean_a + delta * count_b / total).where(total > 0)
+            self.m2 = (
+                self.m2.reindex(columns).fillna(0.0)
+                + m2.reindex(columns).fillna(0.0)
+                + delta**2 * count_a * count_b / total
+            ).where(total > 0)
+        self.count = total
+        self.min = pd.concat(
+            [self.min.reindex(columns), other.min.reindex(columns)], axis=1
+        ).min(axis=1)
+        self.max = pd.concat(
+            [self.max.reindex(columns), other.max.reindex(columns)], axis=1
+        ).max(axis=1)
+
+    def std(self, ddof=1):
+        """Returns the standard deviation of every column."""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.sqrt(self.m2 / (self.count - ddof))
+
+
+class ReservoirSample:
+    """Fixed size uniform sample of the non null values of every column of a dataframe.
+    Quantiles of columns that do not fit in memory are estimated from the sample.
+
+    :param size: Maximum number of values kept per column
+    :type size: int
+    """
+
+    def __init__(self, size=100_000):
+        self.size = size
+        self.samples = {}
+        self.seen = {}
+        self.rng = np.random.default_rng(0)
+
+    def __repr__(self):
+        return f"ReservoirSample(size={self.size})"
+
+    def update(self, df):
+        """Adds the non null values of every column of ``df`` to its sample."""
+        for col in df.columns:
+            values = df[col].dropna().to_numpy(dtype="float64")
+            sample = self.samples.get(col, np.empty(0))
+            seen = self.seen.get(col, 0)
+
+            free = self.size - sample.shape[0]
+            if free > 0:
+                sample = np.concatenate([sample, values[:free]])
+                seen += min(free, values.shape[0])
+                values = values[free:]
+
+            if values.shape[0]:
+                # Algorithm R, vectorized over the chunk
+                positions = self.rng.integers(
+                    0, seen + np.arange(1, values.shape[0] + 1)
+                )
+                keep = positions < self.size
+                sample[positions[keep]] = values[keep]
+                seen += values.shape[0]
+
+            self.samples[col] = sample
+            self.seen[col] = seen
+
+    def quantile(self, col, q):
+        """Returns the estimated ``q`` quantile of column ``col``."""
+        sample = self.samples.get(col)
+        if sample is None or sample.shape[0] == 0:
+            return np.nan
+        return float(np.quantile(sample, q))
+
+
+class KLLSketch:
+    """Mergeable estimate of the quantiles of the non null values of a numeric column, in
+    the memory of a few thousand values whatever the number of rows. Values are kept in
+    levels, a value of level ``h`` standing for ``2 ** h`` values of the column. A level
+    that is full is sorted and every other value is moved to the next level, starting
+    at a random offset.
+
+    The rank of an estimated quantile is off by less than ``error`` times the number of
+    values, with a high probability. Sketches of several chunks or partitions of a
+    column are combined with :meth:`merge`. Quantiles are exact as long as the column
+    has fewer values than a level holds.
+
+    :param error: Relative error on the rank of the estimated quantiles, between 0 and 1
+    :type error: float
+
+    .. versionadded:: 1.0.5
+    """
+
+    def __init__(self, error=0.01):
+        if (
+            not isinstance(error, float)
+            or not 0 < error < 1
+            or isinstance(error, bool)
+        ):
+            raise ValueError(
+                f"'error' should be a float between 0 and 1. Received {error}"
+            )
+        self.error = error
+        # capacity of the top level
+        self.k = max(8, int(np.ceil(2.0 / error)))
+        self.levels = [np.empty(0)]
+        self.count = 0
+        self.rng = np.random.default_rng(0)
+
+    def __repr__(self):
+        return f"KLLSketch(error={self.error})"
+
+    def __capacity(self, level):
+        # levels below the top one hold geometrically fewer values
+        depth = len(self.levels) - 1 - level
+        return max(2, int(np.ceil(self.k * (2 / 3) ** depth)))
+
+    def __compress(self):
+        while True:
+            full = [
+                h
+                for h, values in enumerate(self.levels)
+                if values.shape[0] > self.__capacity(h)
+            ]
+            if len(full) == 0:
+                return
+            h = full[0]
+            if h + 1 == len(self.levels):
+                self.levels.append(np.empty(0))
+            values = np.sort(self.levels[h])
+            # an odd value stays on its level
+            odd = values.shape[0] % 2
+            offset = self.rng.integers(2)
+            self.levels[h + 1] = np.concatenate(
+                [self.levels[h + 1], values[odd + offset :: 2]]
+            )
+            self.levels[h] = values[:odd]
+
+    def update(self, column):
+        """Adds the non null values of the numeric series ``column``."""
+        values = column.dropna().to_numpy(dtype="float64")
+        if values.shape[0] == 0:
+            return
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self.count += values.shape[0]
+        self.__compress()
+
+    def merge(self, other):
+        """Adds the values summarized by the :class:`KLLSketch` ``other``."""
+        for h, values in enumerate(other.levels):
+            if h == len(self.levels):
+                self.levels.append(np.empty(0))
+            self.levels[h] = np.concatenate([self.levels[h], values])
+        self.count += other.count
+        self.__compress()
+
+    def quantile(self, q):
+        """Returns the estimated ``q`` quantile, ``NaN`` if no value was added."""
+        if self.count == 0:
+            return np.nan
+        if len(self.levels) == 1:
+            # no value was compacted, the quantile is exact
+            return float(np.quantile(self.levels[0], q))
+        values = np.concatenate(self.levels)
+        weights = np.concatenate(
+            [np.full(v.shape[0], 2.0**h) for h, v in enumerate(self.levels)]
+        )
+        order = np.argsort(values, kind="stable")
+        ranks = np.cumsum(weights[order])
+        i = np.searchsorted(ranks, q * ranks[-1], side="left")
+        return float(values[order][min(i, values.shape[0] - 1)])
+
+
+def _hash_values(column):
+    # 64 bit hashes of the non null values, integers and floats of the same value hash
+    # the same so that chunks with different dtypes can be merged
+    column = column.dropna()
+    if is_numeric_dtype(column) and not is_bool_dtype(column):
+        values = column.to_numpy(dtype="float64")
+    else:
+        values = np.asarray(column, dtype=object)
+    return pd.util.hash_array(values, categorize=False)
+
+
+class HyperLogLog:
+    """Mergeable estimate of the number of distinct non null values of a column, kept in
+    ``2 ** precision`` registers of one byte. The relative standard error of the estimate
+    is about ``1.04 / sqrt(2 ** precision)``, 0.8% with the default precision, and the
+    memory does not grow with the number of distinct values.
+
+    :param precision: Number of bits of the hash that select a register, between 4 and 18
+    :type precision: int
+
+    .. versionadded:: 1.0.5
+    """
+
+    def __init__(self, precision=14):
+        if not isinstance(precision, int) or not 4 <= precision <= 18:
+            raise ValueError(
+                f"'precision' should be an integer between 4 and 18. Received {precision}"
+            )
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def __repr__(self):
+        return f"HyperLogLog(precision={self.precision})"
+
+    def update(self, column):
+        """Adds the non null values of the series ``column``."""
+        hashes = _hash_values(column)
+        if hashes.shape[0] == 0:
+            return
+        index = (hashes >> np.uint64(64 - self.precision)).astype(np.intp)
+        rest = hashes << np.uint64(self.precision)
+        # rank of the first set bit of the remaining bits, frexp is exact on the top 53
+        # bits of the hash
+        _, exponent = np.frexp((rest >> np.uint64(11)).astype(np.float64))
+        rank = np.where(
+            rest >> np.uint64(11) > 0, 54 - exponent, 65 - self.precision
+        ).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def merge(self, other):
+        """Adds the values counted by the :class:`HyperLogLog` ``other``."""
+        if other.precision != self.precision:
+            raise ValueError(
+                f"Cannot merge a HyperLogLog of precision {other.precision} into one of precision {self.precision}"
+            )
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def count(self):
+        """Returns the estimated number of distinct values."""
+        m = self.registers.shape[0]
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = (
+            alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(int)))
+        )
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros > 0:
+            # linear counting is more accurate for small cardinalities
+            estimate = m * np.log(m / zeros)
+        return int(round(estimate))
+
+
+# number of rows added to the sketch between two checks of the limit
+DISTINCT_BLOCK_ROWS = 1 << 16
+
+
+def count_distinct(column, limit=None, approximate=False):
+    """Returns the number of distinct non null values of ``column``. If ``approximate`` is
+    ``True``, the number is estimated with a :class:`HyperLogLog` that reads the column in
+    blocks and stops as soon as the estimate reaches ``limit``, so columns with many
+    distinct values are not read to the end. The returned number is then at least
+    ``limit`` but can be lower than the exact number.
+
+    :param column: The column
+    :type column: pandas.core.series.Series
+
+    :param limit: Number of distinct values after which counting can stop
+    :type limit: float
+
+    :param approximate: Estimate the number instead of counting exactly
+    :type approximate: bool
+
+    :rtype: int
+
+    .. versionadded:: 1.0.5
+    """
+    if not approximate:
+        return column.nunique()
+    sketch = HyperLogLog()
+    for start in range(0, column.shape[0], DISTINCT_BLOCK_ROWS):
+        sketch.update(column.iloc[start : start + DISTINCT_BLOCK_ROWS])
+        if limit is not None and sketch.count() >= limit:
+            break
+    return sketch.count()
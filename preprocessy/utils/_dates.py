@@ -0,0 +1,142 @@
+import re
+import warnings
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_datetime64_any_dtype
+from pandas.api.types import is_string_dtype
+from pandas.tseries.api import guess_datetime_format
+
+# number of non null values of a column that its format is detected from
+DATE_SAMPLE_ROWS = 1000
+# number of distinct values of the sample that formats are guessed from
+DATE_GUESS_VALUES = 20
+DATE_PARTS = ["Year", "Month", "DayOfWeek", "Epoch"]
+
+# formats that parsed a sample, by the layout of its values
+_FORMATS = {}
+_MAX_FORMATS = 256
+_DIGITS = re.compile(r"\d+")
+_LETTERS = re.compile(r"[^\W\d_]+")
+
+
+def _layout(value):
+    # "3/12/2016" and "13/12/2016" have the same layout, "0/0/0"
+    return _LETTERS.sub("a", _DIGITS.sub("0", value.strip()))
+
+
+def _is_date_format(date_format):
+    return (
+        date_format is not None
+        and ("%Y" in date_format or "%y" in date_format)
+        and any(d in date_format for d in ["%m", "%b", "%B"])
+        and "%d" in date_format
+    )
+
+
+def _parses(sample, date_format):
+    dates = pd.to_datetime(sample, format=date_format, errors="coerce")
+    return bool(dates.notna().all())
+
+
+def detect_date_format(column, sample_rows=DATE_SAMPLE_ROWS):
+    """Returns the format of a column of dates such as ``"3/12/2016"`` or
+    ``"2016-12-03 10:30:00"``, detected from its first ``sample_rows`` non null values.
+    Returns ``None`` if the sampled values do not have the same layout or if a sampled
+    value cannot be parsed with the format. A format must have a day, a month and a year.
+
+    Formats are guessed from a few values of the sample, month first and then day first,
+    and the first format that parses the whole sample is returned. The formats are cached
+    by the layout of the values, so that other columns and datasets with the same layout
+    are not guessed again.
+
+    :param column: The column
+    :type column: pandas.core.series.Series
+
+    :param sample_rows: Number of values that the format is detected from
+    :type sample_rows: int
+
+    :return: The ``strftime`` format of the dates, or ``None``
+    :rtype: str
+
+    .. versionadded:: 1.0.5
+    """
+    if not is_string_dtype(column):
+        return None
+    sample = column.dropna().head(sample_rows)
+    if sample.shape[0] == 0 or not all(type(v) is str for v in sample):
+        return None
+    layouts = {_layout(v) for v in sample}
+    if len(layouts) != 1:
+        return None
+    layout = layouts.pop()
+    if "0" not in layout:
+        return None
+
+    cached = _FORMATS.get(layout, [])
+    for date_format in cached:
+        if _parses(sample, date_format):
+            return date_format
+
+    candidates = []
+    with warnings.catch_warnings():
+        # the guesses warn when the day comes first
+        warnings.simplefilter("ignore", UserWarning)
+        for value in sample.drop_duplicates().head(DATE_GUESS_VALUES):
+            for dayfirst in [False, True]:
+                date_format = guess_datetime_format(value, dayfirst=dayfirst)
+                if (
+                    _is_date_format(date_format)
+                    and date_format not in candidates
+                    and date_format not in cached
+                ):
+                    candidates.append(date_format)
+    for date_format in candidates:
+        if _parses(sample, date_format):
+            if len(_FORMATS) >= _MAX_FORMATS:
+                _FORMATS.clear()
+            _FORMATS[layout] = [date_format] + [
+                f for f in cached if f != date_format
+            ]
+            return date_format
+    return None
+
+
+def expand_dates(column, date_format=None):
+    """Converts a column of dates to the numeric columns ``<name>Year``, ``<name>Month``,
+    ``<name>DayOfWeek`` and ``<name>Epoch``, the seconds since 1970-01-01 UTC. The strings
+    are parsed with ``date_format`` in a single call to ``pandas.to_datetime``. Values that
+    are not dates become ``NaN``.
+
+    :param column: The column of strings or of ``datetime64`` values
+    :type column: pandas.core.series.Series
+
+    :param date_format: The format returned by :func:`detect_date_format`. Not required
+                        for ``datetime64`` columns.
+    :type date_format: str
+
+    :rtype: pandas.core.frames.DataFrame
+
+    .. versionadded:: 1.0.5
+    """
+    if is_datetime64_any_dtype(column):
+        dates = column
+    else:
+        dates = pd.to_datetime(column, format=date_format, errors="coerce")
+    if dates.dt.tz is not None:
+        dates = dates.dt.tz_convert("UTC").dt.tz_localize(None)
+
+    values = dates.to_numpy(dtype="datetime64[ns]")
+    missing = np.isnat(values)
+    epoch = values.astype("int64") / 1e9
+    epoch[missing] = np.nan
+    name = str(column.name)
+    return pd.DataFrame(
+        {
+            name + "Year": dates.dt.year,
+            name + "Month": dates.dt.month,
+            name + "DayOfWeek": dates.dt.dayofweek,
+            name + "Epoch": epoch,
+        },
+        index=column.index,
+    )
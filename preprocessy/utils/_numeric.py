@@ -0,0 +1,178 @@
+import re
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_numeric_dtype
+
+CURRENCY_SYMBOLS = "$€£¥₹"
+GROUP_SEPARATORS = " '\u00a0"
+# number of non null values of a column that its format is detected from
+NUMBER_SAMPLE_ROWS = 1000
+# format of the states saved before the formats were detected
+DEFAULT_NUMBER_FORMAT = {"currency": "$", "thousands": ",", "decimal": "."}
+
+_BODY = re.compile(r"^\d(?:[\d,. '\u00a0]*\d)?$")
+
+
+def _split(value):
+    # returns the currency symbols and the digits and separators of a formatted number
+    value = value.strip()
+    if value.startswith("(") and value.endswith(")"):
+        value = value[1:-1]
+    currencies = {c for c in value if c in CURRENCY_SYMBOLS}
+    for c in currencies:
+        value = value.replace(c, "")
+    value = value.strip().lstrip("+-").strip()
+    if not _BODY.match(value):
+        return None
+    return currencies, value
+
+
+def detect_number_format(column, sample_rows=NUMBER_SAMPLE_ROWS):
+    """Returns the format of a column of formatted numbers such as ``"$1,234.50"``,
+    ``"1.234,50 €"`` or ``"(1 234)"``, detected from its first ``sample_rows`` non null
+    values. Returns ``None`` if a sampled value is not a number, or if no sampled value
+    has a currency symbol, a thousands separator or a decimal comma.
+
+    A separator that is followed by a different one, or that occurs several times in a
+    value, separates thousands. A single ``,`` followed by three digits separates
+    thousands and a single ``.`` is a decimal point, unless the other values tell
+    otherwise.
+
+    :param column: The column
+    :type column: pandas.core.series.Series
+
+    :param sample_rows: Number of values that the format is detected from
+    :type sample_rows: int
+
+    :return: The ``currency`` symbol, ``thousands`` separator and ``decimal`` mark, or
+             ``None``
+    :rtype: dict
+
+    .. versionadded:: 1.0.5
+    """
+    if is_numeric_dtype(column):
+        return None
+    sample = column.dropna().head(sample_rows)
+    if sample.shape[0] == 0:
+        return None
+
+    currencies = set()
+    thousands = set()
+    decimals = set()
+    ambiguous = set()
+    for value in sample:
+        if type(value) is not str:
+            return None
+        split = _split(value)
+        if split is None:
+            return None
+        symbols, body = split
+        currencies |= symbols
+        separators = list(dict.fromkeys(c for c in body if not c.isdigit()))
+        if len(separators) > 2:
+            return None
+        if len(separators) == 2:
+            first, last = separators
+            if body.count(last) != 1 or body.rfind(last) < body.rfind(first):
+                return None
+            thousands.add(first)
+            decimals.add(last)
+        elif len(separators) == 1:
+            separator = separators[0]
+            if body.count(separator) > 1 or separator in GROUP_SEPARATORS:
+                thousands.add(separator)
+            elif len(body) - body.rfind(separator) - 1 != 3:
+                decimals.add(separator)
+            else:
+                ambiguous.add(separator)
+
+    if len(currencies) > 1 or len(thousands) > 1 or len(decimals) > 1:
+        return None
+    thousand = thousands.pop() if thousands else None
+    decimal = decimals.pop() if decimals else None
+    for separator in sorted(ambiguous):
+        if separator in (thousand, decimal):
+            continue
+        if thousand is None and (decimal is not None or separator == ","):
+            thousand = separator
+        elif decimal is None:
+            decimal = separator
+        else:
+            return None
+    if thousand is not None and thousand == decimal:
+        return None
+    if decimal is not None and decimal in GROUP_SEPARATORS:
+        return None
+
+    currency = currencies.pop() if currencies else None
+    if currency is None and thousand is None and decimal in (None, "."):
+        # plain numbers, the column is not formatted
+        return None
+    return {
+        "currency": currency,
+        "thousands": thousand,
+        "decimal": decimal or ".",
+    }
+
+
+def parse_numbers(column, number_format):
+    """Converts a column of formatted numbers to floats with the format returned by
+    :func:`detect_number_format`. The currency symbols, thousands separators and spaces
+    are removed from the whole column at once, numbers in parentheses are negative and
+    values that are not numbers become ``NaN``. The strings are processed by ``pyarrow``
+    compute kernels if ``pyarrow`` is installed.
+
+    :param column: The column
+    :type column: pandas.core.series.Series
+
+    :param number_format: The format of the numbers
+    :type number_format: dict
+
+    :rtype: pandas.core.series.Series
+
+    .. versionadded:: 1.0.5
+    """
+    if is_numeric_dtype(column):
+        return column.astype("float64")
+    removed = [" ", "\u00a0", "(", ")"]
+    for key in ["currency", "thousands"]:
+        if number_format.get(key) and number_format[key] not in removed:
+            removed.append(number_format[key])
+    decimal = number_format.get("decimal") or "."
+
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+    except ImportError:
+        text = column.astype("str").where(column.notna())
+        negative = text.str.startswith("(").fillna(False).to_numpy(dtype=bool)
+        for c in removed:
+            text = text.str.replace(c, "", regex=False)
+        if decimal != ".":
+            text = text.str.replace(decimal, ".", regex=False)
+        numbers = pd.to_numeric(text, errors="coerce").to_numpy(dtype="float64")
+    else:
+        try:
+            strings = pa.array(column, type=pa.string(), from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            # values that are not strings
+            text = column.astype("str").where(column.notna())
+            strings = pa.array(text, type=pa.string(), from_pandas=True)
+        negative = pc.starts_with(strings, "(").fill_null(False)
+        negative = negative.to_numpy(zero_copy_only=False)
+        for c in removed:
+            strings = pc.replace_substring(strings, c, "")
+        if decimal != ".":
+            strings = pc.replace_substring(strings, decimal, ".")
+        try:
+            numbers = pc.cast(strings, pa.float64()).to_numpy(
+                zero_copy_only=False
+            )
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+            # a value is not a number
+            numbers = pd.to_numeric(
+                strings.to_pandas(), errors="coerce"
+            ).to_numpy(dtype="float64")
+    numbers = np.where(negative, -numbers, numbers)
+    return pd.Series(numbers, index=column.index, name=column.name)
@@ -0,0 +1,62 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+
+def resolve_n_jobs(n_jobs, name="n_jobs"):
+    """Returns the number of threads of ``n_jobs``, ``-1`` being the number of
+    processors. ``name`` is the parameter reported in the error.
+
+    :raises ValueError: If ``n_jobs`` is not a positive int or ``-1``
+    """
+    if (
+        not isinstance(n_jobs, int)
+        or isinstance(n_jobs, bool)
+        or n_jobs == 0
+        or n_jobs < -1
+    ):
+        raise ValueError(
+            f"'{name}' should be a positive int or -1. Received {n_jobs}"
+        )
+    return (os.cpu_count() or 1) if n_jobs == -1 else n_jobs
+
+
+def map_columns(func, df, columns=None, n_jobs=1, axis=0):
+    """Splits ``columns`` of ``df`` into one block per thread, calls ``func`` with the
+    dataframe of every block on a thread pool and assembles the results in one step.
+    NumPy and most pandas reductions release the GIL, so the blocks of a wide dataframe
+    are processed on several processors. With a single thread, ``func`` is called once
+    with all the columns.
+
+    The results of the blocks are concatenated along ``axis`` if they are series or
+    dataframes, with ``axis=0`` for summaries indexed by column and ``axis=1`` for
+    blocks of transformed columns, and merged if they are dictionaries.
+
+    :param func: Function called with the dataframe of a block
+    :type func: callable
+
+    :param df: The dataframe
+    :type df: pandas.core.frames.DataFrame
+
+    :param columns: Columns to process. Defaults to all the columns.
+    :type columns: list
+
+    :param n_jobs: Number of threads, ``-1`` uses all the processors
+    :type n_jobs: int
+
+    :param axis: Axis that series and dataframes are concatenated along
+    :type axis: int
+    """
+    columns = list(df.columns) if columns is None else list(columns)
+    n_jobs = min(resolve_n_jobs(n_jobs), len(columns))
+    if n_jobs <= 1:
+        return func(df[columns])
+
+    size = -(-len(columns) // n_jobs)
+    blocks = [columns[i : i + size] for i in range(0, len(columns), size)]
+    with ThreadPoolExecutor(n_jobs) as pool:
+        results = list(pool.map(lambda block: func(df[block]), blocks))
+    if isinstance(results[0], dict):
+        return {k: v for result in results for k, v in result.items()}
+    return pd.concat(results, axis=axis)
@@ -0,0 +1,59 @@
+import json
+import os.path
+
+import numpy as np
+
+
+def _to_json(value):
+    if isinstance(value, dict):
+        if all(isinstance(k, str) for k in value.keys()):
+            return {k: _to_json(v) for k, v in value.items()}
+        # JSON objects only allow str keys, so the items are stored as pairs
+        return {
+            "__items__": [[_to_json(k), _to_json(v)] for k, v in value.items()]
+        }
+    if isinstance(value, (list, tuple, set)):
+        return [_to_json(v) for v in value]
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _from_json(value):
+    if isinstance(value, dict):
+        if list(value.keys()) == ["__items__"]:
+            return {_from_json(k): _from_json(v) for k, v in value["__items__"]}
+        return {k: _from_json(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_from_json(v) for v in value]
+    return value
+
+
+def save_state(file_path, state):
+    """Saves the state learned by a stage of the pipeline to a ``JSON`` file.
+
+    :param file_path: Path where the state file must be created
+    :type file_path: str
+
+    :param state: The state returned by the ``get_state`` method of the stage
+    :type state: dict
+    """
+    with open(file_path, "w") as f:
+        json.dump(_to_json(state), f, indent=2)
+
+
+def read_state(file_path):
+    """Reads a state file created by :func:`save_state`.
+
+    :param file_path: Path to the state file
+    :type file_path: str
+
+    :return: The state that can be passed to the ``set_state`` method of the stage
+    :rtype: dict
+    """
+    if not (os.path.exists(file_path) and os.path.isfile(file_path)):
+        raise FileNotFoundError(
+            f"Please make sure you provide a valid state file that exists at {file_path}"
+        )
+    with open(file_path) as f:
+        return _from_json(json.load(f))
@@ -0,0 +1,310 @@
+import weakref
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_numeric_dtype
+from pandas.api.types import is_string_dtype
+
+from ._accumulators import count_distinct
+from ._accumulators import RunningMoments
+from ._parallel import map_columns
+
+
+class ColumnStatistics:
+    """Catalog of the statistics of the columns of a dataframe, shared by the stages of a
+    pipeline through ``params["column_statistics"]``. The statistics of a column are
+    computed the first time a stage asks for them and are reused by the next stages, so
+    that a column is read once instead of once per stage:
+
+    - **nulls**: Number of null values of every column
+    - **moments**: :class:`RunningMoments` of the numeric columns, with their count, mean,
+      variance, minimum and maximum
+    - **quantiles**: Quantiles of the columns that were asked for with :meth:`quantile`,
+      computed exactly from the column
+    - **samples**: If ``sample_rows`` is provided, sorted non null values of the numeric
+      columns that their quantiles are computed from instead. Columns with more than
+      ``sample_rows`` rows are summarized by a uniform sample of ``sample_rows`` rows, so
+      their quantiles are approximate.
+    - **distinct**: Number of distinct values of the columns that were asked for. If
+      ``approximate`` is ``True``, they are estimated by :func:`count_distinct`, which stops
+      counting once a column has more distinct values than 20% of the rows.
+
+    The catalog belongs to a single dataframe. It is emptied when it is used with another
+    dataframe, and the statistics of a column are discarded if its dtype changed. Stages
+    that modify the dataframe in place or return a new one update the catalog with
+    :meth:`discard` and :meth:`refresh`.
+
+    :param approximate: Estimate the number of distinct values instead of counting them
+    :type approximate: bool
+
+    :param sample_rows: Number of rows that the quantiles of a column are estimated from.
+                        Defaults to ``None``, the quantiles are exact.
+    :type sample_rows: int
+
+    .. versionadded:: 1.0.5
+    """
+
+    def __init__(self, approximate=False, sample_rows=None):
+        if sample_rows is not None and (
+            not isinstance(sample_rows, int)
+            or isinstance(sample_rows, bool)
+            or sample_rows < 1
+        ):
+            raise ValueError(
+                f"'quantile_sample_rows' should be a positive integer. Received {sample_rows}"
+            )
+        self.approximate = approximate
+        self.sample_rows = sample_rows
+        self.clear()
+
+    def __repr__(self):
+        return (
+            f"ColumnStatistics(rows={self.rows}, columns={list(self.dtypes)})"
+        )
+
+    def __getstate__(self):
+        # the statistics belong to a dataframe that is not pickled with the catalog, so
+        # only the options are pickled and a restored catalog is empty
+        return {
+            "approximate": self.approximate,
+            "sample_rows": self.sample_rows,
+        }
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def clear(self):
+        """Discards the statistics of all the columns."""
+        self.__frame = None
+        self.rows = None
+        self.dtypes = {}
+        self.nulls = {}
+        self.distinct = {}
+        self.quantiles = {}
+        self.samples = {}
+        self.moments = RunningMoments()
+
+    def discard(self, columns):
+        """Discards the statistics of ``columns``."""
+        columns = [c for c in columns if c in self.dtypes]
+        if len(columns) == 0:
+            return
+        for col in columns:
+            self.dtypes.pop(col, None)
+            self.nulls.pop(col, None)
+            self.distinct.pop(col, None)
+            self.quantiles.pop(col, None)
+            self.samples.pop(col, None)
+        for name in ["count", "mean", "m2", "min", "max"]:
+            series = getattr(self.moments, name)
+            setattr(self.moments, name, series.drop(columns, errors="ignore"))
+
+    def __bind(self, df):
+        frame = self.__frame() if self.__frame is not None else None
+        if frame is not df or self.rows != df.shape[0]:
+            self.clear()
+            self.__frame = weakref.ref(df)
+            self.rows = df.shape[0]
+            return
+        self.discard(
+            [
+                col
+                for col, dtype in self.dtypes.items()
+                if col not in df or str(df[col].dtype) != dtype
+            ]
+        )
+
+    def __sample(self, df):
+        # sorted non null values of the numeric columns of df
+        if df.shape[0] > self.sample_rows:
+            rng = np.random.default_rng(0)
+            rows = rng.choice(df.shape[0], self.sample_rows, replace=False)
+            df = df.iloc[np.sort(rows)]
+        # null values are sorted to the end of every column
+        values = np.sort(df.to_numpy(dtype="float64"), axis=0)
+        return {
+            df.columns[i]: values[:count, i].copy()
+            for i, count in enumerate(df.count().to_numpy())
+        }
+
+    def __summarize(self, block, distinct):
+        # one row of statistics for every column of a block, computed on one thread
+        summary = pd.DataFrame(index=block.columns)
+        summary["dtype"] = [str(dtype) for dtype in block.dtypes]
+        summary["nulls"] = block.isna().sum()
+        numeric = [
+            col for col in block.columns if block[col].dtype.kind in "iuf"
+        ]
+        if numeric:
+            moments = RunningMoments()
+            moments.update(block[numeric])
+            for name in ["count", "mean", "m2", "min", "max"]:
+                summary[name] = getattr(moments, name)
+            if self.sample_rows is not None:
+                summary["sample"] = pd.Series(self.__sample(block[numeric]))
+        # the threshold of the categorical columns
+        limit = 0.2 * self.rows
+        summary["distinct"] = pd.Series(
+            {
+                col: count_distinct(block[col], limit, self.approximate)
+                for col in block.columns
+                if col in distinct
+                and (
+                    is_numeric_dtype(block[col]) or is_string_dtype(block[col])
+                )
+            },
+            dtype="float64",
+        )
+        return summary
+
+    def add(self, df, columns=None, distinct=None, n_jobs=1):
+        """Computes the statistics of the columns of ``df`` that are not in the catalog yet.
+        The null values, moments and samples of all the new columns are computed together,
+        with one reduction of the dataframe each. Quantiles are computed by
+        :meth:`quantile`. With several threads, the columns are
+        split into blocks that are summarized concurrently.
+
+        :param df: The dataframe
+        :type df: pandas.core.frames.DataFrame
+
+        :param columns: Columns whose statistics are required. Defaults to all the columns.
+        :type columns: list
+
+        :param distinct: Columns whose distinct values are counted as well
+        :type distinct: list
+
+        :param n_jobs: Number of threads, ``-1`` uses all the processors
+        :type n_jobs: int
+
+        :return: The catalog
+        :rtype: ColumnStatistics
+        """
+        self.__bind(df)
+        if columns is None:
+            columns = list(df.columns)
+        distinct = {col for col in distinct or [] if col not in self.distinct}
+        new = [
+            col
+            for col in dict.fromkeys(list(columns) + list(distinct))
+            if col not in self.dtypes or col in distinct
+        ]
+        if len(new) == 0:
+            return self
+
+        summary = map_columns(
+            lambda block: self.__summarize(block, distinct), df, new, n_jobs
+        )
+        for col, row in summary.iterrows():
+            if not pd.isna(row["distinct"]):
+                self.distinct[col] = int(row["distinct"])
+            if col in self.dtypes:
+                # only the distinct values were missing
+                continue
+            self.dtypes[col] = row["dtype"]
+            self.nulls[col] = int(row["nulls"])
+        summary = summary[~summary.index.isin(self.moments.count.index)]
+        if "count" in summary:
+            numeric = summary[summary["count"].notna()]
+            other = RunningMoments()
+            for name in ["count", "mean", "m2", "min", "max"]:
+                setattr(other, name, numeric[name].astype("float64"))
+            self.moments.merge(other)
+            if "sample" in numeric:
+                self.samples.update(numeric["sample"].to_dict())
+        return self
+
+    def refresh(self, source, df, unchanged):
+        """Moves the catalog from the dataframe ``source`` to ``df``, the dataframe that a
+        stage returned for it. If ``df`` has the same number of rows, only the statistics
+        of the ``unchanged`` columns are kept. Otherwise rows were removed and all the
+        statistics are discarded. Nothing is done if the catalog does not belong to
+        ``source``.
+
+        :param source: The dataframe given to the stage
+        :type source: pandas.core.frames.DataFrame
+
+        :param df: The dataframe returned by the stage
+        :type df: pandas.core.frames.DataFrame
+
+        :param unchanged: Columns that the stage did not modify
+        :type unchanged: list
+        """
+        frame = self.__frame() if self.__frame is not None else None
+        if frame is not source or df is None:
+            return
+        if self.rows != df.shape[0]:
+            self.clear()
+            return
+        unchanged = set(unchanged)
+        self.discard(
+            [
+                col
+                for col in self.dtypes
+                if col not in unchanged or col not in df
+            ]
+        )
+        self.__frame = weakref.ref(df)
+
+    def null_counts(self, df):
+        """Returns the number of null values of the columns of ``df`` in the catalog. The
+        result is empty if the catalog belongs to another dataframe.
+
+        :rtype: dict
+        """
+        frame = self.__frame() if self.__frame is not None else None
+        if frame is not df or self.rows != df.shape[0]:
+            return {}
+        return {
+            col: nulls
+            for col, nulls in self.nulls.items()
+            if col in df and str(df[col].dtype) == self.dtypes[col]
+        }
+
+    def column_moments(self, columns):
+        """Returns the :class:`RunningMoments` of the numeric ``columns``."""
+        moments = RunningMoments()
+        for name in ["count", "mean", "m2", "min", "max"]:
+            setattr(moments, name, getattr(self.moments, name).reindex(columns))
+        return moments
+
+    def quantile(self, col, q):
+        """Returns the ``q`` quantile of the numeric column ``col`` of the dataframe of the
+        catalog, interpolated linearly like ``pandas.Series.quantile``. The quantile is
+        computed from all the values of the column the first time it is asked for, or from
+        the sample of the column if ``sample_rows`` is provided."""
+        sample = self.samples.get(col)
+        if sample is not None:
+            if sample.shape[0] == 0:
+                return np.nan
+            if q == 0.5:
+                return float(np.median(sample))
+            return float(np.quantile(sample, q))
+
+        frame = self.__frame() if self.__frame is not None else None
+        if frame is None or col not in self.dtypes:
+            return np.nan
+        quantiles = self.quantiles.setdefault(col, {})
+        if q not in quantiles:
+            quantiles[q] = float(frame[col].quantile(q))
+        return quantiles[q]
+
+
+def column_statistics(params):
+    """Returns the :class:`ColumnStatistics` of ``params``. A new catalog is inserted into
+    ``params`` as ``column_statistics`` if there is none, with the ``approximate_distinct``
+    and ``quantile_sample_rows`` of ``params``.
+
+    :param params: The parameters of a stage
+    :type params: dict
+
+    :rtype: ColumnStatistics
+
+    .. versionadded:: 1.0.5
+    """
+    statistics = params.get("column_statistics")
+    if statistics is None:
+        statistics = params["column_statistics"] = ColumnStatistics(
+            approximate=params.get("approximate_distinct", False) is True,
+            sample_rows=params.get("quantile_sample_rows"),
+        )
+    return statistics
@@ -1,3 +1,26 @@
 def num_of_samples(X):
     if hasattr(X, "__len__"):
         return len(X)
+
+
+def step_io(reads=None, writes=None):
+    """Decorator that declares the ``params`` keys read and written by a step of a
+    pipeline. When ``n_jobs`` is provided, the pipeline runs steps that do not depend
+    on each other concurrently. Steps without a declaration are never run concurrently
+    with another step.
+
+    :param reads: Keys of ``params`` read by the step
+    :type reads: list
+
+    :param writes: Keys of ``params`` written or modified in place by the step
+    :type writes: list
+
+    .. versionadded:: 1.0.5
+    """
+
+    def decorate(func):
+        func.reads = frozenset(reads or [])
+        func.writes = frozenset(writes or [])
+        return func
+
+    return decorate
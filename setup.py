@@ -36,4 +36,8 @@ setup(
         # add contents from requirements.txt only
         # "sample_package>=version_number"
     ],
+    extras_require={
+        "arrow": ["pyarrow>=10.0.0"],
+        "zstd": ["zstandard>=0.15.0"],
+    },
 )
@@ -1,9 +1,33 @@
+import json
+import subprocess
+import sys
+import threading
+import time
+
 import numpy as np
 import pandas as pd
 import pytest
+from preprocessy.data_splitting import Split
+from preprocessy.encoding import Encoder
 from preprocessy.exceptions import ArgumentsError
+from preprocessy.missing_data import NullValuesHandler
+from preprocessy.outliers import HandleOutlier
+from preprocessy.output import Writer
+from preprocessy.parse import Parser
 from preprocessy.pipelines import BasePipeline
+from preprocessy.pipelines import DagScheduler
+from preprocessy.pipelines import Reporter
+from preprocessy.pipelines import load_pipeline
+from preprocessy.scaling import Scaler
 from preprocessy.utils import num_of_samples
+from preprocessy.utils import step_io
+
+melb = pd.read_csv("datasets/handling_null_values/melb_data.csv")
+titanic = pd.read_csv("datasets/titanic.csv")
+capitals = pd.read_csv("datasets/encoding/test2.csv")
+numeric = pd.DataFrame(
+    np.random.default_rng(0).normal(size=(100, 5)), columns=list("ABCDE")
+).assign(T=np.arange(100) % 2)
 
 
 def custom_read(params):
@@ -14,6 +38,17 @@ def custom_read(params):
     params["train_df_copy"] = params["train_df"].copy()
 
 
+def copy_frames(params, **extra):
+    # the stages are given copies of the module dataframes
+    return {
+        **{
+            k: v.copy() if isinstance(v, pd.DataFrame) else v
+            for k, v in params.items()
+        },
+        **extra,
+    }
+
+
 def times_two(params):
     params["train_df"][params["col_1"]] *= 2
 
@@ -300,3 +335,667 @@ def test_config():
 
     assert "X_train" not in pipeline.get_params()
     assert "train_df_copy" not in pipeline.get_params()
+
+
+def test_process_chunks():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        {
+            "A": rng.normal(size=500),
+            "B": rng.choice(["x", "y", "z"], 500),
+            "C": rng.integers(0, 1000, 500).astype(float),
+            "T": rng.integers(0, 2, 500),
+        }
+    )
+    df.loc[::7, "A"] = np.nan
+    df.to_csv("./datasets/configs/dataset.csv", index=False)
+    params = {
+        "target_label": "T",
+        "fill_missing": {"mean": ["A"]},
+        "columns": ["A", "C"],
+    }
+
+    def run(chunksize):
+        steps = [
+            Parser().parse_dataset,
+            NullValuesHandler().execute,
+            Encoder().encode,
+            HandleOutlier().handle_outliers,
+            Scaler().execute,
+        ]
+        pipeline = BasePipeline(
+            train_df_path="./datasets/configs/dataset.csv",
+            steps=steps,
+            params={**params, "chunksize": chunksize},
+        )
+        return pd.concat(
+            [chunk["train_df"] for chunk in pipeline.process_chunks()]
+        )
+
+    whole = run(1000)
+    chunked = run(64)
+    assert whole.shape[0] < df.shape[0]
+    assert whole["A"].isnull().sum() == 0
+    pd.testing.assert_frame_equal(whole, chunked)
+
+
+def test_process_chunks_custom_reader():
+    params = {"col_1": "A", "chunksize": 10}
+    pipeline = BasePipeline(
+        train_df_path="./datasets/configs/dataset.csv",
+        steps=[times_two],
+        params=params,
+        custom_reader=custom_read,
+    )
+    with pytest.raises(ArgumentsError):
+        pipeline.process()
+
+
+def test_export(tmp_path):
+    rng = np.random.default_rng(0)
+
+    def dataset(n):
+        return pd.DataFrame(
+            {
+                "A": rng.normal(size=n),
+                "B": rng.choice(["x", "y", "z"], n),
+                "C": rng.integers(0, 1000, n).astype(float),
+                "T": rng.integers(0, 2, n),
+            }
+        )
+
+    train, test = dataset(500), dataset(100)
+    train.loc[::7, "A"] = np.nan
+    test.loc[::5, "A"] = np.nan
+    train.to_csv(tmp_path / "train.csv", index=False)
+    test.to_csv(tmp_path / "test.csv", index=False)
+    pipeline = BasePipeline(
+        train_df_path=str(tmp_path / "train.csv"),
+        test_df_path=str(tmp_path / "test.csv"),
+        steps=[
+            Parser().parse_dataset,
+            NullValuesHandler().execute,
+            Encoder().encode,
+            HandleOutlier().handle_outliers,
+            Scaler().execute,
+        ],
+        params={
+            "target_label": "T",
+            "fill_missing": {"mean": ["A"]},
+            "columns": ["A", "C"],
+            "remove_outliers": False,
+            "replace": True,
+        },
+    )
+    with pytest.raises(ValueError):
+        pipeline.export(tmp_path / "pipeline.bin")
+    pipeline.process()
+    pipeline.export(tmp_path / "pipeline.bin")
+
+    fitted = load_pipeline(tmp_path / "pipeline.bin")
+    assert [name for name, _ in fitted.stages] == [
+        "Parser",
+        "NullValuesHandler",
+        "Encoder",
+        "HandleOutlier",
+        "Scaler",
+    ]
+    expected = pipeline.get_params()["test_df"].drop(columns=["T"])
+    for start in range(0, 100, 25):
+        batch = test.iloc[start : start + 25].drop(columns=["T"])
+        pd.testing.assert_frame_equal(
+            fitted.transform(batch), expected.iloc[start : start + 25]
+        )
+
+
+def test_load_pipeline_invalid(tmp_path):
+    with pytest.raises(ValueError):
+        load_pipeline("./datasets/configs/dataset.csv")
+
+
+def test_stage_cache(tmp_path):
+    pytest.importorskip("pyarrow")
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        {
+            "A": rng.normal(size=500),
+            "B": rng.choice(["x", "y", "z"], 500),
+            "T": rng.integers(0, 2, 500),
+        }
+    )
+    df.loc[::7, "A"] = np.nan
+    df.to_csv(tmp_path / "train.csv", index=False)
+
+    def run(test_size, cache_size=2**30):
+        pipeline = BasePipeline(
+            train_df_path=str(tmp_path / "train.csv"),
+            steps=[
+                Parser().parse_dataset,
+                NullValuesHandler().execute,
+                Encoder().encode,
+                split,
+            ],
+            params={
+                "target_label": "T",
+                "fill_missing": {"mean": ["A"]},
+                "test_size": test_size,
+                "cache_dir": str(tmp_path / "cache"),
+                "cache_size": cache_size,
+            },
+        )
+        pipeline.process()
+        return pipeline
+
+    first = run(0.2)
+    assert (first.cache.hits, first.cache.misses) == (0, 5)
+    second = run(0.2)
+    assert (second.cache.hits, second.cache.misses) == (5, 0)
+    for key in ["train_df", "X_train", "X_test"]:
+        pd.testing.assert_frame_equal(
+            first.get_params()[key], second.get_params()[key]
+        )
+    assert first.get_params()["cat_cols"] == second.get_params()["cat_cols"]
+
+    third = run(0.5)
+    assert (third.cache.hits, third.cache.misses) == (4, 1)
+    assert third.get_params()["X_test"].shape[0] == 250
+
+    evicted = run(0.3, cache_size=1)
+    info = evicted.cache.info()
+    assert info["entries"] == 0 and info["size"] == 0
+
+
+def test_stage_cache_invalid(tmp_path):
+    pytest.importorskip("pyarrow")
+    pipeline = BasePipeline(
+        train_df_path="./datasets/configs/dataset.csv",
+        steps=[times_two],
+        params={"col_1": "A", "cache_dir": str(tmp_path), "cache_size": 0},
+        custom_reader=custom_read,
+    )
+    with pytest.raises(ValueError):
+        pipeline.process()
+
+
+def test_dag_scheduler():
+    barrier = threading.Barrier(2, timeout=10)
+
+    @step_io(reads=["A"], writes=["B"])
+    def first(params):
+        barrier.wait()
+        params["B"] = params["A"] + 1
+
+    @step_io(reads=["A"], writes=["C"])
+    def second(params):
+        barrier.wait()
+        params["C"] = params["A"] + 2
+
+    @step_io(reads=["B", "C"], writes=["D"])
+    def third(params):
+        params["D"] = params["B"] + params["C"]
+
+    def undeclared(params):
+        params["E"] = params["D"]
+
+    steps = [first, second, third, undeclared]
+    scheduler = DagScheduler(steps, n_jobs=2)
+    assert scheduler.dependencies() == [set(), set(), {0, 1}, {0, 1, 2}]
+    params = {"A": 1}
+    scheduler.run(params)
+    assert params == {"A": 1, "B": 2, "C": 3, "D": 5, "E": 5}
+
+
+def test_dag_scheduler_stages(tmp_path, monkeypatch):
+    chain = [
+        Parser().parse_dataset,
+        NullValuesHandler().execute,
+        Encoder().encode,
+        HandleOutlier().handle_outliers,
+        Scaler().execute,
+        Split().train_test_split,
+    ]
+    assert DagScheduler(chain).dependencies() == [
+        set(range(i)) for i in range(len(chain))
+    ]
+
+    # the writer reads the split arrays only, it runs while the scaler works on the
+    # dataframes
+    barrier = threading.Barrier(2, timeout=10)
+    fit, write_file = Scaler.fit, Writer.write_file
+
+    def waiting_fit(self, params):
+        barrier.wait()
+        fit(self, params)
+
+    def waiting_write_file(self, params):
+        barrier.wait()
+        write_file(self, params)
+
+    monkeypatch.setattr(Scaler, "fit", waiting_fit)
+    monkeypatch.setattr(
+        Writer,
+        "write_file",
+        step_io(write_file.reads, write_file.writes)(waiting_write_file),
+    )
+    steps = [Split().train_test_split, Writer().write_file, Scaler().execute]
+    scheduler = DagScheduler(steps, n_jobs=2)
+    assert scheduler.dependencies() == [set(), {0}, {0}]
+
+    df = pd.DataFrame({"A": np.arange(100.0), "T": np.arange(100) % 2})
+    params = {
+        "train_df": df,
+        "target_label": "T",
+        "columns": ["A"],
+        "test_size": 0.2,
+        "output_dir": str(tmp_path),
+    }
+    scheduler.run(params)
+    assert len(params["output_files"]) > 0
+    assert abs(params["train_df"]["A"].mean()) < 1e-9
+
+
+class ThreadStage:
+    """Stage that records the threads it runs on and writes ``key``."""
+
+    key = None
+
+    def __init__(self, threads):
+        self.threads = threads
+
+    def fit(self, params):
+        self.threads.add(threading.get_ident())
+
+    def transform(self, params):
+        self.threads.add(threading.get_ident())
+        time.sleep(0.05)
+        params[self.key] = params.get(self.key, 0) + 1
+
+
+def thread_stage(key, threads):
+    def execute(self, params):
+        self.fit(params)
+        self.transform(params)
+
+    # the steps write different keys and run concurrently
+    cls = type(
+        f"Stage{key}",
+        (ThreadStage,),
+        {"key": key, "execute": step_io(reads=[], writes=[key])(execute)},
+    )
+    return cls(threads)
+
+
+@pytest.mark.parametrize("n_jobs", [1, 2, 3])
+def test_dag_scheduler_threads(n_jobs):
+    threads = set()
+    keys = ["A", "B", "C", "D"]
+    steps = [thread_stage(key, threads).execute for key in keys]
+    scheduler = DagScheduler(steps, n_jobs=n_jobs)
+    assert scheduler.dependencies() == [set()] * len(keys)
+    params = {"train_df": pd.DataFrame({"X": [1]}), "test_df": pd.DataFrame()}
+    scheduler.run(params)
+    # the transforms of test_df share the threads of the steps
+    assert len(threads) <= n_jobs
+    # the keys written by the train transform are kept
+    assert all(params[key] == 1 for key in keys)
+
+
+@pytest.mark.parametrize("n_jobs", [0, -2, 1.5, True])
+def test_dag_scheduler_invalid(n_jobs):
+    with pytest.raises(ValueError):
+        DagScheduler([times_two], n_jobs=n_jobs)
+
+
+@pytest.mark.parametrize(
+    "stage, method, params",
+    [
+        (Parser, "parse_dataset", {"train_df": melb, "target_label": "Price"}),
+        (
+            NullValuesHandler,
+            "execute",
+            {
+                "train_df": titanic,
+                "test_df": titanic,
+                "cat_cols": ["Pclass", "Sex", "Parch", "Embarked"],
+                "drop_cols": ["PassengerId", "Name", "Ticket", "Cabin"],
+                "fill_missing": {"mean": ["Age"], "median": ["Fare"]},
+            },
+        ),
+        (
+            HandleOutlier,
+            "handle_outliers",
+            {
+                "train_df": capitals,
+                "test_df": capitals,
+                "cat_cols": ["Capitals", "Other Capitals"],
+                "remove_outliers": True,
+                "replace": False,
+            },
+        ),
+        (
+            HandleOutlier,
+            "handle_outliers",
+            {
+                "train_df": capitals,
+                "test_df": capitals,
+                "cat_cols": ["Capitals", "Other Capitals"],
+                "remove_outliers": False,
+                "replace": True,
+            },
+        ),
+        (
+            Scaler,
+            "execute",
+            {
+                "train_df": numeric,
+                "test_df": numeric,
+                "type": "MinMaxScaler",
+                "columns": list("ABCDE"),
+                "target_label": "T",
+            },
+        ),
+        (
+            Scaler,
+            "execute",
+            {
+                "train_df": numeric,
+                "test_df": numeric,
+                "type": "StandardScaler",
+                "columns": list("ABCDE"),
+                "target_label": "T",
+            },
+        ),
+    ],
+)
+@pytest.mark.parametrize("column_jobs", [2, 3, -1])
+def test_column_jobs(stage, method, params, column_jobs):
+    serial = copy_frames(params)
+    parallel = copy_frames(params, column_jobs=column_jobs)
+    getattr(stage(), method)(serial)
+    getattr(stage(), method)(parallel)
+    for key in ["train_df", "test_df"]:
+        if key in serial:
+            pd.testing.assert_frame_equal(parallel[key], serial[key])
+    assert parallel.get("cat_cols") == serial.get("cat_cols")
+    statistics = serial["column_statistics"]
+    assert parallel["column_statistics"].distinct == statistics.distinct
+    assert parallel["column_statistics"].nulls == statistics.nulls
+
+    with pytest.raises(ValueError):
+        getattr(stage(), method)(copy_frames(params, column_jobs=0))
+
+
+def test_process_n_jobs(tmp_path, monkeypatch):
+    from preprocessy.pipelines import _base
+
+    schedulers = []
+
+    class RecordingScheduler(DagScheduler):
+        def __init__(self, *args, **kwargs):
+            schedulers.append(self)
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(_base, "DagScheduler", RecordingScheduler)
+    rng = np.random.default_rng(0)
+
+    def dataset(n):
+        return pd.DataFrame(
+            {
+                "A": rng.normal(size=n),
+                "B": rng.choice(["x", "y", "z"], n),
+                "C": rng.integers(0, 1000, n).astype(float),
+                "T": rng.integers(0, 2, n),
+            }
+        )
+
+    train, test = dataset(500), dataset(200)
+    train.loc[::7, "A"] = np.nan
+    test.loc[::5, "A"] = np.nan
+    train.to_csv(tmp_path / "train.csv", index=False)
+    test.to_csv(tmp_path / "test.csv", index=False)
+
+    def run(extra):
+        pipeline = BasePipeline(
+            train_df_path=str(tmp_path / "train.csv"),
+            test_df_path=str(tmp_path / "test.csv"),
+            steps=[
+                Parser().parse_dataset,
+                NullValuesHandler().execute,
+                Encoder().encode,
+                HandleOutlier().handle_outliers,
+                Scaler().execute,
+            ],
+            params={
+                "target_label": "T",
+                "fill_missing": {"mean": ["A"]},
+                "columns": ["A", "C"],
+                **extra,
+            },
+        )
+        pipeline.process()
+        return pipeline.get_params()
+
+    sequential = run({})
+    parallel = run({"n_jobs": 4})
+    assert len(schedulers) == 1
+    # the threads of the stages do not execute the pipeline on the scheduler
+    columns = run({"column_jobs": 4})
+    assert len(schedulers) == 1
+    for result in [parallel, columns]:
+        for key in ["train_df", "test_df"]:
+            pd.testing.assert_frame_equal(sequential[key], result[key])
+        assert sequential["cat_cols"] == result["cat_cols"]
+
+
+@pytest.mark.parametrize("memory", ["rss", "tracemalloc"])
+@pytest.mark.parametrize("n_jobs", [None, 2])
+def test_profile(tmp_path, memory, n_jobs):
+    df = pd.DataFrame({"A": np.arange(100.0), "B": np.arange(100.0)})
+    df.to_csv(tmp_path / "train.csv", index=False)
+    params = {
+        "col_1": "A",
+        "test_size": 0.2,
+        "profile": True,
+        "profile_memory": memory,
+    }
+    if n_jobs:
+        params["n_jobs"] = n_jobs
+    pipeline = BasePipeline(
+        train_df_path=str(tmp_path / "train.csv"),
+        steps=[times_two, split],
+        params=params,
+        custom_reader=custom_read,
+    )
+    if n_jobs and memory == "tracemalloc":
+        # concurrent steps would share the counters of tracemalloc
+        with pytest.raises(ValueError):
+            pipeline.process()
+        return
+    report = pipeline.process()
+    assert report is pipeline.report
+    assert [r["step"] for r in report.records] == [
+        "custom_read",
+        "times_two",
+        "split",
+    ]
+    read, double, splitting = report.records
+    assert read["shape_in"] == {}
+    assert read["shape_out"] == {"train_df": [100, 2]}
+    assert set(read["added_bytes"]) == {"train_df", "train_df_copy"}
+    assert double["added_bytes"] == {}
+    assert set(splitting["added_bytes"]) == {"X_train", "X_test"}
+    assert all(
+        r["wall_time"] >= 0 and r["cpu_time"] >= 0 for r in report.records
+    )
+    if memory == "tracemalloc":
+        assert all(r["memory"] >= 0 for r in report.records)
+    else:
+        assert all(isinstance(r["memory"], int) for r in report.records)
+
+    report.to_jsonl(tmp_path / "profile.jsonl")
+    report.to_jsonl(tmp_path / "profile.jsonl")
+    with open(tmp_path / "profile.jsonl") as f:
+        lines = [json.loads(line) for line in f]
+    assert len(lines) == 6 and lines[0]["run_id"] == report.run_id
+    assert json.loads(report.to_json())["total"] == report.total()
+
+
+@pytest.mark.skipif(
+    not sys.platform.startswith("linux"), reason="reads /proc/self/statm"
+)
+def test_profile_rss(tmp_path):
+    df = pd.DataFrame({"A": np.arange(100.0)})
+    df.to_csv(tmp_path / "train.csv", index=False)
+    size = 1 << 26
+
+    def peak(params):
+        np.ones(4 * size, dtype=np.uint8)
+
+    def kept(params):
+        params["kept"] = np.ones(size, dtype=np.uint8)
+
+    pipeline = BasePipeline(
+        train_df_path=str(tmp_path / "train.csv"),
+        steps=[peak, kept],
+        params={"profile": True},
+        custom_reader=custom_read,
+    )
+    report = pipeline.process()
+    _, first, second = report.records
+    # the memory kept by a step is reported even when the peak of the process is
+    # higher
+    assert abs(first["memory"]) < size // 2
+    assert second["memory"] > size // 2
+
+
+def test_profile_invalid_memory():
+    pipeline = BasePipeline(
+        train_df_path="./datasets/configs/dataset.csv",
+        steps=[times_two],
+        params={"col_1": "A", "profile": True, "profile_memory": "psutil"},
+        custom_reader=custom_read,
+    )
+    with pytest.raises(ValueError):
+        pipeline.process()
+
+
+class RecordingReporter(Reporter):
+    def __init__(self):
+        self.events = []
+
+    def start(self, pipeline, total=None):
+        self.events.append(("start", total))
+
+    def step_completed(self, step):
+        self.events.append(("step", step.__name__))
+
+    def chunk_completed(self, params):
+        self.events.append(("chunk", len(params["train_df"])))
+
+    def finish(self, success=True):
+        self.events.append(("finish", success))
+
+
+def test_headless(tmp_path, capsys):
+    df = pd.DataFrame({"A": np.arange(10.0), "B": np.arange(10.0)})
+    df.to_csv(tmp_path / "train.csv", index=False)
+    pipeline = BasePipeline(
+        train_df_path=str(tmp_path / "train.csv"),
+        steps=[times_two, split],
+        params={"col_1": "A", "test_size": 0.2, "headless": True},
+        custom_reader=custom_read,
+    )
+    pipeline.process()
+    assert capsys.readouterr().out == ""
+    assert pipeline.get_params()["X_train"]["A"].tolist() == list(
+        np.arange(2.0, 10.0) * 2
+    )
+
+
+def test_headless_lazy_imports(tmp_path):
+    pd.DataFrame({"A": [1.0, 2.0]}).to_csv(tmp_path / "train.csv", index=False)
+    code = f"""
+import sys
+from preprocessy.pipelines import BasePipeline
+
+def times_two(params):
+    params["train_df"]["A"] *= 2
+
+BasePipeline(
+    train_df_path={str(tmp_path / "train.csv")!r},
+    steps=[times_two],
+    params={{"headless": True}},
+).process()
+display = ["alive_progress", "colorama", "prettytable", "stringcase"]
+print(",".join(m for m in display if m in sys.modules))
+"""
+    out = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    assert out.strip() == ""
+
+
+def test_lazy_imports():
+    code = """
+import sys
+import preprocessy
+from preprocessy.pipelines import StandardPipeline
+assert "preprocessy.pipelines._feature_selection_pipeline" not in sys.modules
+assert "sklearn" not in sys.modules
+assert preprocessy.pipelines.FittedPipeline.__name__ == "FittedPipeline"
+"""
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_reporter(tmp_path):
+    df = pd.DataFrame({"A": np.arange(10.0), "B": np.arange(10.0)})
+    df.to_csv(tmp_path / "train.csv", index=False)
+    reporter = RecordingReporter()
+    pipeline = BasePipeline(
+        train_df_path=str(tmp_path / "train.csv"),
+        steps=[times_two, split],
+        params={"col_1": "A", "test_size": 0.2},
+        custom_reader=custom_read,
+        reporter=reporter,
+    )
+    pipeline.process()
+    assert reporter.events == [
+        ("start", 3),
+        ("step", "custom_read"),
+        ("step", "times_two"),
+        ("step", "split"),
+        ("finish", True),
+    ]
+
+    reporter.events = []
+    pipeline = BasePipeline(
+        train_df_path=str(tmp_path / "train.csv"),
+        steps=[times_two],
+        params={"col_1": "A", "chunksize": 4},
+        reporter=reporter,
+    )
+    pipeline.process()
+    assert reporter.events == [
+        ("start", None),
+        ("chunk", 4),
+        ("chunk", 4),
+        ("chunk", 2),
+        ("finish", True),
+    ]
+
+    reporter.events = []
+    pipeline.set_params({"test_size": 0.2})
+    pipeline.steps = [times_two]
+    with pytest.raises(KeyError):
+        pipeline.process()
+    assert reporter.events[-1] == ("finish", False)
+
+
+def test_reporter_invalid():
+    with pytest.raises(TypeError):
+        BasePipeline(
+            train_df_path="./datasets/configs/dataset.csv",
+            steps=[times_two],
+            params={"col_1": "A"},
+            reporter=print,
+        )
@@ -128,3 +128,80 @@ def test_parser():
     encoder = Encoder()
     encoder.encode(params=params)
     assert "B" in params["cat_cols"]
+
+
+def test_fit_transform_state(tmp_path):
+    train_df = pd.DataFrame({"A": ["x", "y", "x", "z"], "T": [0, 1, 0, 1]})
+    test_df = pd.DataFrame({"A": ["z", "w", "x"], "T": [0, 1, 1]})
+    params = {
+        "train_df": train_df,
+        "test_df": test_df,
+        "target_label": "T",
+        "cat_cols": ["A"],
+    }
+    encoder = Encoder()
+    encoder.encode(params)
+    assert params["test_df"]["AEncoded"].tolist() == [2, -1, 0]
+
+    encoder.save_state(tmp_path / "state.json")
+    loaded = Encoder()
+    loaded.load_state(tmp_path / "state.json")
+    params = {"train_df": test_df, "target_label": "T", "cat_cols": ["A"]}
+    loaded.transform(params)
+    assert params["train_df"]["AEncoded"].tolist() == [2, -1, 0]
+    assert params["cat_cols"] == ["A", "AEncoded"]
+
+
+def test_categorical_dtype():
+    train_df = pd.DataFrame(
+        {"A": pd.Categorical(["x", "y", "x", "z"]), "T": [0, 1, 0, 1]}
+    )
+    test_df = pd.DataFrame(
+        {"A": pd.Categorical(["z", "w", "x"]), "T": [0, 1, 1]}
+    )
+    params = {
+        "train_df": train_df,
+        "test_df": test_df,
+        "target_label": "T",
+        "cat_cols": ["A"],
+    }
+    Encoder().encode(params)
+    assert params["test_df"]["AEncoded"].tolist() == [2, -1, 0]
+
+
+def test_distinct_counts():
+    train_df = pd.DataFrame({"A": [1, 2] * 10, "B": range(20), "T": [0] * 20})
+    params = {"train_df": train_df.copy(), "target_label": "T"}
+    Encoder().encode(params)
+    assert params["cat_cols"] == ["A", "AEncoded"]
+
+    # the counts of the Parser are used for the same rows
+    params = {
+        "train_df": train_df.copy(),
+        "target_label": "T",
+        "distinct_counts": {"rows": 20, "counts": {"A": 10, "B": 2}},
+    }
+    Encoder().encode(params)
+    assert params["cat_cols"] == ["B", "BEncoded"]
+
+    params = {
+        "train_df": train_df.copy(),
+        "target_label": "T",
+        "distinct_counts": {"rows": 30, "counts": {"A": 10, "B": 2}},
+        "approximate_distinct": True,
+    }
+    Encoder().encode(params)
+    assert params["cat_cols"] == ["A", "AEncoded"]
+
+
+def test_number_formats():
+    train_df = pd.DataFrame({"A": ["1.234,5 €", "2,5 €"] * 10, "T": range(20)})
+    test_df = pd.DataFrame({"A": ["3,5 €"], "T": [0]})
+    params = {"train_df": train_df, "test_df": test_df, "target_label": "T"}
+    encoder = Encoder()
+    encoder.encode(params)
+    assert params["train_df"]["A"].tolist()[:2] == [1234.5, 2.5]
+    assert params["test_df"]["A"].tolist() == [3.5]
+    assert encoder.get_state()["number_formats"] == {
+        "A": {"currency": "€", "thousands": ".", "decimal": ","}
+    }
@@ -10,7 +10,8 @@ reader = Reader()
     [
         {"train_df_path": None},
         {"train_df_path": None, "test_df_path": None},
-        {"train_df_path": ["datasets/encoding/test.csv"]},
+        {"train_df_path": ["datasets/encoding/test.csv", None]},
+        {"train_df_path": ("datasets/encoding/test.csv", 1)},
     ],
 )
 def test_incorrect_file_name_type(test_input):
@@ -42,3 +43,592 @@ def test_reader(test_input):
 def test_file_not_exists():
     with pytest.raises(FileNotFoundError):
         reader.read_file({"train_df_path": "hello.csv"})
+
+
+def test_read_chunks():
+    chunks = list(reader.read_chunks("datasets/encoding/test.csv", 2))
+    assert [chunk.shape for chunk in chunks] == [(2, 5), (1, 5)]
+
+
+@pytest.mark.parametrize(
+    "chunksize, error", [("2", TypeError), (0, ValueError)]
+)
+def test_incorrect_chunksize(chunksize, error):
+    with pytest.raises(error):
+        next(reader.read_chunks("datasets/encoding/test.csv", chunksize))
+
+
+def columnar_df():
+    return pd.DataFrame(
+        {
+            "A": [1.0, 2.0, 3.0, 4.0],
+            "B": ["w", "x", "y", "z"],
+            "C": [10, 20, 30, 40],
+        }
+    )
+
+
+def write_columnar(df, file_path):
+    import pyarrow as pa
+    import pyarrow.feather as feather
+
+    if file_path.suffix in [".parquet", ".pq"]:
+        df.to_parquet(file_path)
+    elif file_path.suffix == ".feather":
+        df.to_feather(file_path)
+    else:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        feather.write_feather(table, str(file_path), compression="uncompressed")
+
+
+@pytest.mark.parametrize("extension", ["parquet", "pq", "feather", "arrow"])
+@pytest.mark.parametrize("memory_map", [False, True])
+def test_read_columnar(tmp_path, extension, memory_map):
+    pytest.importorskip("pyarrow")
+    file_path = tmp_path / f"train.{extension}"
+    write_columnar(columnar_df(), file_path)
+
+    params = {"train_df_path": str(file_path), "memory_map": memory_map}
+    Reader().read_file(params)
+    pd.testing.assert_frame_equal(params["train_df"], columnar_df())
+
+    params = {
+        "train_df_path": str(file_path),
+        "test_df_path": str(file_path),
+        "read_columns": ["C", "A"],
+        "read_filters": [("C", ">", 15), ("B", "!=", "z")],
+        "memory_map": memory_map,
+    }
+    Reader().read_file(params)
+    for key in ["train_df", "test_df"]:
+        assert params[key].columns.tolist() == ["C", "A"]
+        assert params[key]["A"].tolist() == [2.0, 3.0]
+
+
+def test_read_columns_csv():
+    params = {
+        "train_df_path": "datasets/encoding/test.csv",
+        "read_columns": ["Price"],
+    }
+    Reader().read_file(params)
+    assert params["train_df"].columns.tolist() == ["Price"]
+
+
+@pytest.mark.parametrize(
+    "params, error",
+    [
+        ({"read_columns": "Price"}, TypeError),
+        ({"read_filters": ("Price", ">", 1)}, TypeError),
+        ({"memory_map": "yes"}, TypeError),
+        ({"read_filters": [("Price", ">", 1)]}, ValueError),
+    ],
+)
+def test_read_invalid_options(params, error):
+    params["train_df_path"] = "datasets/encoding/test.csv"
+    with pytest.raises(error):
+        Reader().read_file(params)
+
+
+def test_read_columnar_not_exists(tmp_path):
+    pytest.importorskip("pyarrow")
+    with pytest.raises(FileNotFoundError):
+        Reader().read_file({"train_df_path": str(tmp_path / "hello.parquet")})
+
+
+def test_optimize_dtypes(tmp_path):
+    pd.DataFrame(
+        {
+            "small": list(range(12)),
+            "large": list(range(11)) + [100000],
+            "float": [i + 0.5 for i in range(12)],
+            "late": [f"{i}.0" for i in range(11)] + ["x"],
+            "cat": ["a"] * 11 + ["b"],
+            "price": ["$1,000"] + ["$2"] * 11,
+            "euro": ["2 €"] * 11 + ["1.000 €"],
+            "name": ["Roe, Jim"] * 11 + ["Doe, Jane"],
+        }
+    ).to_csv(tmp_path / "train.csv", index=False)
+    pd.DataFrame({"small": [1000], "large": [1], "float": [1.0]}).to_csv(
+        tmp_path / "test.csv", index=False
+    )
+    params = {
+        "train_df_path": str(tmp_path / "train.csv"),
+        "test_df_path": str(tmp_path / "test.csv"),
+        "optimize_dtypes": True,
+        "dtype_sample_size": 10,
+    }
+    Reader().read_file(params)
+    assert params["schema"] == {
+        "small": "int16",
+        "large": "int32",
+        "float": "float32",
+        "late": "object",
+        "cat": "category",
+        "price": "object",
+        "euro": "object",
+        "name": "category",
+    }
+    assert params["train_df"]["large"].tolist()[-1] == 100000
+    assert params["train_df"]["late"].tolist()[-1] == "x"
+    assert params["test_df"]["small"].dtype == "int16"
+    assert params["test_df"]["small"].tolist() == [1000]
+
+
+@pytest.mark.parametrize(
+    "params, error",
+    [
+        ({"optimize_dtypes": "yes"}, TypeError),
+        ({"optimize_dtypes": True, "dtype_sample_size": 0}, ValueError),
+    ],
+)
+def test_optimize_dtypes_invalid(params, error):
+    params["train_df_path"] = "datasets/encoding/test.csv"
+    with pytest.raises(error):
+        Reader().read_file(params)
+
+
+def write_shards(tmp_path):
+    paths = []
+    for i in range(4):
+        path = tmp_path / f"day_{i}.csv"
+        pd.DataFrame(
+            {
+                "day": [i] * 10,
+                "city": ["c0"] * 9 + [f"c{i}"],
+                "x": [1.0] * 10,
+            }
+        ).to_csv(path, index=False)
+        paths.append(str(path))
+    return paths
+
+
+def test_read_shards_start_method(tmp_path, monkeypatch):
+    from preprocessy.input import _read
+
+    paths = write_shards(tmp_path)
+    methods = []
+
+    class RecordingExecutor(_read.ProcessPoolExecutor):
+        def __init__(self, *args, mp_context=None, **kwargs):
+            methods.append(mp_context.get_start_method())
+            super().__init__(*args, mp_context=mp_context, **kwargs)
+
+    monkeypatch.setattr(_read, "ProcessPoolExecutor", RecordingExecutor)
+    # the test shards are read on a worker thread
+    params = {
+        "train_df_path": paths[:2],
+        "test_df_path": paths[2:],
+        "read_workers": 2,
+    }
+    Reader().read_file(params)
+    assert params["test_df"]["day"].tolist() == [2] * 10 + [3] * 10
+    assert len(methods) == 2 and "fork" not in methods
+
+
+@pytest.mark.parametrize("read_workers", [None, 1, 2])
+def test_read_shards(tmp_path, read_workers):
+    paths = write_shards(tmp_path)
+    params = {
+        "train_df_path": str(tmp_path / "day_*.csv"),
+        "test_df_path": paths[::-1],
+        "read_workers": read_workers,
+        "optimize_dtypes": True,
+        "dtype_sample_size": 100,
+    }
+    Reader().read_file(params)
+    train_df, test_df = params["train_df"], params["test_df"]
+    assert train_df["day"].tolist() == [0] * 10 + [1] * 10 + [2] * 10 + [3] * 10
+    assert test_df["day"].tolist() == [3] * 10 + [2] * 10 + [1] * 10 + [0] * 10
+    assert train_df.index.tolist() == list(range(40))
+    assert train_df["city"].dtype == "category"
+    assert train_df["city"].tolist()[10:20] == ["c0"] * 9 + ["c1"]
+    assert params["schema"]["day"] == "int8"
+
+
+def test_read_chunks_shards(tmp_path):
+    paths = write_shards(tmp_path)
+    chunks = list(Reader().read_chunks(paths[:2], 4))
+    assert [chunk.shape for chunk in chunks] == [(4, 3), (4, 3), (2, 3)] * 2
+
+
+@pytest.mark.parametrize(
+    "params, error",
+    [
+        ({"train_df_path": []}, ValueError),
+        (
+            {"train_df_path": "datasets/encoding/missing_*.csv"},
+            FileNotFoundError,
+        ),
+        (
+            {"train_df_path": "datasets/encoding/test.csv", "read_workers": 0},
+            ValueError,
+        ),
+    ],
+)
+def test_read_shards_invalid(params, error):
+    with pytest.raises(error):
+        Reader().read_file(params)
+
+
+@pytest.mark.parametrize("delimiter", [",", ";", "\t", "|"])
+def test_sniff_delimiter(tmp_path, delimiter):
+    df = pd.DataFrame({"A": [1, 2, 3], "B": ["x", "y", "z"]})
+    df.to_csv(tmp_path / "train.csv", sep=delimiter, index=False)
+    params = {"train_df_path": str(tmp_path / "train.csv")}
+    Reader().read_file(params)
+    pd.testing.assert_frame_equal(params["train_df"], df)
+
+    chunks = list(Reader().read_chunks(str(tmp_path / "train.csv"), 2))
+    assert chunks[0].columns.tolist() == ["A", "B"]
+
+
+def test_delimiter(tmp_path):
+    with open(tmp_path / "train.csv", "w") as f:
+        f.write("A;B\n1,5;2\n")
+    params = {"train_df_path": str(tmp_path / "train.csv"), "delimiter": ";"}
+    Reader().read_file(params)
+    assert params["train_df"].to_dict("list") == {"A": ["1,5"], "B": [2]}
+
+
+def test_csv_engine():
+    pytest.importorskip("pyarrow")
+    params = {"train_df_path": "datasets/handling_null_values/melb_data.csv"}
+    Reader().read_file(params)
+    arrow = {
+        "train_df_path": "datasets/handling_null_values/melb_data.csv",
+        "csv_engine": "pyarrow",
+    }
+    Reader().read_file(arrow)
+    pd.testing.assert_frame_equal(
+        params["train_df"].fillna(0), arrow["train_df"].fillna(0)
+    )
+
+    arrow["dtype_backend"] = "pyarrow"
+    Reader().read_file(arrow)
+    assert isinstance(arrow["train_df"]["Price"].dtype, pd.ArrowDtype)
+
+
+@pytest.mark.parametrize(
+    "params, error",
+    [
+        ({"csv_engine": "fast"}, ValueError),
+        ({"dtype_backend": "arrow"}, ValueError),
+        ({"delimiter": ""}, TypeError),
+        ({"dtype_backend": "pyarrow", "optimize_dtypes": True}, ValueError),
+    ],
+)
+def test_csv_options_invalid(params, error):
+    params["train_df_path"] = "datasets/encoding/test.csv"
+    with pytest.raises(error):
+        Reader().read_file(params)
+
+
+@pytest.mark.parametrize("compression", ["gz", "bz2", "xz", "zip", "zst"])
+def test_read_compressed(tmp_path, compression):
+    if compression == "zst":
+        pytest.importorskip("zstandard")
+    df = pd.DataFrame({"A": range(100), "B": ["x", "y"] * 50})
+    file_path = str(tmp_path / f"train.csv.{compression}")
+    df.to_csv(file_path, sep=";", index=False)
+
+    params = {"train_df_path": file_path}
+    Reader().read_file(params)
+    pd.testing.assert_frame_equal(params["train_df"], df)
+
+    params = {
+        "train_df_path": file_path,
+        "optimize_dtypes": True,
+        "dtype_sample_size": 50,
+    }
+    Reader().read_file(params)
+    assert params["schema"] == {"A": "int8", "B": "category"}
+
+    chunks = list(Reader().read_chunks(file_path, 30))
+    assert [len(chunk) for chunk in chunks] == [30, 30, 30, 10]
+    pd.testing.assert_frame_equal(pd.concat(chunks), df)
+
+
+def test_decompressing_stream(tmp_path):
+    import gzip
+
+    from preprocessy.input._stream import DecompressingStream
+
+    with gzip.open(tmp_path / "data.gz", "wb") as f:
+        f.write(b"0123456789" * 1000)
+    stream = DecompressingStream(
+        str(tmp_path / "data.gz"), "gz", block_size=7, max_blocks=2
+    )
+    assert stream.read(15) == b"0123456"
+    # the background thread stops when the stream is closed before the end
+    stream.close()
+
+    with open(tmp_path / "broken.gz", "wb") as f:
+        f.write(b"not gzip")
+    with pytest.raises(OSError):
+        DecompressingStream(str(tmp_path / "broken.gz"), "gz").read()
+
+
+def test_read_compressed_invalid(tmp_path):
+    pd.DataFrame({"A": [1]}).to_csv(tmp_path / "train.xlsx.gz")
+    with pytest.raises(ValueError):
+        Reader().read_file({"train_df_path": str(tmp_path / "train.xlsx.gz")})
+
+
+@pytest.mark.parametrize("schema_cache", [True, "cache"])
+def test_schema_cache(tmp_path, schema_cache):
+    import json
+    import os
+
+    if schema_cache == "cache":
+        schema_cache = str(tmp_path / "cache")
+    file_path = str(tmp_path / "train.csv")
+    pd.DataFrame({"A": [1, 2, 3], "B": ["x", "y", "x"]}).to_csv(
+        file_path, index=False
+    )
+    params = {"train_df_path": file_path, "schema_cache": schema_cache}
+    Reader().read_file(params)
+    sidecar = params["schema_sidecar"]
+    assert os.path.dirname(sidecar) == (
+        schema_cache if schema_cache is not True else str(tmp_path)
+    )
+    with open(sidecar) as f:
+        content = json.load(f)
+    assert content["dtypes"] == {"A": "int64", "B": "object"}
+    assert content["rows"] == 3
+
+    # the saved dtypes are used while the file is unchanged
+    content["dtypes"]["A"] = "float64"
+    with open(sidecar, "w") as f:
+        json.dump(content, f)
+    params = {"train_df_path": file_path, "schema_cache": schema_cache}
+    Reader().read_file(params)
+    assert params["schema"] == {"A": "float64", "B": "object"}
+
+    pd.DataFrame({"A": [1, 2, 3, 4], "B": ["x", "y", "x", "z"]}).to_csv(
+        file_path, index=False
+    )
+    params = {"train_df_path": file_path, "schema_cache": schema_cache}
+    Reader().read_file(params)
+    assert params["schema"] == {"A": "int64", "B": "object"}
+
+
+def test_schema_cache_invalid():
+    with pytest.raises(TypeError):
+        Reader().read_file(
+            {"train_df_path": "datasets/encoding/test.csv", "schema_cache": 1}
+        )
+
+
+@pytest.mark.parametrize("n_partitions", [1, 3, 7])
+def test_partitions(n_partitions):
+    file_path = "datasets/handling_null_values/melb_data.csv"
+    params = {"train_df_path": file_path}
+    Reader().read_file(params)
+    df = params["train_df"]
+    partitions = Reader().partitions(file_path, n_partitions)
+    assert len(partitions) <= n_partitions
+    frames = []
+    for partition in partitions:
+        params = {"train_df_path": file_path, "train_partition": partition}
+        Reader().read_file(params)
+        assert list(params["train_df"].columns) == list(df.columns)
+        frames.append(params["train_df"])
+    pd.testing.assert_frame_equal(pd.concat(frames, ignore_index=True), df)
+
+
+def test_partitions_lines():
+    # a partition holds at least one line
+    partitions = Reader().partitions("datasets/encoding/test.csv", 1000)
+    assert len(partitions) == 3
+    assert all(start < end for start, end in partitions)
+
+
+def test_partitions_optimize_dtypes(tmp_path):
+    file_path = str(tmp_path / "train.csv")
+    pd.DataFrame({"A": [0.5, 1.5] * 50, "B": ["x", "y", "z", "x"] * 25}).to_csv(
+        file_path, index=False
+    )
+    for partition in Reader().partitions(file_path, 4):
+        params = {
+            "train_df_path": file_path,
+            "train_partition": partition,
+            "optimize_dtypes": True,
+        }
+        Reader().read_file(params)
+        assert params["schema"] == {"A": "float32", "B": "category"}
+
+
+@pytest.mark.parametrize(
+    "params, error",
+    [
+        ({"train_partition": [0, 10]}, ValueError),
+        ({"train_partition": (100, 10)}, ValueError),
+        ({"train_partition": (100,)}, TypeError),
+        ({"train_partition": "100:200"}, TypeError),
+        (
+            {
+                "train_df_path": "datasets/encoding/test*.csv",
+                "train_partition": (100, 200),
+            },
+            ValueError,
+        ),
+    ],
+)
+def test_partitions_invalid(params, error):
+    params = {"train_df_path": "datasets/encoding/test.csv", **params}
+    with pytest.raises(error):
+        Reader().read_file(params)
+
+
+def test_partitions_compressed(tmp_path):
+    file_path = str(tmp_path / "train.csv.gz")
+    pd.DataFrame({"A": [1]}).to_csv(file_path, index=False)
+    with pytest.raises(ValueError):
+        Reader().partitions(file_path, 2)
+    with pytest.raises(ValueError):
+        Reader().partitions("datasets/encoding/test.csv", 0)
+
+
+def test_read_concurrent(monkeypatch):
+    import threading
+
+    # the train and test files are parsed at the same time
+    barrier = threading.Barrier(2, timeout=10)
+    read_csv = pd.read_csv
+
+    def wait_read_csv(*args, **kwargs):
+        barrier.wait()
+        return read_csv(*args, **kwargs)
+
+    monkeypatch.setattr(pd, "read_csv", wait_read_csv)
+    params = {
+        "train_df_path": "datasets/encoding/test.csv",
+        "test_df_path": "datasets/encoding/testnew.csv",
+    }
+    Reader().read_file(params)
+    monkeypatch.undo()
+    pd.testing.assert_frame_equal(
+        params["test_df"], pd.read_csv("datasets/encoding/testnew.csv")
+    )
+
+
+@pytest.mark.parametrize("extension", ["csv", "parquet"])
+def test_read_concurrent_dtypes(tmp_path, extension):
+    train = pd.DataFrame({"A": [0.5, 1.5] * 50, "B": ["x", "y"] * 50})
+    test = pd.DataFrame({"A": [2.5] * 100, "B": [f"v{i}" for i in range(100)]})
+    paths = []
+    for name, df in [("train", train), ("test", test)]:
+        paths.append(str(tmp_path / f"{name}.{extension}"))
+        if extension == "csv":
+            df.to_csv(paths[-1], index=False)
+        else:
+            df.to_parquet(paths[-1])
+    params = {
+        "train_df_path": paths[0],
+        "test_df_path": paths[1],
+        "optimize_dtypes": True,
+    }
+    Reader().read_file(params)
+    # the test file is read with the dtypes of the train file
+    assert params["test_df"]["B"].dtype == "category"
+
+
+def write_database(tmp_path):
+    import sqlite3
+
+    file_path = str(tmp_path / "data.db")
+    df = pd.DataFrame(
+        {
+            "A": range(25),
+            "B": [0.5, None, 1.5, 2.5, 3.5] * 5,
+            "C": ["x", "y", "z", None, "x"] * 5,
+            "D": [1, None, 3, 4, 5] * 5,
+        }
+    )
+    with sqlite3.connect(file_path) as connection:
+        df.to_sql("train", connection, index=False)
+        df.head(5).to_sql("test", connection, index=False)
+    connection.close()
+    return file_path, df
+
+
+@pytest.mark.parametrize("fetch_size", [1, 7, 10000])
+def test_sql_reader(tmp_path, fetch_size):
+    from preprocessy.input import SQLReader
+
+    file_path, df = write_database(tmp_path)
+    params = {
+        "train_df_path": file_path,
+        "train_query": "SELECT * FROM train",
+        "test_query": "SELECT * FROM test;",
+        "fetch_size": fetch_size,
+    }
+    SQLReader().read_file(params)
+    pd.testing.assert_frame_equal(params["train_df"], df)
+    pd.testing.assert_frame_equal(params["test_df"], df.head(5))
+
+
+def test_sql_reader_columns(tmp_path):
+    import sqlite3
+
+    from preprocessy.input import SQLReader
+
+    file_path, df = write_database(tmp_path)
+    queries = []
+    connection = sqlite3.connect(file_path)
+    connection.set_trace_callback(queries.append)
+    params = {
+        "train_query": "SELECT * FROM train WHERE A < 10",
+        "read_columns": ["D", "A"],
+        "optimize_dtypes": True,
+    }
+    SQLReader(connection=connection).read_file(params)
+    connection.close()
+    assert list(params["train_df"].columns) == ["D", "A"]
+    assert params["train_df"].shape[0] == 10
+    assert params["schema"] == {"D": "float32", "A": "int8"}
+    assert queries[0].startswith('SELECT "D", "A" FROM')
+
+
+def test_sql_reader_empty(tmp_path):
+    from preprocessy.input import SQLReader
+
+    file_path, _ = write_database(tmp_path)
+    params = {
+        "train_df_path": file_path,
+        "train_query": "SELECT A, C FROM train WHERE A < 0",
+    }
+    SQLReader().read_file(params)
+    assert params["train_df"].shape == (0, 2)
+
+
+@pytest.mark.parametrize(
+    "params, error",
+    [
+        ({}, KeyError),
+        ({"train_query": 1}, TypeError),
+        ({"train_query": "SELECT * FROM train", "fetch_size": 0}, ValueError),
+        ({"train_query": "SELECT * FROM train", "read_columns": []}, TypeError),
+    ],
+)
+def test_sql_reader_invalid(tmp_path, params, error):
+    from preprocessy.input import SQLReader
+
+    file_path, _ = write_database(tmp_path)
+    with pytest.raises(error):
+        SQLReader().read_file({"train_df_path": file_path, **params})
+
+
+def test_sql_reader_pipeline(tmp_path):
+    from preprocessy.input import SQLReader
+    from preprocessy.pipelines import BasePipeline
+
+    file_path, df = write_database(tmp_path)
+    pipeline = BasePipeline(
+        train_df_path=file_path,
+        steps=[],
+        params={"train_query": "SELECT * FROM train", "headless": True},
+        custom_reader=SQLReader().read_file,
+    )
+    pipeline.process()
+    pd.testing.assert_frame_equal(pipeline.get_params()["train_df"], df)
@@ -223,3 +223,212 @@ def test_mulitple():
     handler = NullValuesHandler()
     handler.execute(params=params)
     assert params["train_df"].shape == (889, 8)
+
+
+def test_fit_transform_state(tmp_path):
+    train_df = pd.DataFrame({"A": [1.0, 2.0, np.nan, 3.0], "B": [1, 2, 3, 4]})
+    test_df = pd.DataFrame({"A": [np.nan, 10.0], "B": [5, 6]})
+    handler = NullValuesHandler()
+    handler.fit({"train_df": train_df, "fill_missing": {"mean": ["A"]}})
+    handler.save_state(tmp_path / "state.json")
+
+    loaded = NullValuesHandler()
+    loaded.load_state(tmp_path / "state.json")
+    params = {"train_df": test_df, "fill_missing": {"mean": ["A"]}}
+    loaded.transform(params)
+    assert params["train_df"]["A"].tolist() == [2.0, 10.0]
+
+
+def test_categorical_dtype():
+    train_df = pd.DataFrame(
+        {
+            "A": pd.Categorical(["x", None, "y", "x"]),
+            "B": np.array([1, 2, 3, 4], dtype="int8"),
+        }
+    )
+    params = {
+        "train_df": train_df,
+        "cat_cols": ["A"],
+        "replace_cat_nulls": "missing",
+        "fill_missing": {"mean": ["B"]},
+    }
+    NullValuesHandler().execute(params)
+    assert params["train_df"]["A"].tolist() == ["x", "missing", "y", "x"]
+
+
+@pytest.mark.parametrize(
+    "fill_missing", [{"median": []}, {"median": ["A", "B"]}]
+)
+@pytest.mark.parametrize(
+    "replace_cat_nulls, filled", [("U", "U"), (0, 0.0), (-1.5, -1.5)]
+)
+@pytest.mark.parametrize("chunked", [False, True])
+def test_numeric_categorical_nulls(
+    fill_missing, replace_cat_nulls, filled, chunked
+):
+    # the categorical value is applied first, a string makes the column an object
+    # column that is not filled with its median
+    train_df = pd.DataFrame(
+        {"A": [1.0, np.nan, 3.0, 4.0], "B": [1.0, 2.0, np.nan, 10.0]}
+    )
+    params = {
+        "train_df": train_df,
+        "cat_cols": ["A"],
+        "replace_cat_nulls": replace_cat_nulls,
+        "fill_missing": fill_missing,
+    }
+    handler = NullValuesHandler()
+    if chunked:
+        handler.partial_fit({**params, "train_df": train_df.iloc[:2]})
+        handler.partial_fit({**params, "train_df": train_df.iloc[2:]})
+        handler.transform(params)
+    else:
+        handler.execute(params)
+    assert params["train_df"]["A"].tolist() == [1.0, filled, 3.0, 4.0]
+    assert params["train_df"]["B"].tolist() == [1.0, 2.0, 2.0, 10.0]
+
+
+def test_numeric_categorical_nulls_melb():
+    from preprocessy.parse import Parser
+
+    params = {
+        "train_df": pd.read_csv("datasets/handling_null_values/melb_data.csv"),
+        "target_label": "Price",
+        "replace_cat_nulls": "U",
+        "fill_missing": {"median": []},
+    }
+    Parser().parse_dataset(params)
+    assert "Car" in params["cat_cols"]
+    NullValuesHandler().execute(params)
+    assert params["train_df"].shape[0] == 12211
+    assert params["train_df"].notna().all().all()
+
+
+@pytest.mark.parametrize("copy_on_write", [False, True])
+@pytest.mark.parametrize("replace_cat_nulls", [None, "missing"])
+def test_single_fill(copy_on_write, replace_cat_nulls):
+    train_df = titanic.iloc[:600].copy()
+    test_df = titanic.iloc[600:].copy()
+    params = {
+        "train_df": train_df,
+        "test_df": test_df,
+        "cat_cols": ["Embarked", "Cabin"],
+        "replace_cat_nulls": replace_cat_nulls,
+        "drop_cols": ["Name"],
+        "fill_missing": {"mean": ["Age"], "median": ["Fare"]},
+        "fill_values": {"Ticket": "none"},
+    }
+    handler = NullValuesHandler()
+    with pd.option_context("mode.copy_on_write", copy_on_write):
+        handler.execute(params)
+
+    # the input dataframes are not modified
+    pd.testing.assert_frame_equal(train_df, titanic.iloc[:600])
+    pd.testing.assert_frame_equal(test_df, titanic.iloc[600:])
+    for df in [params["train_df"], params["test_df"]]:
+        assert df.notna().all().all()
+        assert "Name" not in df.columns
+    # the null values of test_df are filled with the statistics of train_df
+    missing = params["test_df"].index.intersection(
+        test_df.index[test_df["Age"].isna()]
+    )
+    assert len(missing) > 0
+    assert (
+        params["test_df"].loc[missing, "Age"]
+        == handler.get_state()["mean"]["Age"]
+    ).all()
+    if replace_cat_nulls is None:
+        assert (
+            params["train_df"].shape[0]
+            == train_df.dropna(subset=["Embarked", "Cabin"]).shape[0]
+        )
+    else:
+        assert (params["train_df"]["Cabin"] == "missing").sum() == (
+            train_df["Cabin"].isna().sum()
+        )
+
+
+def test_fill_quantile():
+    params = {
+        "train_df": titanic.copy(),
+        "cat_cols": ["Pclass", "Sex"],
+        "drop_cols": ["Cabin"],
+        "fill_missing": {"quantile": ["Age"], "mean": ["Fare"]},
+        "fill_quantile": 0.25,
+    }
+    handler = NullValuesHandler()
+    handler.execute(params)
+    assert handler.get_state()["quantile"] == {
+        "Age": titanic["Age"].quantile(0.25)
+    }
+    filled = params["train_df"]["Age"][titanic["Age"].isna()]
+    assert (filled == titanic["Age"].quantile(0.25)).all()
+
+
+@pytest.mark.parametrize("error", [0.05, 0.01, 0.002])
+def test_kll_sketch(error):
+    from preprocessy.utils import KLLSketch
+
+    rng = np.random.default_rng(0)
+    values = rng.lognormal(size=200_000)
+    sketches = [KLLSketch(error) for _ in range(4)]
+    for i, start in enumerate(range(0, values.shape[0], 10_000)):
+        sketches[i % 4].update(pd.Series(values[start : start + 10_000]))
+    for sketch in sketches[1:]:
+        sketches[0].merge(sketch)
+    assert sketches[0].count == values.shape[0]
+    assert sum(v.shape[0] for v in sketches[0].levels) < 10 / error
+
+    ordered = np.sort(values)
+    for q in [0.01, 0.25, 0.5, 0.9, 0.99]:
+        rank = np.searchsorted(ordered, sketches[0].quantile(q)) / len(values)
+        assert abs(rank - q) <= error
+
+    # quantiles are exact until values are compacted
+    small = KLLSketch(error)
+    small.update(pd.Series([1.0, 2.0, np.nan, 4.0]))
+    assert small.quantile(0.5) == 2.0
+    assert np.isnan(KLLSketch(error).quantile(0.5))
+    with pytest.raises(ValueError):
+        KLLSketch(1.0)
+
+
+def test_partial_fit_quantile_sketch():
+    rng = np.random.default_rng(0)
+    train_df = pd.DataFrame(
+        {"A": rng.normal(size=100_000), "B": rng.exponential(size=100_000)}
+    )
+    train_df.loc[rng.choice(100_000, 1000, replace=False), ["A", "B"]] = np.nan
+    params = {
+        "fill_missing": {"median": ["A"], "quantile": ["B"]},
+        "fill_quantile": 0.9,
+        "quantile_error": 0.005,
+    }
+
+    handler = NullValuesHandler()
+    partitions = [NullValuesHandler(), NullValuesHandler()]
+    for i, start in enumerate(range(0, 100_000, 5000)):
+        chunk = {**params, "train_df": train_df.iloc[start : start + 5000]}
+        handler.partial_fit(chunk)
+        partitions[i % 2].partial_fit(chunk)
+    partitions[0].merge(partitions[1])
+
+    for fitted in [handler, partitions[0]]:
+        state = fitted.get_state()
+        assert set(state["median"]) == {"A"}
+        assert set(state["quantile"]) == {"B"}
+        for col, q, value in [
+            ("A", 0.5, state["median"]["A"]),
+            ("B", 0.9, state["quantile"]["B"]),
+        ]:
+            rank = (train_df[col] < value).sum() / train_df[col].count()
+            assert abs(rank - q) <= 0.005
+
+    with pytest.raises(ValueError):
+        NullValuesHandler().partial_fit(
+            {**params, "train_df": train_df, "quantile_error": 1.5}
+        )
+    with pytest.raises(TypeError):
+        NullValuesHandler().partial_fit(
+            {**params, "train_df": train_df, "fill_quantile": 1}
+        )
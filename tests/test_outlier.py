@@ -181,3 +181,17 @@ def test_outlier_replace_only_in_numeric_columns():
     outlier.handle_outliers(params=params)
     assert -999 in params["train_df"]["A"].values[95:]
     assert (params["train_df"]["B"].compare(sample_df["B"])).empty
+
+
+def test_fit_transform_state(tmp_path):
+    train = pd.DataFrame({"A": np.arange(100), "T": np.zeros(100)})
+    test = pd.DataFrame({"A": [-50, 50, 500], "T": [0, 0, 0]})
+    outlier = HandleOutlier()
+    outlier.fit({"train_df": train, "target_label": "T"})
+    outlier.save_state(tmp_path / "state.json")
+
+    loaded = HandleOutlier()
+    loaded.load_state(tmp_path / "state.json")
+    params = {"train_df": test, "target_label": "T"}
+    loaded.transform(params)
+    assert params["train_df"]["A"].tolist() == [50]
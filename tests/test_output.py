@@ -0,0 +1,86 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+from preprocessy.data_splitting import Split
+from preprocessy.output import Writer
+
+
+def split_params():
+    df = pd.DataFrame(
+        {
+            "A": np.arange(100),
+            "B": np.linspace(0, 1, 100),
+            "C": np.arange(100) % 2,
+        }
+    )
+    params = {"train_df": df, "target_label": "C", "test_size": 0.2}
+    Split().train_test_split(params)
+    return params
+
+
+def read_output(file_path, output_format):
+    if output_format == "npy":
+        return np.load(file_path, mmap_mode="r")
+    if output_format == "parquet":
+        return pd.read_parquet(file_path).to_numpy()
+    import pyarrow as pa
+
+    with pa.memory_map(file_path) as source:
+        return pa.ipc.open_file(source).read_all().to_pandas().to_numpy()
+
+
+@pytest.mark.parametrize("output_format", ["parquet", "arrow", "npy"])
+@pytest.mark.parametrize("shard_rows", [None, 30])
+def test_write(tmp_path, output_format, shard_rows):
+    params = split_params()
+    params.update(
+        {
+            "output_dir": str(tmp_path / "out"),
+            "output_format": output_format,
+            "shard_rows": shard_rows,
+        }
+    )
+    Writer().write_file(params)
+    files = params["output_files"]
+    assert sorted(files) == ["X_test", "X_train", "y_test", "y_train"]
+    assert len(files["X_train"]) == (1 if shard_rows is None else 3)
+    assert files["X_train"][0].endswith(f".{output_format}")
+
+    for key in files:
+        arrays = [read_output(f, output_format) for f in files[key]]
+        expected = params[key].to_numpy()
+        if key.startswith("y"):
+            arrays = [a.reshape(-1) for a in arrays]
+        np.testing.assert_array_equal(np.concatenate(arrays), expected)
+
+    with open(tmp_path / "out" / "manifest.json") as f:
+        manifest = json.load(f)
+    assert manifest["outputs"]["X_train"]["columns"] == ["A", "B"]
+    assert sum(manifest["outputs"]["X_train"]["rows"]) == 80
+
+
+def test_write_npy_non_numeric(tmp_path):
+    params = {
+        "X_train": pd.DataFrame({"A": ["x", "y"]}),
+        "output_dir": str(tmp_path),
+        "output_format": "npy",
+    }
+    with pytest.raises(ValueError):
+        Writer().write_file(params)
+
+
+@pytest.mark.parametrize(
+    "params, error",
+    [
+        ({}, TypeError),
+        ({"output_dir": "out", "output_format": "csv"}, ValueError),
+        ({"output_dir": "out", "shard_rows": 0}, ValueError),
+        ({"output_dir": "out", "X_train": [1, 2]}, TypeError),
+    ],
+)
+def test_write_invalid(tmp_path, monkeypatch, params, error):
+    monkeypatch.chdir(tmp_path)
+    with pytest.raises(error):
+        Writer().write_file(params)
@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 import pytest
 from preprocessy.parse import Parser
@@ -60,3 +61,338 @@ def test_invalid_user_cat_cols():
     parser = Parser()
     with pytest.raises(ValueError):
         parser.parse_dataset(params=params)
+
+
+def test_fit_transform_state(tmp_path):
+    train_df = pd.DataFrame(
+        {
+            "A": [i for i in range(100)],
+            "B": ["hello" if i % 2 == 0 else "bye" for i in range(100)],
+            "C": ["$1,000" for _ in range(100)],
+        }
+    )
+    parser = Parser()
+    parser.fit({"train_df": train_df, "target_label": "A"})
+    parser.save_state(tmp_path / "state.json")
+
+    loaded = Parser()
+    loaded.load_state(tmp_path / "state.json")
+    params = {"train_df": train_df.iloc[:5].copy(), "target_label": "A"}
+    loaded.transform(params)
+    assert params["cat_cols"] == ["B"]
+    assert params["train_df"]["C"].tolist() == [1000.0] * 5
+
+
+def test_schema_sidecar(tmp_path):
+    import json
+
+    from preprocessy.input import Reader
+
+    file_path = str(tmp_path / "train.csv")
+    pd.DataFrame(
+        {"A": ["$1,000"] * 10, "B": ["x"] * 10, "C": range(10)}
+    ).to_csv(file_path, index=False)
+    params = {"train_df_path": file_path, "schema_cache": True}
+    Reader().read_file(params)
+    Parser().parse_dataset(params)
+    assert params["cat_cols"] == ["B"]
+    with open(params["schema_sidecar"]) as f:
+        content = json.load(f)
+    assert content["parser"]["state"] == {
+        "cat_cols": ["B"],
+        "currency_cols": ["A"],
+        "number_formats": {
+            "A": {"currency": "$", "thousands": ",", "decimal": "."}
+        },
+        "date_formats": {},
+    }
+
+    # the columns saved to the sidecar are used instead of being learned again
+    content["parser"]["state"]["cat_cols"] = ["C"]
+    with open(params["schema_sidecar"], "w") as f:
+        json.dump(content, f)
+    params = {"train_df_path": file_path, "schema_cache": True}
+    Reader().read_file(params)
+    Parser().parse_dataset(params)
+    assert params["cat_cols"] == ["C"]
+    assert params["train_df"]["A"].tolist() == [1000.0] * 10
+
+    # a different target label learns the columns again
+    params = {
+        "train_df_path": file_path,
+        "schema_cache": True,
+        "target_label": "C",
+    }
+    Reader().read_file(params)
+    Parser().parse_dataset(params)
+    assert params["cat_cols"] == ["B"]
+
+
+def parse_chunks(params, df):
+    parser = Parser()
+    for start in range(0, df.shape[0], 5000):
+        parser.partial_fit(
+            {**params, "train_df": df.iloc[start : start + 5000]}
+        )
+    parser.transform(params)
+
+
+@pytest.mark.parametrize("chunked", [False, True])
+def test_approximate_distinct(chunked):
+    df = pd.read_csv("datasets/handling_null_values/melb_data.csv")
+    exact = {"train_df": df.copy(), "target_label": "Price"}
+    approximate = {
+        "train_df": df.copy(),
+        "target_label": "Price",
+        "approximate_distinct": True,
+    }
+    if chunked:
+        parse_chunks(exact, df)
+        parse_chunks(approximate, df)
+    else:
+        Parser().parse_dataset(exact)
+        Parser().parse_dataset(approximate)
+        counts = approximate["distinct_counts"]
+        assert counts["rows"] == df.shape[0]
+        assert counts["counts"]["Rooms"] == df["Rooms"].nunique()
+    assert approximate["cat_cols"] == exact["cat_cols"]
+
+
+def test_hyperloglog():
+    import numpy as np
+    from preprocessy.utils import count_distinct
+    from preprocessy.utils import HyperLogLog
+
+    values = pd.Series(np.arange(200_000) % 50_000)
+    sketch = HyperLogLog()
+    sketch.update(values.iloc[:100_000])
+    other = HyperLogLog()
+    other.update(values.iloc[100_000:].astype("float64"))
+    sketch.merge(other)
+    assert abs(sketch.count() - 50_000) < 0.03 * 50_000
+    # counting stops once the limit is reached
+    values = pd.Series(np.arange(500_000))
+    assert 1_000 <= count_distinct(values, 1_000, approximate=True) < 100_000
+    assert count_distinct(values, 1_000) == 500_000
+    with pytest.raises(ValueError):
+        HyperLogLog(precision=2)
+
+
+@pytest.mark.parametrize(
+    "values, expected",
+    [
+        (["$1,234.50", "$12", None], [1234.5, 12.0, None]),
+        (["1.234,50 €", "12,5 €", "(3,5 €)"], [1234.5, 12.5, -3.5]),
+        (["1 234", "5 678", "90"], [1234.0, 5678.0, 90.0]),
+        (["1,234", "5,678", "12"], [1234.0, 5678.0, 12.0]),
+    ],
+)
+def test_number_formats(values, expected):
+    train_df = pd.DataFrame({"A": values * 10, "T": range(30)})
+    # the test values are converted with the format of the train values
+    test_df = pd.DataFrame({"A": values[:1] + ["n/a", 7], "T": range(3)})
+    params = {"train_df": train_df, "test_df": test_df, "target_label": "T"}
+    Parser().parse_dataset(params)
+    expected = pd.Series(expected * 10, name="A", dtype="float64")
+    pd.testing.assert_series_equal(params["train_df"]["A"], expected)
+    assert params["test_df"]["A"].tolist()[0] == expected[0]
+    assert pd.isna(params["test_df"]["A"][1])
+    assert params["test_df"]["A"][2] == 7.0
+
+
+@pytest.mark.parametrize(
+    "values",
+    [["1.5", "2.25"], ["Smith, John", "Doe, Jane"], ["$1", "€2"]],
+)
+def test_number_formats_not_detected(values):
+    from preprocessy.utils import detect_number_format
+
+    assert detect_number_format(pd.Series(values)) is None
+
+
+@pytest.mark.parametrize("sample_rows", [None, 1000])
+def test_column_statistics(sample_rows):
+    import pickle
+
+    from preprocessy.utils import ColumnStatistics
+
+    df = pd.read_csv("datasets/handling_null_values/melb_data.csv")
+    statistics = ColumnStatistics(sample_rows=sample_rows)
+    statistics.add(df, distinct=["Rooms"])
+    assert statistics.rows == df.shape[0]
+    assert statistics.nulls == df.isna().sum().to_dict()
+    assert statistics.distinct == {"Rooms": df["Rooms"].nunique()}
+    numeric = set(df.select_dtypes("number"))
+    assert set(statistics.moments.count.index) == numeric
+    assert set(statistics.samples) == (numeric if sample_rows else set())
+    assert statistics.moments.mean["Price"] == pytest.approx(df["Price"].mean())
+    assert statistics.moments.std()["Car"] == pytest.approx(df["Car"].std())
+    assert statistics.moments.min["Car"] == df["Car"].min()
+    median = statistics.quantile("BuildingArea", 0.5)
+    if sample_rows is None:
+        assert median == df["BuildingArea"].median()
+        assert statistics.quantiles["BuildingArea"] == {0.5: median}
+        assert statistics.quantile("Price", 0.9) == df["Price"].quantile(0.9)
+    else:
+        assert median == pytest.approx(df["BuildingArea"].median(), rel=0.1)
+
+    # statistics of columns modified in place are discarded
+    df["Car"] = df["Car"].astype("str")
+    statistics.add(df, ["Car"])
+    assert statistics.dtypes["Car"] == "object"
+    assert "Car" not in statistics.samples
+    assert "Car" not in statistics.moments.count
+    # another dataframe empties the catalog
+    statistics.add(df.head(10), ["Rooms"])
+    assert statistics.rows == 10 and list(statistics.dtypes) == ["Rooms"]
+    # the statistics are not pickled with the catalog
+    restored = pickle.loads(pickle.dumps(statistics))
+    assert restored.sample_rows == sample_rows and restored.dtypes == {}
+
+
+def test_column_statistics_reused():
+    from preprocessy.missing_data import NullValuesHandler
+    from preprocessy.scaling import Scaler
+
+    df = pd.read_csv("datasets/handling_null_values/melb_data.csv")
+    df = df[["Rooms", "Distance", "BuildingArea", "Price"]]
+    params = {
+        "train_df": df,
+        "target_label": "Price",
+        "fill_missing": {"median": ["BuildingArea"]},
+    }
+    Parser().parse_dataset(params)
+    statistics = params["column_statistics"]
+    assert statistics.distinct["Rooms"] == df["Rooms"].nunique()
+    distance = statistics.quantile("Distance", 0.5)
+
+    # the null values of the numeric columns are filled instead of dropped
+    params["cat_cols"] = []
+    NullValuesHandler().execute(params)
+    assert params["column_statistics"] is statistics
+    assert params["train_df"]["BuildingArea"].isna().sum() == 0
+    filled = params["train_df"]["BuildingArea"][df["BuildingArea"].isna()]
+    assert filled.shape[0] > 0
+    assert (filled == df["BuildingArea"].median()).all()
+    # the filled column is discarded, the other columns are reused
+    assert "BuildingArea" not in statistics.dtypes
+    assert statistics.quantiles["Distance"] == {0.5: distance}
+
+    Scaler().execute({**params, "columns": ["Distance"]})
+    assert "Distance" not in statistics.dtypes
+    assert "Distance" not in statistics.quantiles
+    assert "Rooms" in statistics.moments.count
+
+
+def test_column_statistics_exact_quantiles():
+    from preprocessy.missing_data import NullValuesHandler
+    from preprocessy.utils import column_statistics
+    from preprocessy.utils import ColumnStatistics
+
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({"A": rng.lognormal(size=400_000)})
+    df.loc[::10, "A"] = np.nan
+    statistics = ColumnStatistics().add(df)
+    assert statistics.samples == {}
+    assert statistics.quantile("A", 0.5) == df["A"].median()
+    assert statistics.quantile("A", 0.99) == df["A"].quantile(0.99)
+    handler = NullValuesHandler()
+    handler.fit({"train_df": df, "fill_missing": {"median": ["A"]}})
+    assert handler.get_state()["median"]["A"] == df["A"].median()
+
+    sampled = column_statistics({"quantile_sample_rows": 10_000}).add(df)
+    assert sampled.samples["A"].shape[0] < 10_000
+    assert sampled.quantile("A", 0.5) == pytest.approx(
+        df["A"].median(), rel=0.1
+    )
+
+
+@pytest.mark.parametrize("sample_rows", [0, 1.5, True])
+def test_column_statistics_invalid(sample_rows):
+    from preprocessy.utils import ColumnStatistics
+
+    with pytest.raises(ValueError):
+        ColumnStatistics(sample_rows=sample_rows)
+
+
+@pytest.mark.parametrize(
+    "values, expected",
+    [
+        (["3/12/2016", "13/02/2017"], "%d/%m/%Y"),
+        (["12/3/2016", "02/13/2017"], "%m/%d/%Y"),
+        (["2016-12-03", "2017-02-13"], "%Y-%m-%d"),
+        (["2016-12-03 10:30:00", "2017-02-13 08:00:00"], "%Y-%m-%d %H:%M:%S"),
+        (["03 Dec 2016", "13 Feb 2017"], "%d %b %Y"),
+    ],
+)
+def test_dates(values, expected):
+    from preprocessy.utils import detect_date_format
+
+    assert detect_date_format(pd.Series(values)) == expected
+    train_df = pd.DataFrame({"A": values * 10, "T": range(20)})
+    test_df = pd.DataFrame({"A": values[:1] + ["n/a"], "T": range(2)})
+    params = {"train_df": train_df, "test_df": test_df, "target_label": "T"}
+    Parser().parse_dataset(params)
+    columns = ["AYear", "AMonth", "ADayOfWeek", "AEpoch", "T"]
+    assert list(params["train_df"].columns) == columns
+    assert list(params["test_df"].columns) == columns
+    assert params["train_df"]["AYear"].tolist()[:2] == [2016, 2017]
+    assert params["train_df"]["AMonth"].tolist()[:2] == [12, 2]
+    assert params["train_df"]["ADayOfWeek"].tolist()[:2] == [5, 0]
+    assert params["test_df"]["AEpoch"][0] == params["train_df"]["AEpoch"][0]
+    assert params["test_df"].iloc[1, :4].isna().all()
+    assert "AYear" not in params["cat_cols"]
+
+
+def test_dates_state():
+    train_df = pd.DataFrame(
+        {
+            "A": pd.date_range("2016-01-01", periods=20, freq="D"),
+            "B": ["1/2/2016", "3/4/2016"] * 10,
+            "C": ["2016", "2017"] * 10,
+            "T": range(20),
+        }
+    )
+    parser = Parser()
+    parser.fit({"train_df": train_df, "target_label": "T"})
+    state = parser.get_state()
+    assert state["date_formats"] == {"A": None, "B": "%m/%d/%Y"}
+    assert state["cat_cols"] == ["C"]
+    params = {"train_df": train_df.copy(), "target_label": "T"}
+    parser.transform(params)
+    assert params["train_df"]["AEpoch"][1] == 1451606400 + 86400
+
+    params = {"train_df": train_df.copy(), "parse_dates": False}
+    Parser().parse_dataset(params)
+    assert list(params["train_df"].columns) == list(train_df.columns)
+    with pytest.raises(TypeError):
+        Parser().parse_dataset({"train_df": train_df, "parse_dates": "yes"})
+
+
+def test_partial_fit_distinct_bounded(monkeypatch):
+    import preprocessy.parse._summarize as summarize
+    from preprocessy.utils import HyperLogLog
+
+    df = pd.read_csv("datasets/handling_null_values/melb_data.csv")
+
+    def fit_chunks():
+        parser = Parser()
+        for start in range(0, df.shape[0], 2000):
+            parser.partial_fit(
+                {
+                    "train_df": df.iloc[start : start + 2000],
+                    "target_label": "Price",
+                }
+            )
+        return parser
+
+    exact = fit_chunks().get_state()["cat_cols"]
+    monkeypatch.setattr(summarize, "EXACT_DISTINCT_VALUES", 100)
+    parser = fit_chunks()
+    values = parser.distinct_values
+    assert isinstance(values["Address"], HyperLogLog)
+    assert isinstance(values["Rooms"], set)
+    assert all(
+        isinstance(v, HyperLogLog) or len(v) <= 100 for v in values.values()
+    )
+    assert parser.get_state()["cat_cols"] == exact
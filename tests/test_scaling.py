@@ -200,3 +200,30 @@ def test_StandardScaler_output(test_input):
         assert round(test_input["train_df"]["Distance"][0], 5) == 1.08006
     else:
         assert round(test_input["train_df"]["Negatives"][0], 5) == 0.57771
+
+
+def test_fit_transform_state(tmp_path):
+    train_df = pd.DataFrame({"A": [0.0, 5.0, 10.0], "T": [0, 1, 0]})
+    test_df = pd.DataFrame({"A": [20.0], "T": [1]})
+    params = {
+        "train_df": train_df,
+        "test_df": test_df,
+        "type": "MinMaxScaler",
+        "columns": ["A"],
+        "target_label": "T",
+    }
+    scaler = Scaler()
+    scaler.execute(params)
+    assert params["test_df"]["A"].tolist() == [2.0]
+
+    scaler.save_state(tmp_path / "state.json")
+    loaded = Scaler()
+    loaded.load_state(tmp_path / "state.json")
+    params = {
+        "train_df": test_df,
+        "type": "MinMaxScaler",
+        "columns": ["A"],
+        "target_label": "T",
+    }
+    loaded.transform(params)
+    assert params["train_df"]["A"].tolist() == [2.0]